@@ -1,3 +1,7 @@
 from algo_trade.data_handler.calendar import constants
 from algo_trade.data_handler.calendar.calendar_tools import \
     MarketCalendarTools, MarketHolidays
+from algo_trade.data_handler.calendar.trading_calendar import \
+    TradingCalendar, trading_calendar
+from algo_trade.data_handler.calendar.expiry_schedule import \
+    weekly_expiries, monthly_expiries
@@ -15,6 +15,10 @@ from algo_trade.utils.meta import AsyncLoggingMeta
 
 from algo_trade.data_handler.source.nse.data_cache.cache_manager import \
     nsedata_cache
+from algo_trade.data_handler.calendar.trading_calendar import \
+    trading_calendar, to_date
+from algo_trade.data_handler.calendar.expiry_schedule import \
+    weekly_expiries, monthly_expiries
 
 LogConfig.setup_logging("", LOG_LEVEL)
 logger = LogConfig.get_logger(__name__)
@@ -158,8 +162,6 @@ class MarketCalendarTools:
         :return: (str)
                  Next Business date.
         """
-        leaves = [str(datetime.strptime(i, strftime).date()) for i in
-                  MarketHolidays()]
 
         if today is None:
             today = TODAY
@@ -172,16 +174,7 @@ class MarketCalendarTools:
         if today is None:
             today = date.today()
 
-        tomorrow = (today + BDay()).date()
-
-        while True:
-            # print("Debug Next: {0}".format(str(tomorrow)))
-            if str(tomorrow) in leaves:
-                tomorrow = (tomorrow + BDay()).date()
-
-            else:
-                # print("Break Next: {0}".format(str(tomorrow)))
-                break
+        tomorrow = trading_calendar(today.year).next_session(today)
 
         logger.info("The Next business day is {0}".format(tomorrow))
         return tomorrow
@@ -192,9 +185,6 @@ class MarketCalendarTools:
             strftime: str = DATE_FMT
     ):
 
-        leaves = [str(datetime.strptime(i, strftime).date()) for i in
-                  MarketHolidays()]
-
         if today is None:
             today = TODAY
 
@@ -208,17 +198,13 @@ class MarketCalendarTools:
         except AttributeError:
             yesterday = today
 
-        if yesterday > TODAY:
-            yesterday = (today - BDay()).date()
+        calendar = trading_calendar(yesterday.year)
 
-        while True:
-            # print("Debug: {0}".format(str(yesterday)))
-            if str(yesterday) in leaves:
-                yesterday = (yesterday - BDay()).date()
+        if yesterday > TODAY:
+            yesterday = calendar.previous_session(yesterday)
 
-            else:
-                # print("Break Prev {0}".format(str(yesterday)))
-                break
+        else:
+            yesterday = calendar.session_on_or_before(yesterday)
 
         logger.info("The Previous business day is {0}".format(yesterday))
         return yesterday
@@ -227,16 +213,11 @@ class MarketCalendarTools:
     def iterate_to_next_business_day(given_date: Union[date, str],
                                      next_b: int = 1, in_str: bool = False) -> Union[date, str]:
 
-        leaves = [str(datetime.strptime(i, DATE_FMT).date())
-                  for i in MarketHolidays()]
-        i = 0
-        while i < next_b:
-            given_date = (given_date + Bday()).date()
-
-            i += 1
+        if isinstance(given_date, str):
+            given_date = datetime.strptime(given_date, DATE_FMT).date()
 
-        if str(given_date) in leaves:
-            given_date = (given_date + Bday()).date()
+        given_date = trading_calendar(given_date.year).next_session(
+            given_date, next_b)
 
         if in_str:
             return given_date.strftime(DATE_FMT)
@@ -247,15 +228,11 @@ class MarketCalendarTools:
     def iterate_to_previous_business_day(given_date: Union[date, str],
                                          prev_b: int = 1, in_str: bool = False) -> Union[date, str]:
 
-        leaves = [str(datetime.strptime(i, DATE_FMT).date())
-                  for i in MarketHolidays()]
-        i = 0
-        while i < prev_b:
-            given_date = (given_date - BDay()).date()
-            i += 1
+        if isinstance(given_date, str):
+            given_date = datetime.strptime(given_date, DATE_FMT).date()
 
-        if str(given_date) in leaves:
-            given_date = (given_date - BDay()).date()
+        given_date = trading_calendar(given_date.year).previous_session(
+            given_date, prev_b)
 
         if in_str:
             return given_date.strftime(DATE_FMT)
@@ -298,34 +275,39 @@ class MarketCalendarTools:
 
     @staticmethod
     def get_weekly_expiry(
-            symbol: str = 'NIFTY',
+            symbol: Optional[str] = 'NIFTY',
             date_: Optional[Union[date, str]] = None,
-            day_index: Optional[int] = 3,
+            day_index: Optional[int] = None,
             index_count: Optional[int] = 6,
             to_strftime: bool = True,
     ):
+        """
+        Generator over the weekly expiries from `date_` on, holiday
+        adjusted. Expiries are computed `index_count` at a time through
+        `weekly_expiries`.
+        """
 
-        if symbol == 'FINNIFTY':
-            day_index = 1
+        if symbol is None:
+            symbol = 'NIFTY'
 
         # Check if Passed param is a str, None or Date
         if date_ is None:
             date_ = MarketCalendarTools.next_business_day()
 
         if isinstance(date_, str):
-            date_ = datetime.strptime(date_, DATE_FMT)
-
-        offset = (day_index - date_.weekday()) % 7
-        date_ += timedelta(days=offset)
-        week = timedelta(days=7)
+            date_ = datetime.strptime(date_, DATE_FMT).date()
 
         while True:
-            if to_strftime:
-                yield date_.strftime(DATE_FMT)
-            else:
-                yield date_
+            expiries = weekly_expiries(symbol, date_, count=index_count,
+                                       weekday=day_index)
+
+            for i in expiries:
+                if to_strftime:
+                    yield to_date(i).strftime(DATE_FMT)
+                else:
+                    yield to_date(i)
 
-            date_ += week
+            date_ = to_date(expiries[-1]) + timedelta(days=1)
 
     @staticmethod
     def get_month_range(year: int, month: int):
@@ -341,6 +323,10 @@ class MarketCalendarTools:
             date_: Optional[Union[date, str]] = None,
             day_index: Optional[int] = 4
     ):
+        """
+        Generator over the monthly expiries from `date_`'s month on,
+        holiday adjusted. `day_index` is the ISO weekday of the expiry.
+        """
 
         # Step 1. Check for Incoming Date Format
 
@@ -350,55 +336,37 @@ class MarketCalendarTools:
         if isinstance(date_, str):
             date_ = datetime.strptime(date_, DATE_FMT)
 
-        # Step 2. Iterate over the Generator
-        # to only fetch the next 3 available expiries.
+        # Step 2. Fetch expiries a year at a time, starting with
+        # the expiry of the month the date falls in.
+        date_ = date(date_.year, date_.month, 1)
 
         while True:
-            # Get the Month's Last Date.
-            month_range = MarketCalendarTools.get_month_range(date_.year,
-                                                              date_.month)
-            # Get the date in full for the last day of the month.
-            last_day_of_month = date(
-                day=month_range, month=date_.month, year=date_.year
-            )
+            expiries = monthly_expiries(start=date_, count=12,
+                                        weekday=day_index - 1)
 
-            # Get the Time Delta upto the Previous Thursday.
-            time_delta = MarketCalendarTools.get_time_delta(
-                last_day_of_month, day_index
-            )
-            # Calculate the expiry date.
-            expiry_date = last_day_of_month - time_delta
+            for i in expiries:
+                yield to_date(i).strftime(DATE_FMT)
 
-            yield expiry_date.strftime(DATE_FMT)
-
-            # Increment Relative Date on Month.
-            date_ += relativedelta(months=1)
+            date_ = to_date(expiries[-1]) + timedelta(days=1)
 
     @staticmethod
     def days_until_expiry(today: date = None) -> int:
         """Method to calculate number of working days until expiry."""
 
-        expiry_method = MarketCalendarTools.get_weekly_expiry(today,
-                                                              to_strftime=False)
+        expiry_method = MarketCalendarTools.get_weekly_expiry(
+            date_=today, to_strftime=False)
         next_expiry = next(expiry_method)
-
-        if today is None:
-            day = TODAY
+        day = today or TODAY
 
         if day == next_expiry:
             next_expiry = next(expiry_method)
 
-        count = 0
-
-        while day < next_expiry:
-            day = MarketCalendarTools.next_business_day(day)
-
-            count += 1
-
-        if count == 0:
-            count = 1
+        # Sessions after the day, up to the expiry, off the calendar, as
+        # stepping `next_business_day` stalls before the time cut off.
+        count = int(trading_calendar(day.year).count_sessions(
+            day + timedelta(days=1), next_expiry))
 
-        return count
+        return max(count, 1)
 
     @staticmethod
     def number_of_days_until_year_end(today: date = None) -> int:
@@ -416,13 +384,8 @@ class MarketCalendarTools:
     def holidays_in_a_month(today: date) -> int:
         """Returns Number of Holidays in a month."""
 
-        holidays = MarketHolidays()
-
-        holidays = [datetime.strptime(i, DATE_FMT).date() for i in holidays]
-
-        holidays = [True for i in holidays if today.month == i.month]
-
-        return len(holidays)
+        return trading_calendar(today.year).holidays_in_month(today.year,
+                                                              today.month)
 
     @staticmethod
     def number_of_working_days_in_a_month(today: date = None) -> int:
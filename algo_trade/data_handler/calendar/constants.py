@@ -24,3 +24,7 @@ MARKET_CLOSE_TIME = datetime.strptime(MARKET_CLOSE, TIME_STRF).time()
 MARKET_AMO_TIME = tuple(
     list(datetime.strptime(i, TIME_STRF).time() for i in MARKET_AMO)
 )
+
+# Weekday (Monday = 0) F&O contracts expire on, Thursday unless listed.
+EXPIRY_WEEKDAY = 3
+SYMBOL_EXPIRY_WEEKDAY = {"FINNIFTY": 1}
@@ -0,0 +1,137 @@
+from datetime import date
+from typing import Union
+
+import numpy as np
+
+from algo_trade.data_handler.calendar.constants import TODAY, \
+    EXPIRY_WEEKDAY, SYMBOL_EXPIRY_WEEKDAY
+from algo_trade.data_handler.calendar.trading_calendar import \
+    TradingCalendar, trading_calendar, to_datetime64, TRADING_WEEKMASK
+
+DateLike = Union[date, str, np.datetime64]
+
+
+def expiry_weekday(symbol: str = 'NIFTY') -> int:
+    """ Weekday (Monday = 0) the symbol's contracts expire on. """
+
+    return SYMBOL_EXPIRY_WEEKDAY.get(symbol.upper(), EXPIRY_WEEKDAY)
+
+
+def weekday_mask(weekday: int) -> str:
+    """ numpy weekmask with only the given weekday (Monday = 0) set. """
+
+    return "".join("1" if i == weekday else "0" for i in range(7))
+
+
+def adjust_for_holidays(expiries: np.ndarray,
+                        calendar: TradingCalendar) -> np.ndarray:
+    """ Expiries falling on a holiday move to the previous session. """
+
+    return np.busday_offset(expiries, 0, roll="backward",
+                            weekmask=TRADING_WEEKMASK,
+                            holidays=calendar.holidays)
+
+
+def _resolve(start: DateLike, end: DateLike, count: int):
+    if end is None and count is None:
+        raise ValueError("Either `end` or `count` is required.")
+
+    start = to_datetime64(TODAY if start is None else start)
+
+    if end is not None:
+        end = to_datetime64(end)
+
+    return start, end
+
+
+def _within(expiries: np.ndarray, start: np.datetime64, end, count: int) \
+        -> np.ndarray:
+    expiries = expiries[expiries >= start]
+
+    if end is not None:
+        expiries = expiries[expiries <= end]
+
+    if count is not None:
+        expiries = expiries[:count]
+
+    return expiries
+
+
+def weekly_expiries(symbol: str = 'NIFTY',
+                    start: DateLike = None,
+                    end: DateLike = None,
+                    count: int = None,
+                    calendar: TradingCalendar = None,
+                    weekday: int = None) -> np.ndarray:
+    """
+    Weekly expiries of a symbol from `start` up to `end` (both inclusive)
+    or the first `count` of them, holiday adjusted.
+
+    :param symbol: Symbol whose expiry weekday is used.
+    :param start: First date, today if None.
+    :param end: Last date.
+    :param count: Number of expiries.
+    :param calendar: Calendar with the holidays, the start year's if None.
+    :param weekday: Expiry weekday (Monday = 0), the symbol's if None.
+    :returns: datetime64[D] array of expiry dates.
+    """
+
+    start, end = _resolve(start, end, count)
+    calendar = calendar or trading_calendar(start.astype(object).year)
+    mask = weekday_mask(expiry_weekday(symbol) if weekday is None
+                        else weekday)
+
+    # One extra week covers an expiry pulled before `start` by a holiday.
+    if end is not None:
+        weeks = np.busday_count(start, end + 1, weekmask=mask) + 1
+
+    else:
+        weeks = count + 1
+
+    expiries = np.busday_offset(start, np.arange(weeks), roll="forward",
+                                weekmask=mask)
+
+    return _within(adjust_for_holidays(expiries, calendar), start, end,
+                   count)
+
+
+def monthly_expiries(symbol: str = 'NIFTY',
+                     start: DateLike = None,
+                     end: DateLike = None,
+                     count: int = None,
+                     calendar: TradingCalendar = None,
+                     weekday: int = None) -> np.ndarray:
+    """
+    Monthly expiries, the last expiry weekday of each month, from `start`
+    up to `end` (both inclusive) or the first `count` of them,
+    holiday adjusted.
+
+    :param symbol: Symbol whose expiry weekday is used.
+    :param start: First date, today if None.
+    :param end: Last date.
+    :param count: Number of expiries.
+    :param calendar: Calendar with the holidays, the start year's if None.
+    :param weekday: Expiry weekday (Monday = 0), the symbol's if None.
+    :returns: datetime64[D] array of expiry dates.
+    """
+
+    start, end = _resolve(start, end, count)
+    calendar = calendar or trading_calendar(start.astype(object).year)
+    mask = weekday_mask(expiry_weekday(symbol) if weekday is None
+                        else weekday)
+
+    first_month = start.astype("datetime64[M]")
+
+    if end is not None:
+        months = (end.astype("datetime64[M]") - first_month).astype(int) + 1
+
+    else:
+        months = count + 1
+
+    month_ends = (first_month + np.arange(1, months + 1)).astype(
+        "datetime64[D]") - 1
+    expiries = np.busday_offset(month_ends, 0, roll="backward",
+                                weekmask=mask)
+
+    return _within(adjust_for_holidays(expiries, calendar), start, end,
+                   count)
@@ -0,0 +1,160 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Iterable, Union
+
+import numpy as np
+
+from algo_trade.data_handler.calendar.constants import TODAY, DATE_FMT
+from algo_trade.data_handler.source.nse.data_cache.cache_manager import \
+    nsedata_cache
+
+# Weekdays the market trades on, Monday first.
+TRADING_WEEKMASK = "1111100"
+
+DateLike = Union[date, datetime, str, np.datetime64]
+
+
+def to_datetime64(dates) -> np.ndarray:
+    """
+    Converts a date, datetime, DATE_FMT string or an array of them into
+    datetime64[D].
+    """
+
+    def convert(value):
+        if isinstance(value, str):
+            return datetime.strptime(value, DATE_FMT).date()
+
+        if isinstance(value, datetime):
+            return value.date()
+
+        return value
+
+    if np.ndim(dates) == 0:
+        return np.datetime64(convert(dates), "D")
+
+    return np.array([convert(i) for i in dates], dtype="datetime64[D]")
+
+
+def to_date(value: np.datetime64) -> date:
+    return value.astype("datetime64[D]").item()
+
+
+class TradingCalendar:
+    """
+    Trading sessions from `start` to `end`, as a sorted datetime64[D]
+    array of the weekdays which aren't market holidays.
+    Lookups are binary searches over the array, and every method
+    takes either a single date or an array of dates.
+    """
+
+    def __init__(self, holidays: Iterable[date], start: date, end: date,
+                 weekmask: str = TRADING_WEEKMASK):
+        self.holidays = np.unique(to_datetime64(list(holidays)))
+        self.weekmask = weekmask
+
+        days = np.arange(np.datetime64(start, "D"),
+                         np.datetime64(end, "D") + 1)
+        self.sessions = days[np.is_busday(days, weekmask=weekmask,
+                                          holidays=self.holidays)]
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, date_: DateLike) -> bool:
+        return bool(self.is_session(date_))
+
+    def _lookup(self, index: np.ndarray, as_date: bool):
+        if np.any((index < 0) | (index >= len(self.sessions))):
+            raise IndexError("Date is outside the calendar's sessions "
+                             "{0} to {1}.".format(self.sessions[0],
+                                                  self.sessions[-1]))
+
+        result = self.sessions[index]
+
+        if as_date and np.ndim(result) == 0:
+            return to_date(result)
+
+        return result
+
+    def is_session(self, dates):
+        return np.is_busday(to_datetime64(dates), weekmask=self.weekmask,
+                            holidays=self.holidays)
+
+    def next_session(self, dates, n: int = 1, as_date: bool = True):
+        """ n-th session strictly after the date(s). """
+
+        index = np.searchsorted(self.sessions, to_datetime64(dates),
+                                side="right")
+
+        return self._lookup(index + n - 1, as_date)
+
+    def previous_session(self, dates, n: int = 1, as_date: bool = True):
+        """ n-th session strictly before the date(s). """
+
+        index = np.searchsorted(self.sessions, to_datetime64(dates),
+                                side="left")
+
+        return self._lookup(index - n, as_date)
+
+    def session_on_or_before(self, dates, as_date: bool = True):
+        """ Rolls date(s) back to the closest session, e.g. for expiries. """
+
+        index = np.searchsorted(self.sessions, to_datetime64(dates),
+                                side="right")
+
+        return self._lookup(index - 1, as_date)
+
+    def session_on_or_after(self, dates, as_date: bool = True):
+        """ Rolls date(s) forward to the closest session. """
+
+        index = np.searchsorted(self.sessions, to_datetime64(dates),
+                                side="left")
+
+        return self._lookup(index, as_date)
+
+    def nth_session(self, n: int, as_date: bool = True):
+        """ n-th session of the calendar, counted from 0. """
+
+        return self._lookup(np.asarray(n), as_date)
+
+    def sessions_between(self, start: DateLike, end: DateLike) -> np.ndarray:
+        """ Sessions from `start` to `end`, both inclusive. """
+
+        left = np.searchsorted(self.sessions, to_datetime64(start),
+                               side="left")
+        right = np.searchsorted(self.sessions, to_datetime64(end),
+                                side="right")
+
+        return self.sessions[left:right]
+
+    def count_sessions(self, start, end):
+        """ Number of sessions from `start` to `end`, both inclusive. """
+
+        left = np.searchsorted(self.sessions, to_datetime64(start),
+                               side="left")
+        right = np.searchsorted(self.sessions, to_datetime64(end),
+                                side="right")
+
+        return np.maximum(right - left, 0)
+
+    def holidays_in_month(self, year: int, month: int) -> int:
+        start = np.datetime64(date(year, month, 1), "M")
+
+        return int(np.sum(self.holidays.astype("datetime64[M]") == start))
+
+
+@lru_cache(maxsize=None)
+def trading_calendar(year: int = None) -> TradingCalendar:
+    """
+    TradingCalendar built once per year from the cached NSE market
+    holidays. Sessions span the previous year to the next one, so lookups
+    across the year boundary stay within the calendar.
+    """
+
+    if year is None:
+        year = TODAY.year
+
+    holidays = nsedata_cache().market_holidays.trade_day.to_list()
+
+    return TradingCalendar(holidays, date(year - 1, 1, 1),
+                           date(year + 1, 12, 31))
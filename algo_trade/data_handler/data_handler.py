@@ -3,5 +3,5 @@ from algo_trade.data_handler.source.source_handler import SourceHandler
 
 class DataHandler(SourceHandler):
 
-    def __init__(self):
-        super(DataHandler, self).__init__()
+    def __init__(self, date_str: str = None):
+        super(DataHandler, self).__init__(date_str)
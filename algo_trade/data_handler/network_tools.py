@@ -1,148 +1,293 @@
 import csv
 import os
-from io import BytesIO
+from functools import lru_cache
+from io import BufferedReader
+from tempfile import TemporaryFile
+from threading import RLock
+from time import monotonic, sleep
+from typing import BinaryIO
 from urllib.parse import urlparse
 from zipfile import ZipFile
 
-import requests
 from pandas import read_excel, read_csv, DataFrame
-from requests import Session
-from requests.exceptions import ConnectionError, ReadTimeout
-from requests.exceptions import InvalidURL
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, InvalidURL
+from urllib3.util.retry import Retry
 
 from algo_trade.utils.meta import AsyncLoggingMeta
 
 ROOT_DIR = os.path.join(os.getcwd(), 'data/input/')
 CHUNK_SIZE = 1024
+# Bytes streamed to disk per read, and bytes sniffed for the file format.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+SNIFF_SIZE = 4096
+
+# Seconds a domain's cookies are reused before the homepage is hit again.
+COOKIE_TTL = 300
+# Bounded retries, with exponential backoff, for failed requests.
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# Statuses which mean the cookies went stale.
+REFRESH_STATUS = (401, 403)
+REQUEST_TIMEOUT = 10
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+
+
+@lru_cache(maxsize=None)
+def pooled_session(max_retries: int = MAX_RETRIES,
+                   backoff_factor: float = BACKOFF_FACTOR) -> Session:
+    """
+    Long-lived Session shared across the process, so requests reuse
+    keep-alive connections instead of a new TCP/TLS handshake each time.
+    Connection errors & `RETRY_STATUS` responses are retried by the
+    adapter with exponential backoff.
+    """
+
+    retry = Retry(total=max_retries,
+                  backoff_factor=backoff_factor,
+                  status_forcelist=RETRY_STATUS,
+                  allowed_methods=("GET", "HEAD"),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                          pool_maxsize=POOL_MAXSIZE,
+                          max_retries=retry)
+
+    session = Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
 
 
 class DownloadTools(metaclass=AsyncLoggingMeta):
 
+    def __init__(self,
+                 session: Session = None,
+                 cookie_ttl: float = COOKIE_TTL,
+                 max_retries: int = MAX_RETRIES,
+                 backoff_factor: float = BACKOFF_FACTOR,
+                 timeout: float = REQUEST_TIMEOUT):
+        """
+        :param session: Session requests go through, the pooled session
+                        shared across the process if None.
+        :param cookie_ttl: Seconds a domain's cookies are reused for.
+        :param max_retries: Retries for stale cookies.
+        :param backoff_factor: Backoff between retries in seconds,
+                               doubled on every retry.
+        :param timeout: Request timeout in seconds.
+        """
+
+        if session is None:
+            session = pooled_session(max_retries, backoff_factor)
+
+        self.session = session
+        self.cookie_ttl = cookie_ttl
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.cookie_cache = dict()
+        self.cookie_lock = RLock()
+        self.domain_locks = dict()
+
+    def domain_lock(self, domain: str) -> RLock:
+        """ Lock held while a domain's cookies are fetched. """
+
+        with self.cookie_lock:
+            return self.domain_locks.setdefault(domain, RLock())
+
     def get_cookies(self,
                     base_url: str,
                     headers: dict,
-                    timeout: int = 5) -> dict:
+                    timeout: int = None,
+                    refresh: bool = False) -> dict:
         """
         `get_cookies` enables you to generate fresh cookies
         to download specific files.
+        Cookies are cached per domain for `cookie_ttl` seconds, and kept
+        in the session's cookie jar for the requests which follow.
+        A domain's cookies are fetched by one thread at a time, the others
+        waiting on it reuse them, and other domains aren't held up.
 
         :param base_url:
         :param headers:
         :param timeout:
+        :param refresh: Fetches fresh cookies even if the cached ones
+                        haven't expired.
         """
 
-        url = self.extract_domain(base_url)
+        domain = self.extract_domain(base_url)
+        requested = monotonic()
 
-        session = Session()
-        try:
-            request = session.get(url,
-                                  headers=headers,
-                                  timeout=timeout)
+        with self.domain_lock(domain):
+            with self.cookie_lock:
+                expiry, cookies = self.cookie_cache.get(domain, (0, None))
 
-        except (ConnectionError, ReadTimeout) as msg:
-            self.logger.debug(msg)
-            return self.get_cookies(url, headers)
+            # Cookies fetched while this thread waited are fresh enough,
+            # even for a refresh.
+            fetched = expiry - self.cookie_ttl
 
-        return dict(request.cookies)
+            if cookies is not None and monotonic() < expiry \
+                    and (not refresh or fetched >= requested):
+                return cookies
+
+            request = self.session.get(domain,
+                                       headers=headers,
+                                       timeout=timeout or self.timeout)
+            cookies = dict(request.cookies)
+
+            with self.cookie_lock:
+                self.cookie_cache[domain] = (monotonic() + self.cookie_ttl,
+                                             cookies)
+
+            self.logger.debug("Cookies refreshed for {0}.".format(domain))
+
+        return cookies
+
+    def get_request_api(self, url, headers, cookies=None,
+                        **kwargs) -> Response:
+        """
+        Get Requests API.
+        Cookies are fetched once per domain & TTL, and refreshed only when
+        the response is a 401/403. Gives up after `max_retries` refreshes.
+        """
 
-    def get_request_api(self, url, headers, cookies=None, **kwargs):
-        """Get Requests API."""
+        kwargs.setdefault("timeout", self.timeout)
+        refresh = False
 
-        cookies = self.get_cookies(url, headers)
-        result = requests.get(url, headers=headers, cookies=cookies, **kwargs)
+        for attempt in range(self.max_retries + 1):
+            # Cookies land in the session's jar, sent with the request.
+            self.get_cookies(url, headers, refresh=refresh)
+            result = self.session.get(url, headers=headers, cookies=cookies,
+                                      **kwargs)
 
-        if result.status_code == 200:
-            return result
+            if result.status_code == 200:
+                return result
 
-        elif result.status_code == 404:
-            raise InvalidURL("URL: {0}, Status Code:{1}".format(url,
-                                                                result.status_code))
+            elif result.status_code == 404:
+                raise InvalidURL("URL: {0}, Status Code:{1}".format(
+                    url, result.status_code))
 
-        return self.get_request_api(url, headers, cookies)
+            elif result.status_code not in REFRESH_STATUS:
+                break
+
+            self.logger.debug(
+                "URL: {0}, Status Code:{1}, refreshing cookies.".format(
+                    url, result.status_code))
+            refresh, cookies = True, None
+
+            if attempt < self.max_retries:
+                sleep(self.backoff_factor * (2 ** attempt))
+
+        raise HTTPError("URL: {0}, Status Code:{1}".format(
+            url, result.status_code), response=result)
 
     def extract_domain(self, url: str) -> str:
 
         parsed_url = urlparse(url)
-        domain = parsed_url.netloc
+        scheme = parsed_url.scheme or 'https'
 
-        return 'https://' + domain
+        return '{0}://{1}'.format(scheme, parsed_url.netloc)
 
-    def download_data(self, url: str, headers: str) -> BytesIO:
+    def download_data(self, url: str, headers: str, usecols: list = None,
+                      dtype: dict = None) -> DataFrame:
         """
-        For a given url and file name
-        download data to the provided filename/path.
+        For a given url download and parse the data.
+        The response is streamed to a temporary file, zip members are
+        read as a stream and the format is told from the leading bytes,
+        so the payload is never held in memory more than once.
+
+        :param url:
+        :param headers:
+        :param usecols: Columns to parse, all if None.
+        :param dtype: dtypes of the parsed columns.
         """
-        domain = self.extract_domain(url)
-        cookies = self.get_cookies(domain, headers)
-        response = self.get_request_api(url, headers, cookies)
+        response = self.get_request_api(url, headers, stream=True)
 
         if 'sec_ban' in url:
             return response.text
 
-        bytes_obj = BytesIO(response.content)
-
-        self.logger.debug("Response received.")
-
-        if self.is_zip(bytes_obj):
-            bytes_obj = self.unzip(bytes_obj)
+        with TemporaryFile() as file:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
 
-        result = self.read_from_buffer(bytes_obj)
+            self.logger.debug("Response received.")
+            file.seek(0)
 
-        return result
+            return self.read_from_file(file, usecols, dtype)
 
-    def unzip(self, source_buffer: BytesIO) -> bytes:
+    def read_from_file(self, file: BinaryIO, usecols: list = None,
+                       dtype: dict = None) -> DataFrame:
         """
-        Extracts content of the zip file and
-        returns a reference to the extracted CSV file.
-        :param source_buffer: Path to the source Zip Bytes.
-        :return: str
+        Parses a downloaded file, CSV or XLSX, bare or inside a zip.
         """
-        zip_file = ZipFile(source_buffer)
-        file_name = zip_file.namelist()[0]
-        csv_buffer = BytesIO(zip_file.read(file_name))
-        zip_file.close()
 
-        return csv_buffer
+        if not self.is_zip(file.read(SNIFF_SIZE)):
+            file.seek(0)
 
-    def is_zip(self, byte_obj: BytesIO):
+            return self.read_from_buffer(file, usecols, dtype)
+
+        file.seek(0)
+
+        with ZipFile(file) as zip_file:
+            if self.is_xlsx(zip_file):
+                file.seek(0)
+
+                return self.read_xlsx(file, usecols, dtype)
+
+            with zip_file.open(zip_file.namelist()[0]) as member:
+                return self.read_from_buffer(member, usecols, dtype)
+
+    def is_zip(self, prefix: bytes) -> bool:
         zip_signature = b'PK\x03\x04'
 
-        return byte_obj.getvalue().startswith(zip_signature)
+        return prefix.startswith(zip_signature)
 
-    def is_xlsx(self, byte_obj: BytesIO) -> bool:
-        xlsx_signature = b"PK\x03\x04"
+    def is_xlsx(self, zip_file: ZipFile) -> bool:
+        """ XLSX files are zip archives with an OOXML content types part. """
 
-        return byte_obj.startswith(xlsx_signature)
+        return '[Content_Types].xml' in zip_file.namelist()
 
-    def is_csv(self, byte_obj: BytesIO):
+    def is_csv(self, prefix: bytes) -> bool:
+        """ Sniffs the complete lines within the leading bytes. """
 
         try:
-            content = byte_obj.getvalue().decode('utf-8')
-            dialect = csv.Sniffer().sniff(content)
-            # TODO: Handle _csv.Error here.
+            content = prefix.decode('utf-8')
+            content = content[:content.rfind('\n') + 1] or content
+            csv.Sniffer().sniff(content)
+
             return True
 
         except (UnicodeDecodeError, csv.Error):
 
             return False
 
-    def read_csv(self, bytes_obj: BytesIO) -> DataFrame:
+    def read_csv(self, stream: BinaryIO, usecols: list = None,
+                 dtype: dict = None) -> DataFrame:
+
+        return read_csv(stream, usecols=usecols, dtype=dtype)
 
-        return read_csv(bytes_obj)
+    def read_xlsx(self, stream: BinaryIO, usecols: list = None,
+                  dtype: dict = None) -> DataFrame:
 
-    def read_xlsx(self, bytes_obj: BytesIO) -> DataFrame:
+        return read_excel(stream, usecols=usecols, dtype=dtype)
 
-        return read_excel(bytes_obj)
+    def read_from_buffer(self, stream: BinaryIO, usecols: list = None,
+                         dtype: dict = None):
 
-    def read_from_buffer(self, bytes_obj: BytesIO):
+        # Zip members aren't seekable, peek keeps the bytes in the stream.
+        stream = BufferedReader(stream, buffer_size=SNIFF_SIZE)
+        prefix = stream.peek(SNIFF_SIZE)[:SNIFF_SIZE]
 
-        if self.is_csv(bytes_obj):
+        if self.is_csv(prefix):
 
-            return self.read_csv(bytes_obj)
+            return self.read_csv(stream, usecols, dtype)
 
-        elif self.is_xlsx(bytes_obj):
+        elif self.is_zip(prefix):
 
-            return self.read_xlsx(bytes_obj)
+            return self.read_xlsx(stream, usecols, dtype)
 
         else:
             # TODO: Handle this case if need arises.
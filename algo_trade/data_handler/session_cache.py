@@ -0,0 +1,241 @@
+import sys
+from collections import OrderedDict
+from datetime import date, datetime
+from threading import Event, RLock
+from typing import Any, Callable, Dict, Hashable, List
+
+import numpy as np
+import pandas as pd
+
+from algo_trade.data_handler.calendar.constants import TIME_ZONE
+from algo_trade.data_handler.calendar.trading_calendar import \
+    trading_calendar
+from algo_trade.utils.logger.log_configurator import LogConfig
+
+logger = LogConfig.get_logger(__name__)
+
+# Bytes of memoized data kept before the least recently used is evicted.
+SESSION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def current_session() -> date:
+    """ Latest trading session on or before today. """
+
+    today = datetime.now(tz=TIME_ZONE).date()
+
+    return trading_calendar(today.year).session_on_or_before(today)
+
+
+def sizeof(value: Any) -> int:
+    """ Approximate bytes held by a value, frames & arrays included. """
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return value.nbytes + sum(sys.getsizeof(i) for i in value.flat)
+
+        return value.nbytes
+
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(i) + sizeof(j)
+                                          for i, j in value.items())
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(i) for i in value)
+
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return sys.getsizeof(value) + sizeof(vars(value))
+
+    return sys.getsizeof(value)
+
+
+class PendingLoad:
+    """ A load in flight, its value or error handed to those waiting. """
+
+    def __init__(self):
+        self.done = Event()
+        self.value = None
+        self.error = None
+
+
+class SessionCache:
+    """
+    SessionCache memoizes values per key and trading session, within a
+    byte budget.
+    Entries expire when the session rolls over, and the least recently
+    used ones are evicted once the budget is exceeded. Only the key is
+    held, never the object that loaded the value.
+    Hits, misses, evictions & expirations are counted, see `stats`.
+    """
+
+    def __init__(self, max_bytes: int = SESSION_CACHE_MAX_BYTES,
+                 session: Callable[[], Hashable] = current_session):
+        """
+        :param max_bytes: Byte budget of the cache.
+        :param session: Callable returning the current session, entries
+                        of any other session are expired.
+        """
+
+        self.max_bytes = max_bytes
+        self.session = session
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._session = None
+        self._lock = RLock()
+        self._loads: Dict[Hashable, PendingLoad] = dict()
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0,
+                        "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            self._expire()
+
+            return key in self._entries
+
+    def _expire(self):
+        session = self.session()
+
+        if session == self._session:
+            return
+
+        self._session = session
+        stale = [i for i, j in self._entries.items() if j[0] != session]
+
+        for key in stale:
+            self._bytes -= self._entries.pop(key)[2]
+
+        self.metrics["expirations"] += len(stale)
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.metrics["evictions"] += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            self._expire()
+
+            if key not in self._entries:
+                self.metrics["misses"] += 1
+
+                return default
+
+            self.metrics["hits"] += 1
+            self._entries.move_to_end(key)
+
+            return self._entries[key][1]
+
+    def set(self, key: Hashable, value: Any):
+        size = sizeof(value)
+
+        with self._lock:
+            self.pop(key)
+
+            # A value over the whole budget is returned, but not kept.
+            if size > self.max_bytes:
+                logger.warning("{0} of {1} bytes is over the cache's budget "
+                               "of {2}, not cached.".format(
+                                   key, size, self.max_bytes))
+                return
+
+            self._entries[key] = (self.session(), value, size)
+            self._bytes += size
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+
+            _, value, size = self._entries.pop(key)
+            self._bytes -= size
+
+            return value
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            self._expire()
+
+            return list(self._entries.keys())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_or_load(self, key: Hashable, func: Callable, *args,
+                    **kwargs) -> Any:
+        """
+        Cached value of the key, else `func(*args, **kwargs)` is cached.
+        Concurrent loads of a key wait on the first one and are handed its
+        value, counted as hits, even when it isn't kept, being over
+        `max_bytes`. If the first load fails, they load it again.
+        """
+
+        with self._lock:
+            self._expire()
+
+            if key in self._entries:
+                self.metrics["hits"] += 1
+                self._entries.move_to_end(key)
+
+                return self._entries[key][1]
+
+            load = self._loads.get(key)
+
+            if load is None:
+                self.metrics["misses"] += 1
+                load = self._loads[key] = PendingLoad()
+                loading = True
+
+            else:
+                loading = False
+
+        if not loading:
+            load.done.wait()
+
+            if load.error is not None:
+                return self.get_or_load(key, func, *args, **kwargs)
+
+            with self._lock:
+                self.metrics["hits"] += 1
+
+            return load.value
+
+        try:
+            load.value = func(*args, **kwargs)
+            self.set(key, load.value)
+
+        except BaseException as error:
+            load.error = error
+            raise
+
+        finally:
+            with self._lock:
+                self._loads.pop(key, None)
+
+            load.done.set()
+
+        return load.value
+
+    def stats(self) -> Dict[str, Any]:
+        """ Hit/miss metrics, along with the entries & bytes held. """
+
+        with self._lock:
+            lookups = self.metrics["hits"] + self.metrics["misses"]
+
+            return dict(self.metrics,
+                        hit_ratio=round(self.metrics["hits"] / lookups, 4)
+                        if lookups else 0.0,
+                        entries=len(self._entries),
+                        bytes=self._bytes,
+                        max_bytes=self.max_bytes)
@@ -1,3 +1,4 @@
+import os
 from os import environ
 from os.path import dirname, abspath
 
@@ -17,6 +18,71 @@ NSE_CM_BHAVCOPY_COL_RENAMED = {
     "TtlTradgVol": "volume",
 }
 
+# Columns parsed from the CM bhavcopy and their dtypes, volume nullable.
+NSE_CM_BHAVCOPY_DTYPES = {
+    "TckrSymb": "object",
+    "SctySrs": "category",
+    "OpnPric": "float64",
+    "HghPric": "float64",
+    "LwPric": "float64",
+    "ClsPric": "float64",
+    "TradDt": "object",
+    "PrvsClsgPric": "float64",
+    "TtlTradgVol": "Int64",
+}
+
+# Columns parsed from the F&O bhavcopy and their dtypes. Counts are
+# nullable, as a blank cell would fail a plain int64.
+NSE_FO_BHAVCOPY_DTYPES = {
+    "INSTRUMENT": "category",
+    "SYMBOL": "object",
+    "EXPIRY_DT": "object",
+    "STRIKE_PR": "float64",
+    "OPTION_TYP": "category",
+    "OPEN": "float64",
+    "HIGH": "float64",
+    "LOW": "float64",
+    "CLOSE": "float64",
+    "SETTLE_PR": "float64",
+    "CONTRACTS": "Int64",
+    "VAL_INLAKH": "float64",
+    "OPEN_INT": "Int64",
+    "CHG_IN_OI": "Int64",
+    "TIMESTAMP": "object",
+}
+
+# Number of tickers requested per `yf.download` call in bulk fetches.
+YF_BULK_CHUNK_SIZE = 100
+
+# Local Parquet store for YFinance bars and the intervals it serves.
+BAR_STORE_DIR = environ.get("BAR_STORE_DIR",
+                            os.path.join(ROOT_DIR, "data", "bars"))
+BAR_STORE_INTERVALS = ("1d", "1wk", "1mo")
+
+# Date-partitioned Parquet archive of the daily bhavcopies, the bhavcopy
+# keys backfilled into it, and the concurrent downloads of a backfill.
+BHAVCOPY_ARCHIVE_DIR = environ.get("BHAVCOPY_ARCHIVE_DIR",
+                                   os.path.join(ROOT_DIR, "data", "bhavcopy"))
+BHAVCOPY_KEYS = ("EQ", "FO")
+BACKFILL_MAX_WORKERS = 4
+
+# Strategy outputs, partitioned on disk by strategy & output date.
+STRATEGY_OUTPUT_DIR = environ.get("STRATEGY_OUTPUT_DIR",
+                                  os.path.join(ROOT_DIR, "data", "outputs"))
+
+# Append-only log of option chain snapshots, partitioned by symbol & date.
+OPTION_CHAIN_STORE_DIR = environ.get("OPTION_CHAIN_STORE_DIR",
+                                     os.path.join(ROOT_DIR, "data",
+                                                  "option_chains"))
+OPTION_CHAIN_STORE_COMPRESSION = "zstd"
+
+# Concurrent NSE API calls and requests per second allowed per host.
+NSE_ASYNC_MAX_CONCURRENCY = 8
+NSE_RATE_LIMIT = 5
+# Retries of a failed NSE API call, and the seconds before the first one.
+NSE_ASYNC_RETRIES = 2
+NSE_ASYNC_RETRY_BACKOFF = 1.0
+
 YF_UTILS_EXCEPTION_LIST = {
     "MOTHERSUMI.NS": "MOTHERSON",
     "RUCHI.NS": "PATANJALI",
@@ -7,8 +7,11 @@ from dateutil.relativedelta import relativedelta
 from algo_trade.data_handler.source.constants import NSE_FO_LIQUID_STOCKS
 from algo_trade.utils.meta import AsyncLoggingMeta
 from typing import Optional, Union
-from algo_trade.data_handler.calendar.constants import TODAY, TIME_ZONE
-from algo_trade.data_handler.calendar import MarketCalendarTools
+from algo_trade.data_handler.calendar.constants import TODAY, TIME_ZONE, \
+    DATE_FMT
+from algo_trade.data_handler.calendar import MarketCalendarTools, \
+    weekly_expiries, monthly_expiries
+from algo_trade.data_handler.calendar.trading_calendar import to_date
 
 
 class DataUtils(metaclass=AsyncLoggingMeta):
@@ -60,30 +63,38 @@ class DataUtils(metaclass=AsyncLoggingMeta):
 
     def get_all_weekly_expiries(
             self, max_count: Optional[int] = 6,
-            date_: Optional[Union[date, str]] = None
+            date_: Optional[Union[date, str]] = None,
+            symbol: str = 'NIFTY'
     ):
-        i = 0
-        expiry_set = list()
-        # TODO: Apply Date to expiry to back date data.
-        expiry = MarketCalendarTools.get_weekly_expiry()
-        while i < max_count:
-            expiry_set.append(next(expiry))
-            i += 1
+        """
+        Next `max_count` weekly expiries from `date_`, the next trading
+        day if None, holiday adjusted.
+        """
+
+        if date_ is None:
+            date_ = self.next_day
+
+        expiry_set = weekly_expiries(symbol, date_, count=max_count)
 
-        return expiry_set
+        return [to_date(i).strftime(DATE_FMT) for i in expiry_set]
 
     def get_all_monthly_expiries(
             self, max_count: Optional[int] = 3,
-            date_: Optional[Union[date, str]] = None
+            date_: Optional[Union[date, str]] = None,
+            symbol: str = 'NIFTY'
     ):
-        i = 0
-        expiry_set = list()
+        """
+        `max_count` monthly expiries from `date_`'s month, the current
+        month if None, holiday adjusted.
+        """
+
+        if date_ is None:
+            date_ = TODAY
 
-        # TODO: Apply Date to expiry to back date data.
-        expiry = MarketCalendarTools.get_monthly_expiry()
+        if isinstance(date_, str):
+            date_ = datetime.strptime(date_, DATE_FMT).date()
 
-        while i < max_count:
-            expiry_set.append(next(expiry))
-            i += 1
+        expiry_set = monthly_expiries(symbol, date_.replace(day=1),
+                                      count=max_count)
 
-        return expiry_set
+        return [to_date(i).strftime(DATE_FMT) for i in expiry_set]
@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from threading import Lock
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from requests.exceptions import InvalidURL
+
+from algo_trade.utils.meta import AsyncLoggingMeta
+from algo_trade.data_handler.calendar.constants import DATE_FMT
+from algo_trade.data_handler.calendar.trading_calendar import \
+    TradingCalendar, to_date
+from algo_trade.data_handler.source.constants import BHAVCOPY_ARCHIVE_DIR, \
+    BHAVCOPY_KEYS, BACKFILL_MAX_WORKERS
+from algo_trade.data_handler.source.nse import nsedata_cache
+
+CHECKPOINT_FILE = "_checkpoint.json"
+PARTITION_FILE = "part-0.parquet"
+
+
+class BhavcopyArchive:
+    """
+    BhavcopyArchive is the on-disk history of the daily bhavcopies, one
+    Parquet file per (key, session) laid out in hive style partitions:
+    `<root>/key=EQ/date=2024-01-02/part-0.parquet`.
+    Bhavcopies are kept as `nse_daily_bhavcopy` parses them.
+    Sessions NSE has no bhavcopy for are recorded in a checkpoint, so a
+    backfill neither retries them nor takes them for unfinished work.
+    """
+
+    def __init__(self, root: str = BHAVCOPY_ARCHIVE_DIR):
+        self.root = root
+        self._lock = Lock()
+
+    def path(self, key: str, date_: date) -> str:
+        return os.path.join(self.root, "key={0}".format(key),
+                            "date={0}".format(date_.isoformat()),
+                            PARTITION_FILE)
+
+    def has(self, key: str, date_: date) -> bool:
+        return os.path.exists(self.path(key, date_))
+
+    def sessions(self, key: str) -> List[date]:
+        """ Sessions archived for the key, oldest first. """
+
+        key_dir = os.path.join(self.root, "key={0}".format(key))
+
+        if not os.path.isdir(key_dir):
+            return list()
+
+        return sorted(date.fromisoformat(i.split("=", 1)[1])
+                      for i in os.listdir(key_dir)
+                      if i.startswith("date=")
+                      and os.path.exists(os.path.join(key_dir, i,
+                                                      PARTITION_FILE)))
+
+    def read(self, key: str, start: date = None, end: date = None) \
+            -> pd.DataFrame:
+        """
+        Archived bhavcopies of the key from `start` to `end`, both
+        inclusive, oldest first, with the session in a `date` column.
+        """
+
+        frames = list()
+
+        for session in self.sessions(key):
+            if (start is not None and session < start) \
+                    or (end is not None and session > end):
+                continue
+
+            data = pq.read_table(self.path(key, session)).to_pandas()
+            data["date"] = session
+            frames.append(data)
+
+        if not frames:
+            return pd.DataFrame()
+
+        return pd.concat(frames, ignore_index=True)
+
+    def read_session(self, key: str, date_: date) -> pd.DataFrame:
+        return pq.read_table(self.path(key, date_)).to_pandas()
+
+    def write(self, key: str, date_: date, data: pd.DataFrame):
+        path = self.path(key, date_)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write aside and swap, an interrupted write leaves no partition.
+        temp_path = path + ".tmp"
+        pq.write_table(pa.Table.from_pandas(data, preserve_index=False),
+                       temp_path)
+        os.replace(temp_path, path)
+
+    def _checkpoint_path(self) -> str:
+        return os.path.join(self.root, CHECKPOINT_FILE)
+
+    def missing(self) -> Dict[str, List[str]]:
+        """ Sessions (ISO format) per key NSE had no bhavcopy for. """
+
+        path = self._checkpoint_path()
+
+        if not os.path.exists(path):
+            return dict()
+
+        with open(path) as file:
+            return json.load(file).get("missing", dict())
+
+    def mark_missing(self, key: str, date_: date):
+        with self._lock:
+            missing = self.missing()
+            dates = set(missing.get(key, list()))
+            dates.add(date_.isoformat())
+            missing[key] = sorted(dates)
+
+            os.makedirs(self.root, exist_ok=True)
+            temp_path = self._checkpoint_path() + ".tmp"
+
+            with open(temp_path, "w") as file:
+                json.dump({"missing": missing,
+                           "updated_on": datetime.now().isoformat()}, file)
+
+            os.replace(temp_path, self._checkpoint_path())
+
+
+class BhavcopyBackfill(metaclass=AsyncLoggingMeta):
+    """
+    BhavcopyBackfill downloads the bhavcopies of every trading session in
+    a date range into a `BhavcopyArchive`, a bounded number at a time.
+    Sessions already archived, or known to have no bhavcopy, are skipped,
+    so an interrupted backfill resumes where it stopped. A failed download
+    is logged and left for the next run.
+    """
+
+    def __init__(self, data_config, archive: BhavcopyArchive = None,
+                 max_workers: int = BACKFILL_MAX_WORKERS):
+        """
+        :param data_config: NseDataConfig, or a DataHandler, the
+                            bhavcopies are downloaded with.
+        :param archive: Archive to backfill, the default one if None.
+        :param max_workers: Concurrent downloads.
+        """
+
+        self.data_config = data_config
+        self.archive = archive or BhavcopyArchive()
+        self.max_workers = max_workers
+
+    def sessions(self, start: date, end: date) -> List[date]:
+        """ Trading sessions from `start` to `end`, both inclusive. """
+
+        holidays = nsedata_cache().market_holidays.trade_day.to_list()
+        calendar = TradingCalendar(holidays, start, end)
+
+        return [to_date(i) for i in calendar.sessions_between(start, end)]
+
+    def pending(self, start: date, end: date,
+                keys: Iterable[str] = BHAVCOPY_KEYS,
+                retry_missing: bool = False) -> List[Tuple[str, date]]:
+        """ (key, session) pairs of the range still to be downloaded. """
+
+        missing = dict() if retry_missing else self.archive.missing()
+
+        return [(key, session)
+                for session in self.sessions(start, end)
+                for key in keys
+                if not self.archive.has(key, session)
+                and session.isoformat() not in missing.get(key, ())]
+
+    def _fetch(self, key: str, session: date) -> str:
+        try:
+            data = self.data_config.download_bhavcopy(session, key)
+
+        except InvalidURL:
+            self.archive.mark_missing(key, session)
+
+            return "missing"
+
+        self.archive.write(key, session, data)
+
+        return "archived"
+
+    def run(self, start: date, end: date,
+            keys: Iterable[str] = BHAVCOPY_KEYS,
+            retry_missing: bool = False) -> Dict[str, int]:
+        """
+        :param start: First date of the range.
+        :param end: Last date of the range.
+        :param keys: Bhavcopies to backfill, 'EQ' and/or 'FO'.
+        :param retry_missing: Retries sessions recorded as missing.
+        :returns: count of sessions archived, missing & failed.
+        """
+
+        pending = self.pending(start, end, keys, retry_missing)
+        result = {"archived": 0, "missing": 0, "failed": 0}
+
+        self.logger.info("Backfilling {0} bhavcopies from {1} to {2}.".format(
+            len(pending), start, end))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._fetch, *i): i for i in pending}
+
+            for future in as_completed(futures):
+                key, session = futures[future]
+
+                try:
+                    result[future.result()] += 1
+
+                except Exception as e:
+                    result["failed"] += 1
+                    self.logger.warning(
+                        "{0} bhavcopy for {1} failed: {2}".format(
+                            key, session, e))
+
+        self.logger.info("Backfill complete: {0}".format(result))
+
+        return result
+
+
+def backfill_bhavcopy(start: date, end: date,
+                      keys: Iterable[str] = BHAVCOPY_KEYS,
+                      max_workers: int = BACKFILL_MAX_WORKERS,
+                      retry_missing: bool = False) -> Dict[str, int]:
+    from algo_trade.data_handler.source.nse.nse_data_config import \
+        NseDataConfig
+
+    return BhavcopyBackfill(NseDataConfig(), max_workers=max_workers).run(
+        start, end, keys, retry_missing)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Backfill the NSE bhavcopy archive for a date range.")
+    parser.add_argument("start", help="First date, as in {0}.".format(
+        date.today().strftime(DATE_FMT)))
+    parser.add_argument("end", help="Last date, in the same format.")
+    parser.add_argument("--keys", nargs="+", default=list(BHAVCOPY_KEYS),
+                        choices=BHAVCOPY_KEYS)
+    parser.add_argument("--max-workers", type=int,
+                        default=BACKFILL_MAX_WORKERS)
+    parser.add_argument("--retry-missing", action="store_true")
+    args = parser.parse_args()
+
+    print(backfill_bhavcopy(datetime.strptime(args.start, DATE_FMT).date(),
+                            datetime.strptime(args.end, DATE_FMT).date(),
+                            args.keys, args.max_workers, args.retry_missing))
@@ -1,31 +1,164 @@
 import os
 import json
 import pickle
+import sqlite3
+from threading import RLock
+from collections.abc import MutableMapping
 
 FILE_DIR = os.path.dirname(os.path.abspath(__file__))
 NSE_PKL_CACHE = os.path.join(FILE_DIR, "nse_cache.pkl")
+NSE_DB_CACHE = os.path.join(FILE_DIR, "nse_cache.db")
 INDICES_MAP = os.path.join(FILE_DIR, "index.json")
 NIFTY_INDICES_DOMAIN = "https://niftyindices.com/IndexConstituent/"
+# Marker recorded once the legacy pickle is fully imported.
+LEGACY_MIGRATION = "legacy_pickle"
+
+
+class KeyedCacheStore(MutableMapping):
+    """
+    Dict like store over a SQLite blob table, holding one pickled
+    object per key. Values are unpickled lazily on first access and
+    memoized, while assignments and deletions write only that key.
+    Keys assigned but not yet written, as their write failed, are kept
+    dirty until the next `flush`.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self._loaded = dict()
+        self._dirty = set()
+        self._lock = RLock()
+        self._connection = sqlite3.connect(file_name,
+                                           check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS cache "
+                                 "(key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS markers "
+                                 "(name TEXT PRIMARY KEY)")
+        self._connection.commit()
+
+    def __getitem__(self, key: str):
+        with self._lock:
+            if key not in self._loaded:
+                row = self._connection.execute(
+                    "SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+
+                if row is None:
+                    raise KeyError(key)
+
+                self._loaded[key] = pickle.loads(row[0])
+
+            return self._loaded[key]
+
+    def __setitem__(self, key: str, value):
+        with self._lock:
+            self._loaded[key] = value
+            self._dirty.add(key)
+            self.flush(key)
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            if key not in self:
+                raise KeyError(key)
+
+            self._loaded.pop(key, None)
+            self._dirty.discard(key)
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._connection.commit()
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            if key in self._loaded:
+                return True
+
+            row = self._connection.execute(
+                "SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone()
+
+            return row is not None
+
+    def __iter__(self):
+        with self._lock:
+            rows = self._connection.execute("SELECT key FROM cache").fetchall()
+
+        return iter([i[0] for i in rows])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def flush(self, *keys: str):
+        """
+        Writes the given keys, or the dirty ones, back to the store.
+        Needed with the key after a loaded value has been mutated in place.
+        """
+
+        with self._lock:
+            keys = keys or tuple(self._dirty)
+            rows = [(i, pickle.dumps(self._loaded[i],
+                                     protocol=pickle.HIGHEST_PROTOCOL))
+                    for i in keys]
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                rows)
+            self._connection.commit()
+            self._dirty.difference_update(keys)
+
+    def has_marker(self, name: str) -> bool:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT 1 FROM markers WHERE name = ?",
+                (name,)).fetchone() is not None
+
+    def set_marker(self, name: str):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO markers (name) VALUES (?)", (name,))
+            self._connection.commit()
 
 
 class NSEDataCacheManager:
     """
-    NSEDataCacheManager is the pickle file manager for
+    NSEDataCacheManager is the keyed cache manager for
     all the initial cached data required for any analysis or
     stock/index quote or reference.
+    Every key is stored and loaded on its own, so reading or updating
+    one key never touches the others.
     """
 
-    def __init__(self, file_name: str = NSE_PKL_CACHE):
+    def __init__(self, file_name: str = NSE_DB_CACHE,
+                 legacy_file_name: str = NSE_PKL_CACHE):
         self.file_name = file_name
-        self.loaded_dict: dict = self.load()
+        self.legacy_file_name = legacy_file_name
+        self.loaded_dict: KeyedCacheStore = self.load()
 
-    def save(self, mode: str = 'wb'):
-        with open(self.file_name, mode) as file:
-            pickle.dump(self.loaded_dict, file)
+    def save(self, *keys: str):
+        self.loaded_dict.flush(*keys)
 
-    def load(self, mode: str = 'rb') -> dict:
-        with open(self.file_name, mode) as file:
-            return pickle.load(file)
+    def load(self) -> KeyedCacheStore:
+        store = KeyedCacheStore(self.file_name)
+
+        if os.path.exists(self.legacy_file_name) \
+                and not store.has_marker(LEGACY_MIGRATION):
+            self.migrate_legacy_cache(store)
+
+        return store
+
+    def migrate_legacy_cache(self, store: KeyedCacheStore, mode: str = 'rb'):
+        """
+        One time import of the monolithic pickle into the keyed store,
+        marked done in the store once every key is in. A migration which
+        failed midway is resumed on the next load, keys already in the
+        store, as imported or updated since, are kept.
+        """
+
+        with open(self.legacy_file_name, mode) as file:
+            legacy: dict = pickle.load(file)
+
+        for key, value in legacy.items():
+            if key not in store:
+                store[key] = value
+
+        store.set_marker(LEGACY_MIGRATION)
 
     def __enter__(self):
         return self
@@ -35,14 +168,12 @@ class NSEDataCacheManager:
 
     def __setitem__(self, key, value):
         self.loaded_dict[key] = value
-        self.save()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.save()
 
     def __delitem__(self, key):
         del self.loaded_dict[key]
-        self.save()
 
     @property
     def mcap(self):
@@ -54,7 +185,7 @@ class NSEDataCacheManager:
 
     @property
     def indices(self):
-        if 'indices' in self.loaded_dict.keys():
+        if 'indices' in self.loaded_dict:
             return self.loaded_dict['indices']
 
         self.loaded_dict['indices'] = list(
@@ -0,0 +1,144 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict
+from urllib.parse import urlparse
+from algo_trade.utils.meta import AsyncLoggingMeta
+from algo_trade.utils.async_tools import RateLimiter, run_in_executor
+from algo_trade.data_handler.network_tools import DownloadTools
+from algo_trade.data_handler.source.nse.nse_map import nse_web_map
+from algo_trade.data_handler.source.constants import \
+    NSE_ASYNC_MAX_CONCURRENCY, NSE_RATE_LIMIT
+
+
+@lru_cache(maxsize=None)
+def nse_executor(max_workers: int = NSE_ASYNC_MAX_CONCURRENCY) \
+        -> ThreadPoolExecutor:
+    """
+    Thread pool the blocking NSE requests run on, created on first use
+    and shared by every `AsyncNseClient`, so none of them leaves a pool
+    of its own behind.
+    """
+
+    return ThreadPoolExecutor(max_workers=max_workers,
+                              thread_name_prefix="nse")
+
+
+class AsyncNseClient(metaclass=AsyncLoggingMeta):
+    """
+    Asyncio client for the NSE API endpoints of `NSEApiMap`, so that
+    independent calls can be awaited together.
+    Requests go through `DownloadTools`, on the bounded thread pool shared
+    by the clients over its pooled session, and are spaced per host by a
+    rate limiter.
+    Methods return the raw JSON; parsing is left to `NseDataConfig`.
+    """
+
+    def __init__(self,
+                 download_tools: DownloadTools = None,
+                 executor: Executor = None,
+                 rate_limit: float = NSE_RATE_LIMIT):
+        """
+        :param download_tools: DownloadTools the requests are made with.
+        :param executor: Executor the requests run on, `nse_executor` if
+                         None.
+        :param rate_limit: Requests per second allowed per host.
+        """
+
+        self.nse_map = nse_web_map()
+        self.download_tools = download_tools or DownloadTools()
+        self.headers = self.nse_map.nse_headers_simple
+        self.executor = executor or nse_executor()
+        self.rate_limit = rate_limit
+        self.rate_limiters = dict()
+
+    def rate_limiter(self, url: str) -> RateLimiter:
+        host = urlparse(url).netloc
+
+        if host not in self.rate_limiters:
+            self.rate_limiters[host] = RateLimiter(self.rate_limit)
+
+        return self.rate_limiters[host]
+
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        """ Awaits a blocking callable on the client's thread pool. """
+
+        return await run_in_executor(self.executor, func, *args, **kwargs)
+
+    async def call_limited(self, url: str, func: Callable, *args,
+                           **kwargs) -> Any:
+        """
+        `call` of a blocking callable which requests the url's host,
+        spaced with the other requests to it.
+        """
+
+        await self.rate_limiter(url).acquire()
+
+        return await self.call(func, *args, **kwargs)
+
+    async def get_json(self, url: str, headers: dict = None) -> Any:
+
+        data = await self.call_limited(
+            url, self.download_tools.get_request_api, url,
+            headers or self.headers)
+
+        return data.json()
+
+    async def download(self, url: str, **kwargs) -> Any:
+        """ Async `DownloadTools.download_data`. """
+
+        return await self.call_limited(url, self.download_tools.download_data,
+                                       url, self.headers, **kwargs)
+
+    async def option_chain(self, key: str, symbol: str) -> dict:
+
+        if key == 'equity':
+            url = self.nse_map.nse_equity_option_chain(symbol)
+
+        else:
+            url = self.nse_map.nse_index_option_chain(symbol)
+
+        return await self.get_json(url)
+
+    async def symbol_info(self, key: str, symbol: str) -> dict:
+
+        if key == 'equity':
+            url = self.nse_map.nse_equity_quote(symbol)
+
+        else:
+            url = self.nse_map.nse_option_index(symbol)
+
+        return await self.get_json(url, self.nse_map.nse_headers_advanced)
+
+    async def quote_index(self, symbol: str) -> dict:
+
+        url = self.nse_map.nse_quote_indices.format(symbol.upper())
+
+        return await self.get_json(url)
+
+    async def india_vix(self, from_date: str, to_date: str) -> dict:
+
+        url = self.nse_map.nse_india_vix.format(from_date, to_date)
+
+        return await self.get_json(url)
+
+    async def all_indices(self) -> dict:
+
+        return await self.get_json(self.nse_map.nse_indices)
+
+    async def fii_dii_trade(self) -> list:
+
+        return await self.get_json(self.nse_map.nse_api_fii_dii_report)
+
+    async def holidays(self) -> dict:
+
+        return await self.get_json(self.nse_map.nse_api_holiday)
+
+    async def option_chains(self, symbols: list, key: str = 'index') \
+            -> Dict[str, dict]:
+        """ Option chains of all the symbols, fetched concurrently. """
+
+        data = await asyncio.gather(*[self.option_chain(key, i)
+                                      for i in symbols])
+
+        return dict(zip(symbols, data))
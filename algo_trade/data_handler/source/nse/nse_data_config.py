@@ -1,3 +1,4 @@
+import asyncio
 from pandas import DataFrame, to_datetime, merge, concat
 from datetime import datetime, date
 from numpy import where
@@ -6,19 +7,26 @@ from dateutil.relativedelta import relativedelta
 from algo_trade.utils.meta.async_meta import AsyncLoggingMeta
 from algo_trade.data_handler.source.nse import nse_web_map, nsedata_cache
 from algo_trade.data_handler.network_tools import DownloadTools
-from algo_trade.data_handler.source.constants import TRADEABLE_INDICES_NAME
+from algo_trade.data_handler.source.nse.nse_async_client import \
+    AsyncNseClient
+from algo_trade.data_handler.source.constants import \
+    TRADEABLE_INDICES_NAME, NSE_CM_BHAVCOPY_DTYPES, NSE_FO_BHAVCOPY_DTYPES
 from algo_trade.data_handler.calendar.constants import TODAY, DATE_FMT
 from algo_trade.data_handler.source.data_utils import DataUtils
+from algo_trade.data_handler.source.nse.bhavcopy_archive import \
+    BhavcopyArchive
 
 
 class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
 
-    def __init__(self):
-        super(NseDataConfig, self).__init__()
+    def __init__(self, date_str: str = None):
+        super(NseDataConfig, self).__init__(date_str)
         self.nse_map = nse_web_map()
         self.cache = nsedata_cache()
         self.download_tools = DownloadTools()
         self.headers = self.nse_map.nse_headers_simple
+        self.nse_client = AsyncNseClient(self.download_tools)
+        self.bhavcopy_archive = BhavcopyArchive()
 
     def nse_ipo_issues_past(self) -> DataFrame:
 
@@ -74,9 +82,7 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         else:
             url = self.nse_map.nse_index_option_chain(symbol)
 
-        cookies = self.download_tools.get_cookies(url, self.headers)
-        data = self.download_tools.get_request_api(url, self.headers,
-                                                   cookies)
+        data = self.download_tools.get_request_api(url, self.headers)
         self.logger.debug(
             "NSE Option Chain: Key-{0}, Symbol-{1}".format(key, symbol))
         return data.json()
@@ -85,12 +91,14 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         """ Gets you a list of all the reports. """
 
         url = self.nse_map.nse_indices
-        cookies = self.download_tools.get_cookies(url, self.headers)
         data = self.download_tools.get_request_api(url,
-                                                   self.nse_map.nse_headers_simple,
-                                                   cookies)
+                                                   self.nse_map.nse_headers_simple)
+
+        return self.parse_all_indices(data.json())
+
+    def parse_all_indices(self, data: dict) -> DataFrame:
 
-        return DataFrame(data.json()['data'])
+        return DataFrame(data['data'])
 
     def nse_symbol_info(self, key: str, symbol: str) -> dict:
 
@@ -102,10 +110,8 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         else:
             url = self.nse_map.nse_option_index(symbol)
 
-        cookies = self.download_tools.get_cookies(url, self.headers)
         data = self.download_tools.get_request_api(url,
-                                                   self.nse_map.nse_headers_advanced,
-                                                   cookies)
+                                                   self.nse_map.nse_headers_advanced)
 
         self.logger.debug(
             "NSE Quote Symbol: Key-{0}, Symbol-{1}".format(key, symbol))
@@ -119,7 +125,6 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
             return self.cache['holidays']
 
         url = self.nse_map.nse_api_holiday
-        # cookies = self.download_tools.get_cookies(url, self.headers)
         data = self.download_tools.get_request_api(url, self.headers)
         data = data.json()[key]
         self.logger.debug("NSE Holidays Generated. Key: {0}".format(key))
@@ -140,10 +145,13 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
 
         url = self.nse_map.nse_api_fii_dii_report
 
-        # cookies = self.download_tools.get_cookies(url, self.headers)
         data = self.download_tools.get_request_api(url, self.headers)
 
-        data = DataFrame(data.json())
+        return self.parse_fii_dii_trade(data.json())
+
+    def parse_fii_dii_trade(self, data: list) -> DataFrame:
+
+        data = DataFrame(data)
         data.columns = ["category", "date", "buy", "sell", "net"]
 
         data["date"] = to_datetime(data.date).apply(lambda x: x.date())
@@ -156,7 +164,7 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         """
         Gets you Downloaded Bhavcopy in the dataframe format.
         This method checks if the bhavcopy is already downloaded and cached
-        in the pickle.
+        in the pickle, or archived by a backfill.
         If not the case, it downloads it and stores it in the cache with a
         timestamp to differentiate.
         """
@@ -166,9 +174,6 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         else:
             bhav_key = "DailyBhav_{0}".format(key)
 
-        dated = date_str
-        day, month, year = dated.strftime("%d-%m-%Y").upper().split("-")
-
         if bhav_key in self.cache.loaded_dict.keys() \
                 and self.cache[bhav_key]["time_stamp"] == date_str.strftime(
             DATE_FMT).upper():
@@ -178,6 +183,33 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
                               "source.".format(date_str))
             return self.cache[bhav_key]["data"]
 
+        if key in ('EQ', 'FO') and self.bhavcopy_archive.has(key, date_str):
+            self.logger.debug("{0} read from the archive for {1}.".format(
+                bhav_key, date_str))
+            return self.bhavcopy_archive.read_session(key, date_str)
+
+        data = self.download_bhavcopy(date_str, key)
+
+        if key in ('EQ', 'FO'):
+            self.bhavcopy_archive.write(key, date_str, data)
+
+        self.cache[bhav_key] = {"data": data, "time_stamp":
+            date_str.strftime(DATE_FMT).upper()}
+
+        self.logger.debug("{0} Cached for {1}.".format(bhav_key, date_str))
+
+        return data
+
+    def download_bhavcopy(self, date_str: date, key: str = 'EQ') -> \
+            DataFrame:
+        """
+        Downloads the bhavcopy of a date, without caching it.
+        Raises InvalidURL when NSE has none for the date.
+        """
+
+        dated = date_str
+        day, month, year = dated.strftime("%d-%m-%Y").upper().split("-")
+
         if key == 'EQ':
             url = self.nse_map.nse_download_eq_bhavcopy
             url = url.format(year, month, day, dated.strftime("%b").upper())
@@ -190,12 +222,15 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         else:
             url = self.nse_map.nse_download_fo_secban.format(day, month, year)
 
-        data = self.download_tools.download_data(url, self.headers)
+        dtypes = {'EQ': NSE_CM_BHAVCOPY_DTYPES,
+                  'FO': NSE_FO_BHAVCOPY_DTYPES}.get(key)
 
-        self.cache[bhav_key] = {"data": data, "time_stamp":
-            date_str.strftime(DATE_FMT).upper()}
+        if dtypes is not None:
+            data = self.download_tools.download_data(
+                url, self.headers, usecols=list(dtypes), dtype=dtypes)
 
-        self.logger.debug("{0} Cached for {1}.".format(bhav_key, date_str))
+        else:
+            data = self.download_tools.download_data(url, self.headers)
 
         return data
 
@@ -321,8 +356,7 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         """
 
         url = self.nse_map.nse_indices
-        # cookies = self.download_tools.get_cookies(url, self.headers)
-        data = self.download_tools.get_request_api(url, self.headers, cookies)
+        data = self.download_tools.get_request_api(url, self.headers)
 
         data = DataFrame(data.json()['data'])
         keys = data.key.unique().tolist()
@@ -335,9 +369,12 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         """ Gets you the quote of the selected index.  """
 
         url = self.nse_map.nse_quote_indices.format(symbol.upper())
-        cookies = self.download_tools.get_cookies(url, self.headers)
-        data = self.download_tools.get_request_api(url, self.headers, cookies)
-        data = data.json()
+        data = self.download_tools.get_request_api(url, self.headers)
+
+        return self.parse_quote_index(data.json(), key)
+
+    def parse_quote_index(self, data: dict, key: str = 'metadata') \
+            -> DataFrame:
 
         if key == 'metadata':
 
@@ -365,11 +402,14 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
         """ Method to retrieve VIX data. """
 
         vix_url = self.nse_map.nse_india_vix.format(from_date, to_date)
-        cookies = self.download_tools.get_cookies(vix_url, self.headers)
-        data = self.download_tools.get_request_api(vix_url, self.headers,
-                                                   cookies)
+        data = self.download_tools.get_request_api(vix_url, self.headers)
+
+        return self.parse_india_vix(data.json())
+
+    def parse_india_vix(self, data: dict) -> DataFrame:
+
         # Response data manipulation.
-        data = DataFrame(data.json()['data'])
+        data = DataFrame(data['data'])
         data = data.iloc[:, range(1, 11)]
         data.columns = ["dated", "index", "open", "close", "high",
                         "low", "prev_close", "timestamp", "change",
@@ -383,16 +423,25 @@ class NseDataConfig(DataUtils, metaclass=AsyncLoggingMeta):
 
         return data
 
-    def run_quote_index(self, dt_fmt: str = "%d-%m-%Y"):
-
-        data = [self.get_quote_index(i) for i in TRADEABLE_INDICES_NAME]
+    async def fetch_quote_index(self, dt_fmt: str = "%d-%m-%Y") -> list:
+        """ Quotes of the tradeable indices & VIX, fetched concurrently. """
 
         from_date = self.prev_day
 
         to_date = self.next_day
 
-        vix = self.get_india_vix(from_date.strftime(dt_fmt),
-                                 to_date.strftime(dt_fmt))
+        return await asyncio.gather(
+            *[self.nse_client.quote_index(i) for i in TRADEABLE_INDICES_NAME],
+            self.nse_client.india_vix(from_date.strftime(dt_fmt),
+                                      to_date.strftime(dt_fmt))
+            )
+
+    def run_quote_index(self, dt_fmt: str = "%d-%m-%Y"):
+
+        *data, vix = asyncio.run(self.fetch_quote_index(dt_fmt))
+
+        data = [self.parse_quote_index(i) for i in data]
+        vix = self.parse_india_vix(vix)
         cols = data[0].columns.to_list()
         data.append(vix[cols])
         df = concat(data)
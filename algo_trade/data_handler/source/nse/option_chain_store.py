@@ -0,0 +1,187 @@
+import os
+from datetime import date, datetime
+from typing import List
+from uuid import uuid4
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from algo_trade.data_handler.calendar.constants import TIME_ZONE
+from algo_trade.data_handler.source.constants import OPTION_CHAIN_STORE_DIR, \
+    OPTION_CHAIN_STORE_COMPRESSION
+
+# Sessions are kept as ISO strings, which order like the dates.
+DATE_PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]),
+                                    flavor="hive")
+# Order rows are kept in within a file, so range scans read few row groups.
+SORT_KEYS = ["expiry", "strike", "timestamp"]
+COMPACTED_FILE = "compacted.parquet"
+
+
+def exchange_time(value: datetime) -> datetime:
+    """
+    Naive IST time of a bound, as snapshots are stored with NSE's naive
+    IST timestamps. Aware times are converted, naive ones taken as IST.
+    """
+
+    if value.tzinfo is None:
+        return value
+
+    return value.astimezone(TIME_ZONE).replace(tzinfo=None)
+
+
+class OptionChainStore:
+    """
+    OptionChainStore is an append-only log of option chain snapshots,
+    rows keyed by (symbol, expiry, strike, timestamp) and partitioned in
+    hive style by symbol & session date:
+    `<root>/symbol=NIFTY/date=2024-01-02/part-<time>-<id>.parquet`.
+    Every append is a new compressed Parquet file, existing files are
+    never rewritten except by `compact`, which merges a finished
+    session's files into one.
+    Scans push the date range down as a partition filter, and the
+    timestamp & expiry down to the row groups.
+    """
+
+    def __init__(self, root: str = OPTION_CHAIN_STORE_DIR,
+                 compression: str = OPTION_CHAIN_STORE_COMPRESSION):
+        self.root = root
+        self.compression = compression
+
+    def symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, "symbol={0}".format(symbol))
+
+    def partition_dir(self, symbol: str, date_: date) -> str:
+        return os.path.join(self.symbol_dir(symbol),
+                            "date={0}".format(date_.isoformat()))
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return list()
+
+        return sorted(i.split("=", 1)[1] for i in os.listdir(self.root)
+                      if i.startswith("symbol="))
+
+    def dates(self, symbol: str) -> List[date]:
+        """ Sessions recorded for the symbol, oldest first. """
+
+        symbol_dir = self.symbol_dir(symbol)
+
+        if not os.path.isdir(symbol_dir):
+            return list()
+
+        return sorted(date.fromisoformat(i.split("=", 1)[1])
+                      for i in os.listdir(symbol_dir)
+                      if i.startswith("date="))
+
+    def _write(self, data: pd.DataFrame, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write aside and swap, so scans never see a partial file. The
+        # temp file's name starts with '.', which dataset discovery skips.
+        temp_path = os.path.join(os.path.dirname(path),
+                                 "." + os.path.basename(path) + ".tmp")
+        pq.write_table(pa.Table.from_pandas(data, preserve_index=False),
+                       temp_path, compression=self.compression)
+        os.replace(temp_path, path)
+
+    def append(self, symbol: str, data: pd.DataFrame) -> List[str]:
+        """
+        Appends snapshot rows of the symbol, which carry at least the
+        expiry, strike & timestamp columns.
+
+        :returns: paths of the files written, one per session.
+        """
+
+        if 0 in data.shape:
+            return list()
+
+        paths = list()
+        data = data.sort_values(SORT_KEYS, kind="stable")
+
+        for session, rows in data.groupby(data.timestamp.dt.date, sort=True):
+            name = "part-{0:%H%M%S%f}-{1}.parquet".format(
+                rows.timestamp.min(), uuid4().hex[:8])
+            path = os.path.join(self.partition_dir(symbol, session), name)
+            self._write(rows, path)
+            paths.append(path)
+
+        return paths
+
+    def scan(self, symbol: str, start: datetime = None, end: datetime = None,
+             expiry: str = None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Snapshots of the symbol from `start` to `end`, both inclusive,
+        ordered by timestamp, expiry & strike.
+
+        :param symbol: Symbol recorded.
+        :param start: First snapshot time, from the first one if None.
+        :param end: Last snapshot time, up to the latest one if None.
+                    Either bound may be naive IST or timezone aware.
+        :param expiry: Single expiry to read, all of them if None.
+        :param columns: Columns to read besides the keys, all if None.
+        """
+
+        if not self.dates(symbol):
+            return pd.DataFrame()
+
+        dataset = ds.dataset(self.symbol_dir(symbol), format="parquet",
+                             partitioning=DATE_PARTITIONING)
+        conditions = list()
+
+        if start is not None:
+            start = exchange_time(start)
+            conditions += [ds.field("date") >= start.date().isoformat(),
+                           ds.field("timestamp") >= pa.scalar(start)]
+
+        if end is not None:
+            end = exchange_time(end)
+            conditions += [ds.field("date") <= end.date().isoformat(),
+                           ds.field("timestamp") <= pa.scalar(end)]
+
+        if expiry is not None:
+            conditions.append(ds.field("expiry") == expiry)
+
+        condition = None
+
+        for i in conditions:
+            condition = i if condition is None else condition&i
+
+        if columns is not None:
+            columns = list(dict.fromkeys(SORT_KEYS + list(columns)))
+
+        data = dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+        if "date" in data.columns:
+            data = data.drop(columns=["date"])
+
+        return data.sort_values(["timestamp", "expiry", "strike"],
+                                kind="stable").reset_index(drop=True)
+
+    def compact(self, symbol: str, date_: date) -> str:
+        """
+        Merges the files of a finished session into one, sorted on the
+        keys. Files appended meanwhile are left for the next compaction.
+        """
+
+        partition_dir = self.partition_dir(symbol, date_)
+        parts = sorted(os.path.join(partition_dir, i)
+                       for i in os.listdir(partition_dir)
+                       if i.endswith(".parquet"))
+
+        if len(parts) < 2:
+            return parts[0] if parts else None
+
+        data = pd.concat([pq.read_table(i).to_pandas() for i in parts],
+                         ignore_index=True)
+        data = data.sort_values(SORT_KEYS, kind="stable")
+        path = os.path.join(partition_dir, COMPACTED_FILE)
+        self._write(data, path)
+
+        for part in parts:
+            if part != path:
+                os.remove(part)
+
+        return path
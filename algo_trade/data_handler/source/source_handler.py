@@ -8,12 +8,15 @@ from algo_trade.data_handler.source.constants import \
     NSE_CM_BHAVCOPY_COL_RENAMED, NSE_FO_LIQUID_STOCKS, YFIN_INDEX_LIST, \
     TRADEABLE_INDICES_NAME
 from algo_trade.data_handler.exc import InvalidTicker
+from algo_trade.data_handler.strategy_output_store import \
+    StrategyOutputStore
 
 
 class SourceHandler(NseDataConfig, YFUtils):
 
-    def __init__(self):
-        super(SourceHandler, self).__init__()
+    def __init__(self, date_str: str = None):
+        super(SourceHandler, self).__init__(date_str)
+        self.output_store = StrategyOutputStore()
 
     def get_q_results_date(self, data: pd.DataFrame, date_str: date,
                            days: int = 3):
@@ -53,45 +56,63 @@ class SourceHandler(NseDataConfig, YFUtils):
 
         return data
 
-    def store_strategy_output(self, strategy_name: str, output_data: pd.DataFrame, output_date: str):
+    @staticmethod
+    def _output_date(output_date: Union[str, date]) -> date:
+        if isinstance(output_date, str):
+            return datetime.strptime(output_date, DATE_FMT).date()
+
+        return output_date
+
+    def store_strategy_output(self, strategy_name: str,
+                              output_data: pd.DataFrame,
+                              output_date: Union[str, date]):
         """
-        This method updates the processed bhavcopy to accomodate on 'symbol' as the common
+        Stores a strategy's output for the date in the output store,
+        partitioned by strategy & date.
         :param strategy_name(str):
         :param output_data(pd.DataFrame):
-        :param output_date(str):
+        :param output_date(str): Date in DATE_FMT, or a date.
         :return:
         """
 
-        dict_output = {output_date: output_data}
+        self.output_store.write(strategy_name,
+                                self._output_date(output_date), output_data)
 
-        try:
-            self.cache.loaded_dict["outputs"][strategy_name].update(dict_output)
-        except KeyError:
-            self.cache.loaded_dict["outputs"].update({strategy_name: dict_output})
-
-        self.cache.save()
-
-    def retrieve_strategy_output(self, strategy_name: str, output_date: str) \
+    def retrieve_strategy_output(self, strategy_name: str,
+                                 output_date: Union[str, date]) \
             -> Union[pd.DataFrame, None]:
         """
         This method allows you to retrieve stored output per strategy name.
+        Outputs stored in the cache before the output store existed are
+        moved over to it on first retrieval.
         :param strategy_name:
-        :param output_date:
+        :param output_date: Date in DATE_FMT, or a date.
         :return:
         """
-        try:
 
-            if strategy_name in self.cache["outputs"].keys() and \
-                    output_date in self.cache["outputs"][strategy_name].keys():
-                data = self.cache.loaded_dict["outputs"][strategy_name][output_date]
+        dated = self._output_date(output_date)
+        data = self.output_store.read(strategy_name, dated)
 
-                return data
+        if data is not None or "outputs" not in self.cache.loaded_dict:
+            return data
 
-            return None
+        legacy = self.cache["outputs"].get(strategy_name, dict())
+        data = legacy.get(dated.strftime(DATE_FMT))
 
-        except KeyError:
+        if data is not None:
+            self.output_store.write(strategy_name, dated, data)
+
+        return data
+
+    def scan_strategy_output(self, strategy_name: str, start: date = None,
+                             end: date = None, columns: list = None) \
+            -> pd.DataFrame:
+        """
+        Strategy's outputs from `start` to `end`, both inclusive, read off
+        the output store with a `date` column.
+        """
 
-            return None
+        return self.output_store.scan(strategy_name, start, end, columns)
 
     def processed_bhavcopy(self, top_n: int = 1000) -> pd.DataFrame:
         """
@@ -0,0 +1,217 @@
+import os
+import re
+import tempfile
+from datetime import date, datetime
+from threading import Lock, RLock
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dateutil.relativedelta import relativedelta
+
+from algo_trade.data_handler.source.constants import BAR_STORE_DIR
+
+PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+COVERED_FROM_KEY = b"covered_from"
+
+# Writers of a key, from any BarStore & thread, are serialized per file.
+KEY_LOCKS: Dict[str, RLock] = dict()
+KEY_LOCKS_GUARD = Lock()
+
+
+def period_start(period: str, end: date) -> Optional[date]:
+    """
+    Translates a yfinance `period` such as '5d', '3wk', '6mo', '1y' or
+    'ytd' into the first calendar date it covers up to `end`.
+    Returns None for 'max'.
+    """
+
+    if period == "max":
+        return None
+
+    if period == "ytd":
+        return end.replace(month=1, day=1)
+
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+
+    if match is None:
+        raise ValueError("Invalid period: {0}".format(period))
+
+    count, unit = match.groups()
+
+    return end - relativedelta(**{PERIOD_UNITS[unit]: int(count)})
+
+
+class BarStore:
+    """
+    BarStore is the on-disk OHLCV store for YFinance bars, keyed by
+    (symbol, interval) with one Parquet file per key.
+    Bars are kept as `yf.download` returns them, indexed on the bar
+    timestamp, so any period can be answered locally and only the
+    trailing bars need to be fetched from the network.
+    """
+
+    def __init__(self, root: str = BAR_STORE_DIR):
+        self.root = root
+
+    def path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, "{0}.parquet".format(symbol))
+
+    def lock(self, symbol: str, interval: str) -> RLock:
+        """ Lock held while the key's file is read, merged & replaced. """
+
+        with KEY_LOCKS_GUARD:
+            return KEY_LOCKS.setdefault(self.path(symbol, interval), RLock())
+
+    def read(self, symbol: str, interval: str) -> pd.DataFrame:
+        path = self.path(symbol, interval)
+
+        if not os.path.exists(path):
+            return pd.DataFrame()
+
+        return pq.read_table(path).to_pandas()
+
+    def covered_from(self, symbol: str, interval: str) -> Optional[str]:
+        """
+        First date (ISO format) or 'max' the stored bars were downloaded
+        for, as recorded in the Parquet schema metadata.
+        """
+
+        path = self.path(symbol, interval)
+
+        if not os.path.exists(path):
+            return None
+
+        metadata = pq.read_schema(path).metadata or dict()
+        value = metadata.get(COVERED_FROM_KEY)
+
+        return value.decode() if value is not None else None
+
+    def covers(self, symbol: str, interval: str, start: Optional[date]) \
+            -> bool:
+        """ Whether stored bars go back at least to `start`. """
+
+        covered_from = self.covered_from(symbol, interval)
+
+        if covered_from is None:
+            return False
+
+        if covered_from == "max":
+            return True
+
+        if start is None:
+            return False
+
+        return date.fromisoformat(covered_from) <= start
+
+    def is_fresh(self, symbol: str, interval: str, as_of: datetime) -> bool:
+        """ Whether the store for the key was written after `as_of`. """
+
+        path = self.path(symbol, interval)
+
+        if not os.path.exists(path):
+            return False
+
+        return os.path.getmtime(path) >= as_of.timestamp()
+
+    def touch(self, symbol: str, interval: str):
+        """ Marks stored bars as fresh when a refresh returned no new bar. """
+
+        path = self.path(symbol, interval)
+
+        if os.path.exists(path):
+            os.utime(path)
+
+    def is_continuous(self, stored: pd.DataFrame, bars: pd.DataFrame) -> bool:
+        """
+        Bars fetched for the gap must agree with the stored ones on
+        overlapping timestamps, else a split or dividend adjustment has
+        rewritten the history and the key needs a full refresh.
+        """
+
+        overlap = stored.index.intersection(bars.index)
+
+        if overlap.empty:
+            return True
+
+        return bool(np.allclose(stored.loc[overlap, "Open"],
+                                bars.loc[overlap, "Open"],
+                                rtol=1e-3, equal_nan=True))
+
+    def write(self, symbol: str, interval: str, bars: pd.DataFrame,
+              covered_from: str = None) -> pd.DataFrame:
+        """
+        Persists bars for a key.
+        When `covered_from` is passed, `bars` is a full period download
+        and replaces the stored bars, otherwise `bars` are appended with
+        newer rows replacing stored rows for the same timestamp.
+        Concurrent writes of a key are serialized, so an append always
+        merges with the bars last written.
+        """
+
+        with self.lock(symbol, interval):
+            return self._write(symbol, interval, bars, covered_from)
+
+    def _write(self, symbol: str, interval: str, bars: pd.DataFrame,
+               covered_from: str = None) -> pd.DataFrame:
+        if covered_from is None:
+            covered_from = self.covered_from(symbol, interval)
+            data = pd.concat([self.read(symbol, interval), bars])
+            data = data.loc[~data.index.duplicated(keep="last"), :]
+
+        else:
+            data = bars
+
+        data = data.sort_index()
+        data.columns.name = None
+
+        table = pa.Table.from_pandas(data)
+        metadata = dict(table.schema.metadata or dict())
+
+        if covered_from is not None:
+            metadata[COVERED_FROM_KEY] = covered_from.encode()
+
+        path = self.path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write aside under a name of its own and swap, so readers never
+        # see a partial file.
+        handle, temp_path = tempfile.mkstemp(
+            suffix=".tmp", prefix="." + os.path.basename(path),
+            dir=os.path.dirname(path))
+        os.close(handle)
+
+        try:
+            pq.write_table(table.replace_schema_metadata(metadata),
+                           temp_path)
+            os.replace(temp_path, path)
+
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        return data
+
+    def slice_period(self, data: pd.DataFrame, period: str, end: date,
+                     interval: str = "1d") -> pd.DataFrame:
+        """
+        Returns the bars a `yf.download` for the period would have.
+        Day periods on daily bars count sessions, like YFinance does.
+        """
+
+        if 0 in data.shape or period == "max":
+            return data
+
+        match = re.fullmatch(r"(\d+)d", period)
+
+        if match is not None and interval == "1d":
+            return data.tail(int(match.group(1)))
+
+        start = pd.Timestamp(period_start(period, end))
+
+        if getattr(data.index, "tz", None) is not None:
+            start = start.tz_localize(data.index.tz)
+
+        return data.loc[data.index >= start, :]
@@ -4,14 +4,23 @@ import numpy as np
 import yfinance as yf
 from datetime import datetime, date
 from calendar import monthrange
-from typing import List, Tuple
-
-from algo_trade.data_handler.calendar.constants import DATE_FMT, TODAY
-from algo_trade.data_handler.source.constants import YF_UTILS_EXCEPTION_LIST
+from threading import RLock
+from typing import List, Tuple, Dict, Iterable
+
+from algo_trade.data_handler.calendar.constants import DATE_FMT, TODAY, \
+    TIME_ZONE, MARKET_CLOSE_TIME
+from algo_trade.data_handler.source.constants import YF_UTILS_EXCEPTION_LIST, \
+    YF_BULK_CHUNK_SIZE, BAR_STORE_INTERVALS
+from algo_trade.data_handler.source.yfin.bar_store import BarStore, \
+    period_start
 from algo_trade.utils.meta import AsyncLoggingMeta
 from algo_trade.data_handler.calendar.calendar_tools import MarketCalendarTools
 from algo_trade.data_handler.source.data_utils import DataUtils
 
+# yf.download keeps its results in module level state, so concurrent
+# downloads from different threads are serialized.
+YF_DOWNLOAD_LOCK = RLock()
+
 
 class YFUtils(DataUtils, metaclass=AsyncLoggingMeta):
     """
@@ -19,6 +28,10 @@ class YFUtils(DataUtils, metaclass=AsyncLoggingMeta):
     in a very encapsulated way while also in a use-case specific way.
     """
 
+    def __init__(self, date_str: str = None):
+        super(YFUtils, self).__init__(date_str)
+        self.bar_store = BarStore()
+
     def get_period_data(
             self,
             symbol: str,
@@ -34,6 +47,8 @@ class YFUtils(DataUtils, metaclass=AsyncLoggingMeta):
     ) -> pd.DataFrame:
         """
         Gets you daily data for the selected range and interval.
+        Daily, weekly and monthly bars are served from the local
+        bar store, which only goes to the network for missing bars.
         """
 
         if not index:
@@ -42,10 +57,19 @@ class YFUtils(DataUtils, metaclass=AsyncLoggingMeta):
         else:
             symbol = symbol.upper()
 
-        data = yf.download(symbol, period=period, interval=interval,
-                           rounding=rounding, auto_adjust=auto_adjust,
-                           progress=progress,
-                           **kwargs)
+        if self.use_bar_store(interval, auto_adjust, **kwargs):
+            data = self._stored_bars([symbol], period, interval, 1,
+                                     rounding=rounding,
+                                     auto_adjust=auto_adjust,
+                                     progress=progress)
+            data = data.get(symbol, pd.DataFrame())
+
+        else:
+            with YF_DOWNLOAD_LOCK:
+                data = yf.download(symbol, period=period, interval=interval,
+                                   rounding=rounding, auto_adjust=auto_adjust,
+                                   progress=progress,
+                                   **kwargs)
 
         if 0 in data.shape:
             self.logger.error("Error Incurred for symbol: {0}".format(symbol))
@@ -72,6 +96,215 @@ class YFUtils(DataUtils, metaclass=AsyncLoggingMeta):
 
         return data.round(2)
 
+    def get_period_data_bulk(
+            self,
+            symbols: Iterable[str],
+            period: str = "1mo",
+            interval: str = "1d",
+            date_fmt: str = None,
+            rounding: bool = True,
+            index: bool = False,
+            ascending: bool = False,
+            auto_adjust: bool = True,
+            progress: bool = False,
+            chunk_size: int = YF_BULK_CHUNK_SIZE,
+            **kwargs
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Bulk counterpart of `get_period_data`.
+        Downloads `chunk_size` tickers per request, post-processes the
+        whole panel at once and splits it back into per-symbol frames.
+
+        :returns: dict of symbol and the DataFrame `get_period_data`
+                  would have returned for it.
+        """
+
+        symbols = list(dict.fromkeys(symbols))
+        tickers = {(i.upper() if index else i.upper() + ".NS"): i
+                   for i in symbols}
+        yf_tickers = list(tickers.keys())
+
+        if self.use_bar_store(interval, auto_adjust, **kwargs):
+            bars = self._stored_bars(yf_tickers, period, interval, chunk_size,
+                                     rounding=rounding,
+                                     auto_adjust=auto_adjust,
+                                     progress=progress)
+
+        else:
+            bars = self._download_bars(yf_tickers, chunk_size, period=period,
+                                       interval=interval, rounding=rounding,
+                                       auto_adjust=auto_adjust,
+                                       progress=progress, **kwargs)
+
+        bars = {i: j for i, j in bars.items() if 0 not in j.shape}
+        result = dict()
+
+        if bars:
+            date_col = next(iter(bars.values())).index.name or "Date"
+            panel = pd.concat(bars.values(), keys=bars.keys())
+            panel.index.names = ["ticker", date_col]
+            panel = self._process_bulk_panel(panel.reset_index(), date_col,
+                                             ascending, date_fmt)
+            result = {tickers[i]: j.drop(columns=["ticker"]).reset_index(
+                drop=True) for i, j in panel.groupby("ticker", sort=False)}
+
+        for ticker in yf_tickers:
+            symbol = tickers[ticker]
+
+            if symbol in result.keys():
+                continue
+
+            self.logger.error("Error Incurred for symbol: {0}".format(ticker))
+
+            if ticker in YF_UTILS_EXCEPTION_LIST.keys():
+                result[symbol] = self.get_period_data(
+                    YF_UTILS_EXCEPTION_LIST[ticker], period, interval,
+                    date_fmt)
+            else:
+                result[symbol] = pd.DataFrame()
+
+        return {i: result[i] for i in symbols}
+
+    def use_bar_store(self, interval: str, auto_adjust: bool,
+                      **kwargs) -> bool:
+        """
+        Only adjusted daily, weekly and monthly bars requested by period
+        are kept in the bar store.
+        """
+
+        return interval in BAR_STORE_INTERVALS and auto_adjust and not kwargs
+
+    def _download_bars(self, tickers: List[str], chunk_size: int,
+                       **kwargs) -> Dict[str, pd.DataFrame]:
+        """
+        Raw `yf.download` bars per ticker, requested `chunk_size`
+        tickers at a time and split out of the wide (ticker, field) frame.
+        """
+
+        result = dict()
+
+        for i in range(0, len(tickers), chunk_size):
+            chunk = tickers[i:i + chunk_size]
+            with YF_DOWNLOAD_LOCK:
+                data = yf.download(chunk, group_by="ticker", **kwargs)
+
+            if 0 in data.shape:
+                continue
+
+            if not isinstance(data.columns, pd.MultiIndex):
+                data.columns = pd.MultiIndex.from_product([chunk,
+                                                           data.columns])
+
+            downloaded = set(data.columns.get_level_values(0))
+
+            for ticker in chunk:
+                if ticker not in downloaded:
+                    continue
+
+                # Tickers without a quote on a given day are padded with NaN.
+                bars = data[ticker]
+                bars = bars.loc[~bars.Close.isna(), :]
+                bars.columns.name = None
+
+                if 0 not in bars.shape:
+                    result[ticker] = bars
+
+        return result
+
+    def _bar_store_cutoff(self) -> datetime:
+        """ Bars written after the last session closed are up-to-date. """
+
+        return datetime.combine(self.prev_day, MARKET_CLOSE_TIME,
+                                tzinfo=TIME_ZONE)
+
+    def _stored_bars(self, tickers: List[str], period: str, interval: str,
+                     chunk_size: int, **kwargs) -> Dict[str, pd.DataFrame]:
+        """
+        Answers a period request from the bar store.
+        Stale keys are topped up with a single batched download from the
+        oldest trailing bar, keys which don't reach back far enough, or
+        whose history was re-adjusted, are downloaded for the full period.
+        """
+
+        end = TODAY
+        start = period_start(period, end)
+        cutoff = self._bar_store_cutoff()
+        result, stale, missing = dict(), dict(), list()
+
+        for ticker in tickers:
+            if not self.bar_store.covers(ticker, interval, start):
+                missing.append(ticker)
+                continue
+
+            stored = self.bar_store.read(ticker, interval)
+
+            if self.bar_store.is_fresh(ticker, interval, cutoff):
+                result[ticker] = stored
+            else:
+                stale[ticker] = stored
+
+        if stale:
+            gap_start = min(i.index.max() for i in stale.values())
+            fetched = self._download_bars(list(stale.keys()), chunk_size,
+                                          start=gap_start.date(),
+                                          interval=interval, **kwargs)
+
+            for ticker, stored in stale.items():
+                bars = fetched.get(ticker)
+
+                if bars is None:
+                    self.bar_store.touch(ticker, interval)
+                    result[ticker] = stored
+
+                elif self.bar_store.is_continuous(stored, bars):
+                    result[ticker] = self.bar_store.write(ticker, interval,
+                                                          bars)
+                else:
+                    missing.append(ticker)
+
+        if missing:
+            covered_from = "max" if start is None else start.isoformat()
+            fetched = self._download_bars(missing, chunk_size, period=period,
+                                          interval=interval, **kwargs)
+
+            for ticker, bars in fetched.items():
+                result[ticker] = self.bar_store.write(ticker, interval, bars,
+                                                      covered_from)
+
+        self.logger.debug("Bar store: {0} fresh, {1} topped up, {2} "
+                          "downloaded.".format(len(tickers) - len(stale)
+                                               - len(missing), len(stale),
+                                               len(missing)))
+
+        return {i: self.bar_store.slice_period(j, period, end, interval)
+                for i, j in result.items()}
+
+    def _process_bulk_panel(self, data: pd.DataFrame, date_col: str,
+                            ascending: bool,
+                            date_fmt: str = None) -> pd.DataFrame:
+        """
+        Applies `get_period_data` post-processing on a stacked panel,
+        grouping by ticker wherever rows of a symbol depend on each other.
+        """
+
+        data = data.sort_values(by=["ticker", date_col])
+
+        data["prev_close"] = data.groupby("ticker").Close.shift(1)
+        data = data.loc[~data.prev_close.isna(), :]
+        data = self.calculate_pct_change(data, "Close", "prev_close")
+        data = data.sort_values(by=["ticker", date_col],
+                                ascending=[True, ascending])
+
+        if date_col == "Date":
+            data["Date"] = pd.to_datetime(data.Date).dt.date
+
+        data.columns = data.columns.str.lower()
+
+        if date_fmt is not None:
+            data["date"] = pd.to_datetime(data.date).dt.strftime(date_fmt)
+
+        return data.round(2)
+
     def get_unique_ticker_set(self, tickers: list) -> tuple:
         tickers = [i + ".NS" for i in tickers]
 
@@ -101,7 +334,9 @@ class YFUtils(DataUtils, metaclass=AsyncLoggingMeta):
             else:
                 period, interval = "3mo", "1mo"
 
-        data_dict = {i: self.get_period_data(i, period, interval, date_format).head(1) for i in tickers}
+        data_dict = self.get_period_data_bulk(tickers, period, interval,
+                                              date_format)
+        data_dict = {i: j.head(1) for i, j in data_dict.items()}
 
         for i, j in data_dict.items():
             j["symbol"] = i
@@ -132,9 +367,13 @@ class YFUtils(DataUtils, metaclass=AsyncLoggingMeta):
                                  ticker: str,
                                  days: Tuple[int],
                                  period: str,
-                                 interval: str) -> pd.DataFrame:
+                                 interval: str,
+                                 data: pd.DataFrame = None) -> pd.DataFrame:
+
+        if data is None:
+            data = self.get_period_data(ticker, period=period,
+                                        interval=interval)
 
-        data = self.get_period_data(ticker, period=period, interval=interval)
         data = data.sort_values(by='date', ascending=False)
         interval_days = [float(data['pct_change'].iloc[:i].sum()) for i in
                          days]
@@ -157,9 +396,15 @@ class YFUtils(DataUtils, metaclass=AsyncLoggingMeta):
                                 interval: str = '1d'):
 
         ticker_quotes = list()
-        for i in tickers:
+        data = self.get_period_data_bulk(tickers, period, interval)
+
+        for i, j in data.items():
+            if 0 in j.shape:
+                continue
+
             ticker_quotes.append(self.pullback_quote_generator(i, days,
                                                                period,
-                                                               interval))
+                                                               interval,
+                                                               j))
 
         return pd.concat(ticker_quotes)
@@ -0,0 +1,104 @@
+from typing import Dict, Iterable, List, Sequence
+
+from pandas import DataFrame, isna
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import scoped_session
+
+from algo_trade.utils.db_utils.db_exc import MissingNSESymbolsException
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE.
+UPSERT_DIALECTS = {"postgresql": postgresql.insert,
+                   "sqlite": sqlite.insert}
+
+
+def resolve_symbols(session: scoped_session, table: type,
+                    symbols: Iterable[str], column: str = "Symbol") \
+        -> Dict[str, str]:
+    """
+    Resolves the symbols against the table they reference, with a single
+    query for the whole set instead of one per row.
+
+    :param session: Session to query with.
+    :param table: Declared table holding the referenced symbols.
+    :param symbols: Symbols to resolve.
+    :param column: Column the symbols are referenced by.
+    :returns: dict of the symbols found, mapped to the stored value.
+    """
+
+    symbols = {i for i in symbols if not isna(i)}
+
+    if not symbols:
+        return dict()
+
+    referenced = getattr(table, column)
+    found = session.execute(select(referenced).where(
+        referenced.in_(symbols))).scalars()
+
+    return {i: i for i in found}
+
+
+def map_symbols(session: scoped_session, data: DataFrame, table: type,
+                column: str = "Symbol", strict: bool = False) -> DataFrame:
+    """
+    Maps the symbol column of a frame onto the table it references.
+    Rows whose symbol isn't found are dropped, or raise
+    `MissingNSESymbolsException` when strict.
+    """
+
+    resolved = data[column].map(resolve_symbols(session, table,
+                                                data[column].unique()))
+    missing = resolved.isna()
+
+    if strict and missing.any():
+        msg = "Missing Symbols from {0} are: {1}".format(
+            table.__tablename__, set(data.loc[missing, column]))
+        raise MissingNSESymbolsException(msg)
+
+    data = data.loc[~missing, :].copy()
+    data[column] = resolved[~missing]
+
+    return data
+
+
+def to_records(data: DataFrame) -> List[dict]:
+    """ Rows of the frame as dicts, with missing values as None. """
+
+    return data.astype(object).where(data.notna(), None).to_dict(
+        orient='records')
+
+
+def bulk_upsert(session: scoped_session, table: type, records: List[dict],
+                keys: Sequence[str] = ()) -> int:
+    """
+    Inserts the records into the table as one executemany statement.
+    On PostgreSQL & SQLite, rows conflicting on `keys`, which must be
+    unique on the table, are updated instead, so reloading the same data
+    is idempotent. Other dialects insert plainly.
+
+    :param session: Session to execute in, committed by the caller.
+    :param table: Declared table to load into.
+    :param records: Rows as dicts of column & value.
+    :param keys: Columns identifying a row, plain insert if empty.
+    :returns: count of the records loaded.
+    """
+
+    if not records:
+        return 0
+
+    dialect = session.get_bind().dialect.name
+
+    if not keys or dialect not in UPSERT_DIALECTS:
+        session.execute(insert(table), records)
+
+        return len(records)
+
+    statement = UPSERT_DIALECTS[dialect](table)
+    columns = set(records[0]) - set(keys)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={i: statement.excluded[i] for i in columns})
+
+    session.execute(statement, records)
+
+    return len(records)
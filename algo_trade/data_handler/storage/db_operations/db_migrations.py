@@ -0,0 +1,128 @@
+from typing import List, Sequence
+
+from sqlalchemy import Index, Table, UniqueConstraint, and_, delete, func, \
+    inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from algo_trade.utils.db_utils.declared_tables import Base
+from algo_trade.utils.logger.log_configurator import LogConfig
+
+logger = LogConfig.get_logger(__name__)
+
+
+def has_unique_key(connection: Connection, table_name: str,
+                   keys: Sequence[str]) -> bool:
+    """
+    Whether the table as it stands in the database has a primary key,
+    unique constraint or unique index on exactly the `keys` columns,
+    which ON CONFLICT needs to match.
+    """
+
+    inspector = inspect(connection)
+    keys = set(keys)
+
+    if set(inspector.get_pk_constraint(table_name)["constrained_columns"]) \
+            == keys:
+        return True
+
+    if any(set(i["column_names"]) == keys
+           for i in inspector.get_unique_constraints(table_name)):
+        return True
+
+    return any(i["unique"] and set(i["column_names"]) == keys
+               for i in inspector.get_indexes(table_name))
+
+
+def count_duplicates(connection: Connection, table: Table,
+                     keys: Sequence[str]) -> int:
+    """ Rows duplicating another on `keys`, rows with a NULL key aside. """
+
+    columns = [table.c[i] for i in keys]
+    keyed = and_(*[i.isnot(None) for i in columns])
+
+    rows = connection.execute(
+        select(func.count()).select_from(table).where(keyed)).scalar()
+    groups = connection.execute(select(func.count()).select_from(
+        select(*columns).where(keyed).group_by(*columns).subquery())).scalar()
+
+    return rows - groups
+
+
+def dedupe(connection: Connection, table: Table,
+           keys: Sequence[str]) -> int:
+    """
+    Deletes the rows duplicating another on `keys`, keeping the one
+    inserted last, by primary key. Rows with a NULL key are kept, as a
+    unique key doesn't treat NULLs as equal.
+
+    :returns: count of the rows deleted.
+    """
+
+    primary_key = list(table.primary_key.columns)[0]
+    columns = [table.c[i] for i in keys]
+
+    latest = select(func.max(primary_key)).group_by(*columns)
+    statement = delete(table).where(and_(
+        primary_key.not_in(latest), *[i.isnot(None) for i in columns]))
+
+    return connection.execute(statement).rowcount
+
+
+def unique_index(table: Table, keys: Sequence[str]) -> Index:
+    return Index("uq_{0}_{1}".format(table.name, "_".join(keys)).lower(),
+                 *[table.c[i] for i in keys], unique=True)
+
+
+def migrate_upsert_keys(engine: Engine,
+                        dedupe_rows: bool = False) -> List[str]:
+    """
+    Brings tables created before their unique constraints were declared in
+    line with them, as `create_all` never alters existing tables and
+    `bulk_upsert` conflicts on those keys.
+    For every declared unique constraint missing from an existing table,
+    a unique index on the same columns is created, in one transaction per
+    table. Unique indexes are used, as SQLite can't add constraints to a
+    table.
+    A table holding duplicate rows is left as it is, with a warning,
+    unless `dedupe_rows` is set, which deletes them first, keeping the
+    latest, and logs how many were deleted.
+
+    :returns: names of the indexes created.
+    """
+
+    created = list()
+
+    for table in Base.metadata.sorted_tables:
+        constraints = [i for i in table.constraints
+                       if isinstance(i, UniqueConstraint)]
+
+        for constraint in constraints:
+            keys = [i.name for i in constraint.columns]
+
+            with engine.begin() as connection:
+                if not inspect(connection).has_table(table.name) or \
+                        has_unique_key(connection, table.name, keys):
+                    continue
+
+                duplicates = count_duplicates(connection, table, keys)
+
+                if duplicates and not dedupe_rows:
+                    logger.warning(
+                        "{0} has {1} rows duplicating others on {2}, no "
+                        "unique key created. Migrate with dedupe_rows to "
+                        "delete them.".format(table.name, duplicates, keys))
+                    continue
+
+                if duplicates:
+                    logger.warning("{0}: deleted {1} rows duplicating others "
+                                   "on {2}.".format(
+                                       table.name,
+                                       dedupe(connection, table, keys), keys))
+
+                index = unique_index(table, keys)
+                index.create(connection)
+                created.append(index.name)
+                logger.info("{0}: created unique index {1}.".format(
+                    table.name, index.name))
+
+    return created
@@ -4,6 +4,7 @@ import pandas as pd
 from sqlalchemy.orm import scoped_session
 
 from algo_trade.utils.constants import MCAP_PATH, DATE_FMT
+from algo_trade.utils.db_utils.db_bulk_loader import map_symbols, to_records
 from algo_trade.utils.db_utils.db_constants import MCAP_DF_RENAME, FNO_MTLOTS_FILE_PATH, NSE_CO_LIST_RENAME, \
     SECTOR_INDEX_RENAME
 from algo_trade.utils.db_utils.db_session_handler import SessionHandler
@@ -69,7 +70,7 @@ class NSEDataMapper(NSEProcessor):
         
         return result, DefaultTable.__tablename__
     
-    @SessionHandler.session_handled_insert_operation
+    @SessionHandler.session_handled_bulk_operation
     def create_nse_co_list_data(self):
         data = self.update_nse_list(return_df=True)
         data["Lot Size"] = data["Lot Size"].fillna(0).apply(lambda x:int(x))
@@ -79,14 +80,11 @@ class NSEDataMapper(NSEProcessor):
         data = data.rename(columns=NSE_CO_LIST_RENAME)
         data.loc[:, "mcap"] = data.mcap.apply(lambda x:x if type(x) == float else 0)
         data = data.loc[data.index.isin(data.index.values.tolist()[:-3]), :]
-        data["Symbol"] = data.Symbol.apply(
-            lambda x:self.session.query(MarketCapList).filter_by(Symbol=x).first())
-        data["Symbol"] = data.Symbol.apply(lambda x:x.Symbol)
-        data = [NSECOList(**i) for i in data.to_dict(orient=self.orient)]
+        data = map_symbols(self.session, data, MarketCapList)
         
-        return data, NSECOList.__tablename__
+        return to_records(data), NSECOList, ("Symbol",)
     
-    @SessionHandler.session_handled_insert_operation
+    @SessionHandler.session_handled_bulk_operation
     def make_fno_stock_file(self):
         today = datetime.today().strftime(DATE_FMT)
         
@@ -100,18 +98,10 @@ class NSEDataMapper(NSEProcessor):
                                    value_name="lotsize")
         stock_fno["lotsize"] = stock_fno.lotsize.apply(lambda x:x.strip()).apply(lambda x:int(x) if x != '' else 0)
         
-        symbols = stock_fno.Symbol.apply(
-            lambda x:self.session.query(MarketCapList).filter_by(Symbol=x).first())
-        stock_fno["Symbol"] = symbols.apply(lambda x:x.Symbol)
-        missing_symbol_df = stock_fno.loc[stock_fno.Symbol.isna(), :]
-        missing_symbols = set(missing_symbol_df.Underlying.values.tolist())
-        if len(missing_symbols) != 0:
-            msg = "Missing Symbols from FNO Lots are: {0}".format(missing_symbols)
-            raise MissingNSESymbolsException(msg)
-        
-        stock_fno = [StockFNOLots(**i) for i in stock_fno.to_dict(orient=self.orient)]
+        # Raises MissingNSESymbolsException for symbols missing from Mcap.
+        stock_fno = map_symbols(self.session, stock_fno, MarketCapList, strict=True)
         
-        return stock_fno, StockFNOLots.__tablename__
+        return to_records(stock_fno), StockFNOLots, ("Symbol", "month")
     
     @SessionHandler.session_handled_insert_operation
     def create_index_table_data(self, index_df: pd.DataFrame):
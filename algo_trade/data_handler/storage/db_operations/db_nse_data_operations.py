@@ -4,6 +4,7 @@ from pandas import to_datetime, DataFrame
 from sqlalchemy.orm import scoped_session
 
 from algo_trade.utils.constants import DATE_FMT
+from algo_trade.utils.db_utils.db_bulk_loader import map_symbols, to_records
 from algo_trade.utils.db_utils.db_constants import DAILY_BHAV_RENAME, DAILY_BHAV_COL_ORDER, INDEX_REPORT_RENAME, \
     CPR_REPORT_RENAME, INDEX_COL_ORDER, CPR_COL_ORDER, DB_INSERTION_EXCLUSIONS
 from algo_trade.utils.db_utils.db_session_handler import SessionHandler
@@ -24,22 +25,19 @@ class NSEDataUpdater:
     def retrieve_data(self, table_name, *args, **kwargs):
         pass
     
-    @SessionHandler.session_handled_insert_operation
+    @SessionHandler.session_handled_bulk_operation
     def create_fno_sec_ban(self):
-        result = self.nse_processor.get_fno_secban_list()
-        result = [self.session.query(MarketCapList).filter_by(Symbol=x).first() for x in result]
-        result = [x.Symbol for x in result]
-        dated = [datetime.strptime(self.nse_processor.next_bday, DATE_FMT).date()] * len(result)
-        result = list(zip(result, dated))
+        result = DataFrame({"Securities":self.nse_processor.get_fno_secban_list()})
         
-        if not result:
-            return list(), FNOSecBan.__tablename__
+        if result.empty:
+            return list(), FNOSecBan, ("Securities", "Dated")
         
-        result = [FNOSecBan(Securities=symbol, Dated=dated_) for symbol, dated_ in result]
+        result = map_symbols(self.session, result, MarketCapList, column="Securities")
+        result["Dated"] = datetime.strptime(self.nse_processor.next_bday, DATE_FMT).date()
         
-        return result, FNOSecBan.__tablename__
+        return to_records(result), FNOSecBan, ("Securities", "Dated")
     
-    @SessionHandler.session_handled_insert_operation
+    @SessionHandler.session_handled_bulk_operation
     def daily_bhavcopy_update(self, nse_top: int = 1500, fno: bool = False, return_df: bool = False,
                               delete_file_downloads: bool = False, orient: str = 'records'):
         data = self.nse_processor.cm_data_to_processed_df(nse_top, fno, return_df, delete_file_downloads)
@@ -54,15 +52,11 @@ class NSEDataUpdater:
         # Date format
         data["Timestamp"] = to_datetime(data.Timestamp).apply(lambda x:x.date())
         
-        # Symbol
+        # Symbol Foreign Key association, resolved in a single query.
         data = data.loc[~(data.Series != 'EQ'), :]
-        data["Symbol"] = data.Symbol.apply(
-            lambda x:self.session.query(MarketCapList).filter_by(Symbol=x).first())
-        data["Symbol"] = data.Symbol.apply(lambda x:x.Symbol)
+        data = map_symbols(self.session, data, MarketCapList)
         
-        result = [DailyBhavCopy(**i) for i in data.to_dict(orient=orient)]
-        
-        return result, DailyBhavCopy.__tablename__
+        return to_records(data), DailyBhavCopy, ("Symbol", "Timestamp")
     
     @SessionHandler.session_handled_insert_operation
     def insert_index_report(self, data: DataFrame, table: type = IndexReport, orient: str = 'records'):
@@ -73,7 +67,7 @@ class NSEDataUpdater:
         
         return result, table.__tablename__
     
-    @SessionHandler.session_handled_insert_operation
+    @SessionHandler.session_handled_bulk_operation
     def insert_cpr_report(self, data: DataFrame, table: type = CPROutput, orient: str = 'records'):
         data = data.rename(columns=CPR_REPORT_RENAME)
         
@@ -86,13 +80,10 @@ class NSEDataUpdater:
         
         data = data[CPR_COL_ORDER]
         
-        # Symbol Foreign Key association.
-        data["Symbol"] = data.Symbol.apply(lambda x:self.session.query(MarketCapList).filter_by(Symbol=x).first())
-        data["Symbol"] = data.Symbol.apply(lambda x:x.Symbol)
+        # Symbol Foreign Key association, resolved in a single query.
+        data = map_symbols(self.session, data, MarketCapList)
         
-        result = [table(**i) for i in data.to_dict(orient=orient)]
-        
-        return result, table.__tablename__
+        return to_records(data), table, ("Symbol", "Timestamp")
 
 
 if __name__ == '__main__':
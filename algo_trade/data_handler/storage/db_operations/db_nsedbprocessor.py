@@ -19,6 +19,7 @@ from algo_trade.utils.db_utils.db_constants import (
     POOL_SIZE,
     POOL_RECYCLE
     )
+from algo_trade.utils.db_utils.db_migrations import migrate_upsert_keys
 from algo_trade.utils.db_utils.db_nse_data_mapper import NSEDataMapper
 from algo_trade.utils.db_utils.db_nse_data_operations import NSEDataUpdater
 from algo_trade.utils.db_utils.declared_tables import Base
@@ -47,6 +48,7 @@ class NSEDatabaseProcessor:
             database: str,
             db_engine_echo: bool = False,
             create_db_if_not_exists: bool = False,
+            dedupe_upsert_keys: bool = False,
             *args,
             **kwargs
             ):
@@ -54,13 +56,20 @@ class NSEDatabaseProcessor:
         self.engine = self.make_connection(db_url, database, db_engine_echo)
         self.session = scoped_session(sessionmaker(self.engine))
         
-        if self.validation_process(create_db_if_not_exists) is False:
+        validated = self.validation_process(create_db_if_not_exists)
+        
+        if validated is False:
             # If Validation Process is True,
             # it means that the database is setup by default.
             self.data_mapper = NSEDataMapper(self.session)
             self.init_creation_process()
             self.data_mapper.create_initial_data_mappings()
         
+        elif validated:
+            # Existing databases get the unique keys the upserts conflict
+            # on. Duplicate rows are only deleted when asked to.
+            migrate_upsert_keys(self.engine, dedupe_upsert_keys)
+        
         self.data_operator = NSEDataUpdater(self.session)
         self.data_operator.daily_bhavcopy_update()
         self.data_operator.create_fno_sec_ban()
@@ -1,6 +1,7 @@
 from datetime import datetime
 from functools import wraps
 
+from algo_trade.utils.db_utils.db_bulk_loader import bulk_upsert
 from algo_trade.utils.db_utils.declared_tables import DefaultTable
 
 
@@ -31,3 +32,20 @@ class SessionHandler:
                 self.session.commit()
         
         return handle_session
+    
+    @staticmethod
+    def session_handled_bulk_operation(operations):
+        """
+        Operations return the rows to load as a list of dicts, the
+        declared table and the columns a row is upserted on.
+        """
+        
+        @wraps(operations)
+        def handle_session(self, *args, **kwargs):
+            records, table, keys = operations(self, *args, **kwargs)
+            
+            if records:
+                bulk_upsert(self.session, table, records, keys)
+                self.session.commit()
+        
+        return handle_session
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, Integer, Float, Date, ForeignKey, ForeignKeyConstraint
+from sqlalchemy import Column, String, Integer, Float, Date, ForeignKey, ForeignKeyConstraint, UniqueConstraint
 
 from algo_trade.utils.db_utils.declared_tables.base import Base
 
 
 class DailyBhavCopy(Base):
     __tablename__ = 'dailybhav'
+    __table_args__ = (UniqueConstraint("Symbol", "Timestamp"),)
     
     id = Column(Integer, autoincrement=True, primary_key=True)
     isin = Column("isin", String(50))
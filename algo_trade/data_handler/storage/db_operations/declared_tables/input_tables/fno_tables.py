@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Date, ForeignKeyConstraint
+from sqlalchemy import Column, Integer, ForeignKey, String, Date, ForeignKeyConstraint, UniqueConstraint
 
 from algo_trade.utils.db_utils.declared_tables.base import Base
 
 
 class StockFNOLots(Base):
     __tablename__ = "fnolots"
+    __table_args__ = (UniqueConstraint("Symbol", "month"),)
     id = Column(Integer, autoincrement=True, primary_key=True)
     Underlying = Column("Underlying", String(200))
     Symbol = Column(String(200), ForeignKey("mcap.Symbol"))
@@ -28,6 +29,7 @@ class IndexFNOLots(Base):
 
 class FNOSecBan(Base):
     __tablename__ = "fnosecban"
+    __table_args__ = (UniqueConstraint("Securities", "Dated"),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     Dated = Column("Dated", Date)
@@ -4,7 +4,8 @@ from sqlalchemy import (
     String,
     Float,
     ForeignKey,
-    ForeignKeyConstraint
+    ForeignKeyConstraint,
+    UniqueConstraint
     )
 
 from algo_trade.utils.db_utils.declared_tables.base import Base
@@ -12,6 +13,7 @@ from algo_trade.utils.db_utils.declared_tables.base import Base
 
 class NSECOList(Base):
     __tablename__ = "nseco_list"
+    __table_args__ = (UniqueConstraint("Symbol"),)
     # MarketCapList
     index = Column("index", Integer, nullable=False, primary_key=True)
     Symbol = Column(String(200), ForeignKey("mcap.Symbol", ondelete='cascade'))
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Date
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Date, UniqueConstraint
 
 from algo_trade.utils.db_utils.declared_tables.base import Base
 
 
 class CPROutput(Base):
     __tablename__ = "cpr_output"
+    __table_args__ = (UniqueConstraint("Symbol", "Timestamp"),)
     
     id = Column("id", Integer, primary_key=True, autoincrement=True)
     Symbol = Column("Symbol", String(50), ForeignKey("mcap.Symbol"))
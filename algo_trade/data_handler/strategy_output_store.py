@@ -0,0 +1,147 @@
+import os
+from datetime import date
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from algo_trade.data_handler.source.constants import STRATEGY_OUTPUT_DIR
+
+PARTITION_FILE = "part-0.parquet"
+# Files are written aside under a name scans skip, starting with '.'.
+TEMP_FILE = ".part-0.parquet.tmp"
+
+
+def to_arrow(data: pd.DataFrame) -> pa.Table:
+    """
+    Table of a strategy's output, index included. Object columns Arrow
+    can't type, such as numbers or flags mixed with the "-" a
+    `fillna("-")` leaves, are stored as strings, nulls kept as nulls.
+    """
+
+    try:
+        return pa.Table.from_pandas(data, preserve_index=True)
+
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        data = data.copy()
+
+    for column in data.columns[data.dtypes == object]:
+        values = data[column]
+
+        try:
+            pa.array(values, from_pandas=True)
+
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            data[column] = values.astype(str).where(values.notna(), None)
+
+    return pa.Table.from_pandas(data, preserve_index=True)
+
+
+class StrategyOutputStore:
+    """
+    StrategyOutputStore keeps the daily output of every strategy on disk,
+    one Parquet file per (strategy, date) in hive style partitions:
+    `<root>/strategy=IntradayCPRAnalysis/date=2024-01-02/part-0.parquet`.
+    A day's output is read straight from its file, and a strategy's
+    history is scanned for a date range off the partitions' names, so no
+    other strategy or day is ever loaded.
+    Frames are stored with their index, as the strategies produced them,
+    see `to_arrow` for the columns stored as strings.
+    """
+
+    def __init__(self, root: str = STRATEGY_OUTPUT_DIR):
+        self.root = root
+
+    def strategy_dir(self, strategy_name: str) -> str:
+        return os.path.join(self.root, "strategy={0}".format(strategy_name))
+
+    def path(self, strategy_name: str, output_date: date) -> str:
+        return os.path.join(self.strategy_dir(strategy_name),
+                            "date={0}".format(output_date.isoformat()),
+                            PARTITION_FILE)
+
+    def has(self, strategy_name: str, output_date: date) -> bool:
+        return os.path.exists(self.path(strategy_name, output_date))
+
+    def strategies(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return list()
+
+        return sorted(i.split("=", 1)[1] for i in os.listdir(self.root)
+                      if i.startswith("strategy="))
+
+    def dates(self, strategy_name: str) -> List[date]:
+        """ Output dates stored for the strategy, oldest first. """
+
+        strategy_dir = self.strategy_dir(strategy_name)
+
+        if not os.path.isdir(strategy_dir):
+            return list()
+
+        return sorted(date.fromisoformat(i.split("=", 1)[1])
+                      for i in os.listdir(strategy_dir)
+                      if i.startswith("date=")
+                      and os.path.exists(os.path.join(strategy_dir, i,
+                                                      PARTITION_FILE)))
+
+    def write(self, strategy_name: str, output_date: date,
+              data: pd.DataFrame):
+        """ Stores a day's output, replacing any stored for the date. """
+
+        path = self.path(strategy_name, output_date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write aside and swap, so readers never see a partial file, nor
+        # do scans, which skip the temp file's name.
+        temp_path = os.path.join(os.path.dirname(path), TEMP_FILE)
+        pq.write_table(to_arrow(data), temp_path)
+        os.replace(temp_path, path)
+
+    def read(self, strategy_name: str, output_date: date) \
+            -> Optional[pd.DataFrame]:
+        """ A day's output of the strategy, None if not stored. """
+
+        path = self.path(strategy_name, output_date)
+
+        if not os.path.exists(path):
+            return None
+
+        return pq.read_table(path).to_pandas()
+
+    def scan(self, strategy_name: str, start: date = None, end: date = None,
+             columns: List[str] = None) -> pd.DataFrame:
+        """
+        Outputs of the strategy from `start` to `end`, both inclusive,
+        oldest first, with the output date in a `date` column.
+        Only the files of the dates within the range are read, each on
+        its own, as a column stored as strings one day, see `to_arrow`,
+        may be numeric another, which no single dataset schema can hold.
+
+        :param columns: Columns to read, all if None.
+        """
+
+        dates = [i for i in self.dates(strategy_name)
+                 if (start is None or i >= start)
+                 and (end is None or i <= end)]
+
+        if not dates:
+            return pd.DataFrame()
+
+        frames = list()
+
+        for output_date in dates:
+            data = pq.read_table(self.path(strategy_name, output_date),
+                                 columns=columns,
+                                 use_pandas_metadata=False).to_pandas()
+            data["date"] = output_date
+            frames.append(data)
+
+        return pd.concat(frames, ignore_index=True)
+
+    def delete(self, strategy_name: str, output_date: date):
+        path = self.path(strategy_name, output_date)
+
+        if os.path.exists(path):
+            os.remove(path)
+            os.rmdir(os.path.dirname(path))
@@ -1,14 +1,14 @@
 import pandas as pd
 import numpy as np
-from math import floor, ceil
 from typing import Optional, List, Union, Dict, Tuple
-from functools import cache
 
 # Internal Modules import.
-from algo_trade.data_handler import DataHandler
 from algo_trade.utils.meta import AsyncLoggingMeta
-from algo_trade.market.strategy.indicators.moving_averages import \
-    MovingAverages
+from algo_trade.market.strategy.market_data_context import MarketDataContext
+from algo_trade.market.strategy.indicators import BarPanel, MovingAverages
+from algo_trade.market.strategy.indicators.consolidation_engine import \
+    leading_run, time_consolidation, price_consolidation, \
+    PRICE_CONSOLIDATION_EMAS, PRICE_CONSOLIDATION_RANGE
 
 
 class ConsolidationRange(metaclass=AsyncLoggingMeta):
@@ -17,27 +17,13 @@ class ConsolidationRange(metaclass=AsyncLoggingMeta):
     consolidation range for a stock/index.
     """
 
-    def __init__(self, con_threshold: int = 1):
-        self.yf_utils = DataHandler()
+    def __init__(self, con_threshold: int = 1,
+                 context: MarketDataContext = None):
+        self.con_threshold = con_threshold
+        self.context = context or MarketDataContext()
+        self.yf_utils = self.context.data_handler
         self.moving_avg = MovingAverages()
 
-    @cache
-    def _get_data_for_consolidation(self,
-                                    tickers: Union[tuple, str],
-                                    period: str,
-                                    interval: str
-                                    ) -> Dict[str, pd.DataFrame]:
-        if isinstance(tickers, str):
-            return {tickers: self.yf_utils.get_period_data(tickers,
-                                                           period=period,
-                                                           interval=interval)}
-
-        data = {i: self.yf_utils.get_period_data(i, period=period,
-                                                 interval=interval)
-                for i in tickers}
-
-        return data
-
     def _get_count_consolidation(self, data: list, con_threshold: int = 1) -> \
             int:
         """
@@ -45,43 +31,61 @@ class ConsolidationRange(metaclass=AsyncLoggingMeta):
         the provided stock or index has been consolidating.
         """
 
-        i, count = 0, 0
+        return int(leading_run([data], con_threshold)[0])
 
-        # Iterate over the % Change for a given day
-        # and then count or break.
-        while i < len(data):
-            try:
-                if floor(abs(data[i])) < con_threshold:
-                    count += 1
+    def _consolidation_panel(self, tickers: Union[Tuple[str], str],
+                             period: str, interval: str) -> BarPanel:
+        if isinstance(tickers, str):
+            tickers = (tickers,)
 
-                else:
-                    break
+        return self.context.bar_panel(tuple(tickers), period, interval,
+                                      ("close", "pct_change"))
 
-            except ValueError:
-                pass
+    def _per_ticker(self, tickers: Union[Tuple[str], str], panel: BarPanel,
+                    values: np.ndarray) -> pd.Series:
+        """
+        Counts of the panel's symbols over all the tickers asked for, in
+        their order, 0 for tickers without bars, which the panel drops.
+        """
 
-            i += 1
+        if isinstance(tickers, str):
+            tickers = (tickers,)
 
-        return count
+        return pd.Series(values, index=panel.symbols, dtype=int) \
+            .reindex(list(tickers), fill_value=0)
 
-    def _get_consolidation_range(self, data: pd.DataFrame) -> int:
+    def consolidation_panel(self, tickers: Union[Tuple[str], str],
+                            period: str = 'ytd', interval: str = '1d',
+                            emas: Tuple[int] = PRICE_CONSOLIDATION_EMAS,
+                            min_max_range: Tuple[int, int] =
+                            PRICE_CONSOLIDATION_RANGE) -> pd.DataFrame:
+        """
+        Price & time consolidation of all the tickers in one pass over a
+        bar panel.
 
-        data = data.reset_index()
+        :returns: DataFrame of symbol, price_con_range & time_con_range.
+        """
 
-        data = data["pct_change"].values.tolist()
+        panel = self._consolidation_panel(tickers, period, interval)
+        price = self._per_ticker(tickers, panel, price_consolidation(
+            panel["close"], emas, min_max_range))
+        time = self._per_ticker(tickers, panel, time_consolidation(
+            panel["pct_change"], self.con_threshold))
 
-        return self._get_count_consolidation(data)
+        return pd.DataFrame({
+            "symbol": price.index,
+            "price_con_range": price.to_numpy(),
+            "time_con_range": time.to_numpy()
+            })
 
     def get_time_consolidation(self, tickers: Union[List[str], str],
                                chart: str = 'D', to_df: bool = True,
                                period: str = 'ytd', interval: str = '1d', ) -> \
             Union[pd.DataFrame, Dict[str, int]]:
 
-        data = self._get_data_for_consolidation(tuple(tickers), period,
-                                                interval)
-
-        data = {i: self._get_consolidation_range(j)
-                for i, j in data.items()}
+        panel = self._consolidation_panel(tickers, period, interval)
+        data = self._per_ticker(tickers, panel, time_consolidation(
+            panel["pct_change"], self.con_threshold)).to_dict()
 
         if to_df:
             data = pd.DataFrame(tuple(data.items()), columns=["symbol",
@@ -101,40 +105,13 @@ class ConsolidationRange(metaclass=AsyncLoggingMeta):
         and retrieve price consolidation.
         """
 
-        data = self._get_data_for_consolidation(tickers,
-                                                period=period,
-                                                interval=interval)
-        data = {i: self.moving_avg.add_moving_averages(j, ma_range=emas)
-                for i, j in data.items()}
-
-        # TODO: implement logic for price consolidation.
-
-        col_names = ["EMA{0}".format(i) for i in emas]
-
-        result = list()
-
-        for i, j in data.items():
-            j['close/min'] = ((j.close - j[col_names].min(axis=1)) /
-                              j.close) * 100
-            j['close/max'] = ((j.close - j[col_names].max(axis=1)) /
-                              j.close) * 100
-            j['close/min-max'] = (j["close/min"]
-                                  - j["close/max"]). \
-                apply(lambda x: floor(x)).round(2)
-
-            j['price_consolidation'] = j["close/min-max"]. \
-                apply(
-                lambda x: 1 if min_max_range[0] <= x <= min_max_range[1]
-                else 0)
-
-            j = j.drop(columns=['close/min', 'close/max', 'close/min-max',
-                                *col_names])
-            j = j.price_consolidation.values.tolist()
-
-            result.append((i, self._get_count_consolidation(j)))
+        panel = self._consolidation_panel(tickers, period, interval)
+        data = self._per_ticker(tickers, panel, price_consolidation(
+            panel["close"], emas, min_max_range)).to_dict()
 
         if to_df:
-            data = pd.DataFrame(result, columns=["symbol", "price_con_range"])
+            data = pd.DataFrame(tuple(data.items()), columns=["symbol",
+                                                              "price_con_range"])
 
         return data
 
@@ -160,16 +137,5 @@ class ConsolidationRange(metaclass=AsyncLoggingMeta):
 
         interval = chart_interval[chart]
 
-        tickers = tuple(tickers)
-
-        price_consolidation = self.get_price_consolidation(tuple(tickers),
-                                                           period,
-                                                           interval, emas)
-
-        time_consolidation = self.get_time_consolidation(tuple(tickers),
-                                                         period,
-                                                         interval, chart)
-
-        return pd.merge(price_consolidation,
-                        time_consolidation,
-                        on="symbol")
+        return self.consolidation_panel(tuple(tickers), period, interval,
+                                        emas)
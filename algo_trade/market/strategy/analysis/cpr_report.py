@@ -5,11 +5,14 @@ from algo_trade.market.strategy.scanners.positional.weekly_cpr_strategy \
     import WeeklyCPRStrategy
 from algo_trade.market.strategy.scanners.monthly.monthly_cpr import \
     MonthlyCprStrategy
+from algo_trade.market.strategy.market_data_context import MarketDataContext
 
 
-def cpr_report():
-    cprs = (IntradayStockCPRStrategy(), WeeklyCPRStrategy(),
-            MonthlyCprStrategy())
+def cpr_report(context: MarketDataContext = None):
+    context = context or MarketDataContext()
+    cprs = (IntradayStockCPRStrategy(context=context),
+            WeeklyCPRStrategy(context=context),
+            MonthlyCprStrategy(context=context))
     data = list()
     for i in cprs:
         data.append(i.cpr_strategy_output())
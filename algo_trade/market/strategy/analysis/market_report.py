@@ -1,10 +1,11 @@
-from pandas import concat
+import asyncio
+from pandas import concat, DataFrame
 from datetime import date
 import re
 import os
 from typing import Dict, List
-from algo_trade.data_handler import DataHandler
 from algo_trade.utils.meta import AsyncLoggingMeta
+from algo_trade.market.strategy.market_data_context import MarketDataContext
 from algo_trade.market.strategy.analysis.spot_index_analysis import \
     DailyIntradayIndicesReport
 from algo_trade.market.strategy.analysis.option_chain_analysis import \
@@ -25,25 +26,31 @@ class MarketReport(metaclass=AsyncLoggingMeta):
         with open(file_path, "w+") as file:
             file.write(analysis)
 
-    def __init__(self):
-        self.data_handler = DataHandler()
+    def __init__(self, context: MarketDataContext = None):
+        self.context = context or MarketDataContext()
+        self.data_handler = self.context.data_handler
         self.next_day = self.data_handler.next_day
         self.prev_day = self.data_handler.prev_day
 
-    def verify_fii_dii_trades(self) -> dict:
-        data = self.data_handler.nse_api_fii_dii_trade()
+    def verify_fii_dii_trades(self, data: DataFrame = None) -> dict:
+
+        if data is None:
+            data = self.data_handler.nse_api_fii_dii_trade()
 
         return data.to_dict(orient='split')
 
-    def identify_fno_sec_ban(self) -> str:
-        data = self.data_handler.nse_daily_bhavcopy(self.next_day,
-                                                    'FnoSec Ban')
+    def identify_fno_sec_ban(self, data: str = None) -> str:
+
+        if data is None:
+            data = self.context.nse_daily_bhavcopy(self.next_day,
+                                                   'FnoSec Ban')
         return re.sub(r"\n\d+,", ", ", data)
 
-    def sectoral_view(self, head: int = 5):
+    def sectoral_view(self, head: int = 5, data: DataFrame = None):
         """ Gets you top 5 performing sectoral View for the day. """
 
-        data = self.data_handler.get_nse_all_indices()
+        if data is None:
+            data = self.context.all_indices()
         columns = ["index", "percentChange"]
         filters = ["SECTORAL INDICES"]
         symbols = ["NIFTY 50", "NIFTY 100", "NIFTY 500"]
@@ -64,8 +71,11 @@ class MarketReport(metaclass=AsyncLoggingMeta):
 
         return '\n'.join(data)
 
-    def advance_decline(self):
-        data = self.data_handler.nse_daily_bhavcopy(self.prev_day)
+    def advance_decline(self, data: DataFrame = None):
+
+        if data is None:
+            data = self.context.nse_daily_bhavcopy(self.prev_day)
+
         data = data.loc[data.SctySrs == 'EQ', :]
         data["pctChange"] = ((data["ClsPric"] - data["PrvsClsgPric"]) / data[
             "PrvsClsgPric"])
@@ -83,7 +93,7 @@ class MarketReport(metaclass=AsyncLoggingMeta):
         """
 
         index_movers = 100
-        data = self.data_handler.processed_bhavcopy(100)
+        data = self.context.processed_bhavcopy(100)
         data = data[["symbol", "pct_change", "purpose"]].round(2)
         top_5 = data.sort_values(by=["pct_change"], ascending=False).head(5)
         top_5["flag"] = top_5.purpose.apply(lambda x: -1 if x != "-" else 1)
@@ -148,6 +158,36 @@ class MarketReport(metaclass=AsyncLoggingMeta):
 
         return text
 
+    async def fetch_post_market_data(self) -> dict:
+        """
+        Fetches everything the post market report needs from NSE
+        concurrently: all indices, index option chains, FII/DII, the
+        bhavcopy and the F&O sec ban list.
+        """
+
+        client = self.data_handler.nse_client
+        downloads = client.nse_map.nse_download_domain
+        symbols = list(OptionChainAnalysis.INDEX_EXPIRY_WEEKDAY.keys())
+
+        all_indices, fii_dii, bhavcopy, sec_ban, option_chains = \
+            await asyncio.gather(
+                client.all_indices(),
+                client.fii_dii_trade(),
+                client.call_limited(downloads, self.context.nse_daily_bhavcopy,
+                                    self.prev_day),
+                client.call_limited(downloads, self.context.nse_daily_bhavcopy,
+                                    self.next_day, 'FnoSec Ban'),
+                client.option_chains(symbols)
+                )
+
+        return {"all_indices":self.context.memoize(
+                    "all_indices", self.data_handler.parse_all_indices,
+                    all_indices),
+                "fii_dii":self.data_handler.parse_fii_dii_trade(fii_dii),
+                "bhavcopy":bhavcopy,
+                "sec_ban":sec_ban,
+                "option_chains":option_chains}
+
     def post_market_indices_report(self) -> str:
         """
         A complete post market Analysis in text.
@@ -160,13 +200,17 @@ class MarketReport(metaclass=AsyncLoggingMeta):
         Meant to handle all the technical analysis.
         """
 
-        indices_report = DailyIntradayIndicesReport()
-        option_chain = OptionChainAnalysis()
+        data = asyncio.run(self.fetch_post_market_data())
+
+        indices_report = DailyIntradayIndicesReport(data["all_indices"],
+                                                    context=self.context)
+        option_chain = OptionChainAnalysis(context=self.context)
         indices = indices_report.indices_report()
         indices = indices.to_dict(orient='split')['data']
 
         # Option Chain Analysis.
-        post_market_analysis = option_chain.all_indices_analysis()
+        post_market_analysis = option_chain.all_indices_analysis(
+            option_chains=data["option_chains"])
         post_market_analysis.insert(1, '')
         analysis = list(zip(indices, post_market_analysis))
         text = '*{0} {1} {2}%*, ' \
@@ -182,16 +226,17 @@ class MarketReport(metaclass=AsyncLoggingMeta):
         text += '\n'.join(text_list)
 
         # FII/DII, Advance Decline, Sectoral Performers and Sec bans.
-        fii_dii = self.verify_fii_dii_trades()
-        adv_dec = self.advance_decline()
-        sec = "\n*Top 5 Sectoral Performers*:\n" + self.sectoral_view()
+        fii_dii = self.verify_fii_dii_trades(data["fii_dii"])
+        adv_dec = self.advance_decline(data["bhavcopy"])
+        sec = "\n*Top 5 Sectoral Performers*:\n" + self.sectoral_view(
+            data=data["all_indices"])
         fii_title = "\n*FII/DII*:\n" \
                     "{0}  {2} - {3} = {4}\n".format(*[i.capitalize() for i
                                                       in fii_dii['columns']])
         dii_columns = "{0}  {2} {3} = {4}".format(*fii_dii['data'][0])
         fii_columns = "\n{0}  {2} {3} = {4}".format(*fii_dii['data'][1])
         fii_dii = fii_title + dii_columns + fii_columns
-        fno_secban = self.identify_fno_sec_ban()
+        fno_secban = self.identify_fno_sec_ban(data["sec_ban"])
         text += '\n' + adv_dec + '\n' + sec + "\n" + fii_dii + \
                 "\n" + "\n" + fno_secban
 
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+from algo_trade.market.strategy.analysis.option_chain_arrays import \
+    OptionChainArrays, PCR_OI_CAP, max_pain
+from algo_trade.market.strategy.constants import OPTION_BAND_QUANTILES
+
+ANALYTICS_FIELDS = ("CE_openInterest", "PE_openInterest",
+                    "CE_changeinOpenInterest", "PE_changeinOpenInterest")
+
+
+def strike_pcr(ce_oi: np.ndarray, pe_oi: np.ndarray) -> np.ndarray:
+    """ Put/Call OI ratio per strike, capped as `OptionChainArrays.pcr_oi`. """
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pcr = pe_oi / ce_oi
+
+    return np.round(np.where(pcr >= PCR_OI_CAP, PCR_OI_CAP, pcr), 2)
+
+
+def cumulative_profile(values: np.ndarray) -> np.ndarray:
+    """ Running total across the strikes, ascending, of (expiry x strike). """
+
+    return np.cumsum(np.nan_to_num(values), axis=-1)
+
+
+def weighted_band(strikes: np.ndarray, weights: np.ndarray,
+                  quantiles: Tuple[float, float] = OPTION_BAND_QUANTILES) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    OI weighted centre & quantile band of the strikes per row of an
+    (expiry x strike) weight array, NaN for rows without weight.
+
+    :returns: tuple of the band's centre, lower & upper strike.
+    """
+
+    if not len(strikes):
+        empty = np.full(len(weights), np.nan)
+
+        return empty, empty.copy(), empty.copy()
+
+    weights = np.nan_to_num(weights)
+    total = weights.sum(axis=-1)
+    share = np.cumsum(weights, axis=-1) / np.where(total > 0, total, 1)[:, None]
+
+    with np.errstate(invalid="ignore"):
+        centre = (weights * strikes).sum(axis=-1) / total
+
+    lower = strikes[np.argmax(share >= quantiles[0], axis=-1)]
+    upper = strikes[np.argmax(share >= quantiles[1], axis=-1)]
+    empty = total <= 0
+
+    return np.where(empty, np.nan, np.round(centre, 2)), \
+        np.where(empty, np.nan, lower), np.where(empty, np.nan, upper)
+
+
+def option_chain_analytics(chain: OptionChainArrays,
+                           expiries: List[str] = None,
+                           quantiles: Tuple[float, float] =
+                           OPTION_BAND_QUANTILES) -> Dict[str, pd.DataFrame]:
+    """
+    Analytics of one or many expiries of a chain, each computed over the
+    (expiry x strike) OI grid at once:
+    max pain off the strike payout matrix, cumulative OI & ΔOI profiles,
+    strike-wise PCR and OI weighted bands, support from the Put OI below
+    the underlying & resistance from the Call OI above it.
+
+    :param chain: Parsed option chain, of an index or a stock.
+    :param expiries: Expiries to analyse, all of the chain's if None.
+    :param quantiles: OI weighted quantiles bounding the bands.
+    :returns: dict of 'summary', a row per expiry, and 'profile', a row
+              per (expiry, strike), both empty for a chain without
+              strikes. An expiry not in the chain gets NaN metrics.
+    """
+
+    if not len(chain):
+        return {"summary": pd.DataFrame(), "profile": pd.DataFrame()}
+
+    strikes, expiries, grid = chain.grid(ANALYTICS_FIELDS, expiries)
+    ce_oi, pe_oi = grid["CE_openInterest"], grid["PE_openInterest"]
+    spot = float(chain.underlying_value)
+
+    support = weighted_band(strikes, np.where(strikes < spot, pe_oi, 0),
+                            quantiles)
+    resistance = weighted_band(strikes, np.where(strikes > spot, ce_oi, 0),
+                               quantiles)
+    pain = max_pain(strikes, ce_oi, pe_oi)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pcr = np.round(np.nansum(pe_oi, axis=-1)
+                       / np.nansum(ce_oi, axis=-1), 2)
+
+    summary = pd.DataFrame({
+        "symbol": chain.symbol,
+        "expiry": expiries,
+        "underlying": spot,
+        "atm_strike": strikes[np.argmin(np.abs(strikes - spot))]
+        if len(strikes) else np.nan,
+        "max_pain": pain,
+        "max_pain_distance": np.round((pain - spot) / spot * 100, 2),
+        "pcr": pcr,
+        "CE_openInterest": np.nansum(ce_oi, axis=-1),
+        "PE_openInterest": np.nansum(pe_oi, axis=-1),
+        "CE_changeinOpenInterest": np.nansum(
+            grid["CE_changeinOpenInterest"], axis=-1),
+        "PE_changeinOpenInterest": np.nansum(
+            grid["PE_changeinOpenInterest"], axis=-1),
+        "support": support[0],
+        "support_low": support[1],
+        "support_high": support[2],
+        "resistance": resistance[0],
+        "resistance_low": resistance[1],
+        "resistance_high": resistance[2],
+    })
+
+    listed = ~(np.isnan(ce_oi) & np.isnan(pe_oi))
+    profile = {"expiry": np.repeat(expiries, len(strikes)),
+               "strike": np.tile(strikes, len(expiries))}
+    profile.update({i: j.ravel() for i, j in grid.items()})
+    profile.update({
+        "CE_cum_oi": cumulative_profile(ce_oi).ravel(),
+        "PE_cum_oi": cumulative_profile(pe_oi).ravel(),
+        "CE_cum_oi_change": cumulative_profile(
+            grid["CE_changeinOpenInterest"]).ravel(),
+        "PE_cum_oi_change": cumulative_profile(
+            grid["PE_changeinOpenInterest"]).ravel(),
+        "pcr_oi": strike_pcr(ce_oi, pe_oi).ravel()})
+
+    profile = pd.DataFrame(profile).loc[listed.ravel(), :]
+
+    return {"summary": summary, "profile": profile.reset_index(drop=True)}
@@ -1,24 +1,47 @@
+import asyncio
 from math import ceil
 from datetime import datetime, timezone
 from time import perf_counter
 import pandas as pd
-from numpy import inf, where
-from pandas import DataFrame
-from pandas import json_normalize
+from numpy import ndarray
 from typing import Dict, Union, Tuple, List
 from time import perf_counter
-from algo_trade.data_handler import DataHandler
 from algo_trade.utils.meta import AsyncLoggingMeta
-from algo_trade.market.strategy.constants import PCR_VERDICT_RANGE
+from algo_trade.market.strategy.market_data_context import MarketDataContext
+from algo_trade.market.strategy.analysis.option_chain_arrays import \
+    OptionChainArrays
+from algo_trade.market.strategy.constants import PCR_VERDICT_RANGE, \
+    OPTION_RISK_FREE_RATE, OPTION_DEFAULT_VOLATILITY
+from algo_trade.market.strategy.analysis.option_pricing import \
+    chain_greeks, time_to_expiry
+from algo_trade.market.strategy.analysis.option_analytics import \
+    option_chain_analytics
 from algo_trade.data_handler.calendar import MarketCalendarTools
+from algo_trade.data_handler.calendar.expiry_schedule import expiry_weekday
 from algo_trade.data_handler.source.constants import TRADEABLE_INDICES
 from algo_trade.data_handler.calendar.constants import TIME_ZONE, TODAY
 
 
 class OptionChainAnalysis(metaclass=AsyncLoggingMeta):
+    # Indicative of Thursday expiry in Nifty & Bank Nifty,
+    # Tuesdays in FINNIFTY per weekday numbers.
+    INDEX_EXPIRY_WEEKDAY = {i: expiry_weekday(i) for i in
+                            ("NIFTY", "BANKNIFTY", "FINNIFTY")}
+
+    def __init__(self, context: MarketDataContext = None,
+                 rate: float = OPTION_RISK_FREE_RATE,
+                 volatility: float = None):
+        """
+        :param context: Market data shared with other analyses.
+        :param rate: Risk free rate the Greeks are priced with.
+        :param volatility: Initial & fallback volatility of the IV solver,
+                           as a fraction, India VIX if None.
+        """
 
-    def __init__(self):
-        self.processor = DataHandler()
+        self.context = context or MarketDataContext()
+        self.processor = self.context.data_handler
+        self.rate = rate
+        self.volatility = volatility
         self.index_option_chain_multiples = {'NIFTY': 50,
                                              'BANKNIFTY': 100,
                                              'FINNIFTY': 50}
@@ -75,9 +98,15 @@ class OptionChainAnalysis(metaclass=AsyncLoggingMeta):
 
     def get_option_chain(self, symbol: str,
                          key: str = "index",
-                         expiry_delta: int = 1) -> Tuple[dict, str]:
+                         expiry_delta: int = 1,
+                         data: Union[dict, OptionChainArrays] = None) \
+            -> Tuple[dict, str]:
 
-        """ Method that toggles between Stock & Index Option chain. """
+        """
+        Method that toggles between Stock & Index Option chain.
+        :param data: Option chain JSON already fetched for the symbol, or
+                     its parsed arrays, fetched from NSE if None.
+        """
 
         symbol = symbol.upper()
 
@@ -90,7 +119,8 @@ class OptionChainAnalysis(metaclass=AsyncLoggingMeta):
             key: str = "equity"
             expiry = MarketCalendarTools.get_monthly_expiry()
 
-        data = self.processor.nse_option_chain(key, symbol)
+        if data is None:
+            data = self.processor.nse_option_chain(key, symbol)
 
         i = 0
         while i < expiry_delta:
@@ -168,21 +198,60 @@ class OptionChainAnalysis(metaclass=AsyncLoggingMeta):
 
         return ''
 
-    def quote_option_chain(self, symbol: str, data: dict, expiry: str) -> \
-            Union[dict, None]:
+    def parse_option_chain(self, symbol: str,
+                           data: Union[dict, OptionChainArrays]) \
+            -> OptionChainArrays:
+        """ Option chain JSON parsed once into per-field arrays. """
+
+        if isinstance(data, OptionChainArrays):
+            return data
+
+        return OptionChainArrays.from_json(data, symbol)
+
+    def base_volatility(self) -> float:
+        """
+        Volatility the IV solver starts from, and Greeks fall back to:
+        the configured one, else India VIX.
+        """
+
+        if self.volatility is not None:
+            return self.volatility
+
+        try:
+            return self.context.india_vix() / 100
+
+        except Exception as e:
+            self.logger.warning("India VIX unavailable, using {0}: {1}".format(
+                OPTION_DEFAULT_VOLATILITY, e))
+
+            return OPTION_DEFAULT_VOLATILITY
+
+    def option_greeks(self, chain: OptionChainArrays, expiry: str) -> \
+            Dict[str, ndarray]:
+        """ IV & Greeks per strike of the expiry, as `chain_greeks`. """
+
+        strikes, fields = chain.select(expiry)
+
+        return chain_greeks(strikes, fields, chain.underlying_value,
+                            time_to_expiry(expiry), self.rate,
+                            self.base_volatility())
+
+    def quote_option_chain(self, symbol: str,
+                           data: Union[dict, OptionChainArrays],
+                           expiry: str, greeks: bool = True) \
+            -> Union[dict, None]:
         """
         Method to process Option Chain for a select symbol and
         selected expiry into algo_trade module consumable format.
         The Data Structure has hard coded values as in the data received
         from NSE officially.
+        Pass the parsed `OptionChainArrays` to quote several expiries of
+        a payload without parsing it again.
+        With `greeks`, the OptionChain frame carries the IV & Greeks of
+        both sides, see `chain_greeks`.
         """
 
-        records = data['records']
-        filtered = data['filtered']
-        all_expiries: list = records["expiryDates"]
-        last_updated: str = records["timestamp"]
-        strike_prices: list = records["strikePrices"]
-        underlying: float = records["underlyingValue"]
+        chain = self.parse_option_chain(symbol, data)
 
         # Creating A Respone
         response = dict()
@@ -190,74 +259,30 @@ class OptionChainAnalysis(metaclass=AsyncLoggingMeta):
             {
                 "symbol": symbol,
                 "selected_expiry": expiry,
-                "all_expiries": all_expiries,
-                "last_updated": last_updated,
-                "strikes": strike_prices,
-                "underlying_value": underlying,
+                "all_expiries": chain.all_expiries,
+                "last_updated": chain.meta["last_updated"],
+                "strikes": chain.meta["strikes"],
+                "underlying_value": chain.underlying_value,
             }
         )
 
-        # DataFrame Operations Section.
-        df = DataFrame(json_normalize(data["records"]["data"]))
-        df = df.loc[(df.expiryDate == expiry), :]
-
-        if 0 in df.shape:
+        if not chain.mask(expiry).any():
             return None
 
-        df.set_index("strikePrice", inplace=True)
-
-        # Common Columns
-        columns = [
-            "openInterest",
-            "changeinOpenInterest",
-            "pchangeinOpenInterest",
-            "totalTradedVolume",
-            "impliedVolatility",
-            "lastPrice",
-            "change",
-            "pChange",
-            "totalBuyQuantity",
-            "totalSellQuantity",
-            "bidQty",
-            "bidprice",
-            "askQty",
-            "askPrice",
-        ]
-
-        options = ["Calls", "Puts"]
-
-        ce_data = df.loc[:, df.columns.str.match("^(CE|expiryDate)")]
-        pe_data = df.loc[:, df.columns.str.match("^(PE|expiryDate)")]
-
-        # Call Option data frame maintainance.
-        ce_data.columns = ce_data.columns.str.replace(r"CE.", "")
-        ce_data = ce_data[columns].round(2)
-        ce_data.columns = "CE_" + ce_data.columns
-        ce_data.reset_index(inplace=True)
-
-        # Put Option data frame maintainance.
-        pe_data.columns = pe_data.columns.str.replace(r"PE.", "")
-        pe_data = pe_data[columns].round(2)
-        pe_data.columns = "PE_" + pe_data.columns
-        pe_data.reset_index(inplace=True)
-
-        # Merge Call & Put data.
-        merged_call_put = pd.merge(ce_data, pe_data, on="strikePrice",
-                                   how="left")
-
-        # Put Call Ration calculation.
-        merged_call_put["pcr_oi"] = merged_call_put.PE_openInterest / \
-                                    merged_call_put.CE_openInterest
-        merged_call_put["pcr_oi"] = merged_call_put.pcr_oi.replace(inf, 10.0)
-        merged_call_put.loc[merged_call_put.pcr_oi >= 10, "pcr_oi"] = 10.0
-        overall_pcr = round((filtered['PE']['totOI'] /
-                             filtered['CE']['totOI']), 2)
+        total_oi = chain.meta["total_oi"]
+        overall_pcr = round((total_oi['PE'] / total_oi['CE']), 2)
         pcr_verdict = self.pcr_verdict(overall_pcr)
 
+        option_chain = chain.frame(expiry)
+
+        if greeks:
+            option_chain = option_chain.assign(
+                **self.option_greeks(chain, expiry))
+
         # Updating the final response.
         response.update(
             {
-                "OptionChain": merged_call_put.round(2),
+                "OptionChain": option_chain,
                 "ResponseGenerateTime": datetime.now(tz=TIME_ZONE),
                 "overall_pcr": overall_pcr,
                 "pcr_verdict": pcr_verdict
@@ -266,21 +291,64 @@ class OptionChainAnalysis(metaclass=AsyncLoggingMeta):
 
         return response
 
+    def quote_option_chains(self, symbol: str,
+                            data: Union[dict, OptionChainArrays],
+                            expiries: List[str] = None,
+                            greeks: bool = True) -> Dict[str, dict]:
+        """
+        `quote_option_chain` of every expiry asked for, all the expiries
+        of the payload if None, off a single parse of the payload.
+        """
+
+        chain = self.parse_option_chain(symbol, data)
+
+        if expiries is None:
+            expiries = chain.all_expiries
+
+        return {i: self.quote_option_chain(symbol, chain, i, greeks)
+                for i in expiries}
+
+    def option_chain_analytics(self, symbol: str,
+                               expiries: List[str] = None,
+                               data: Union[dict, OptionChainArrays] = None) \
+            -> Dict[str, pd.DataFrame]:
+        """
+        Max pain, OI & ΔOI profiles, strike-wise PCR and OI weighted
+        support & resistance bands of an index or an F&O stock, for the
+        expiries asked for, all of them if None. See
+        `option_analytics.option_chain_analytics`.
+
+        :param data: Option chain JSON already fetched for the symbol, or
+                     its parsed arrays, fetched from NSE if None.
+        """
+
+        symbol = symbol.upper()
+
+        if data is None:
+            key = "index" if symbol in TRADEABLE_INDICES else "equity"
+            data = self.processor.nse_option_chain(key, symbol)
+
+        return option_chain_analytics(self.parse_option_chain(symbol, data),
+                                      expiries)
+
     def index_option_chain_analysis(self,
                                     symbol: str,
                                     delta: int = 5,
-                                    expiry_delta: int = 1) -> str:
+                                    expiry_delta: int = 1,
+                                    data: dict = None) -> str:
 
         """
         Index Option Chain Analysis method.
         :param symbol:
         :param delta:
         :param expiry_delta:
+        :param data: Option chain JSON already fetched for the symbol.
         :return:
         """
 
         option_chain, expiry_date = self.get_option_chain(symbol,
-                                                          expiry_delta=expiry_delta)
+                                                          expiry_delta=expiry_delta,
+                                                          data=data)
         underlying_value = option_chain["underlying_value"]
         oc_df = option_chain["OptionChain"]
 
@@ -395,31 +463,38 @@ class OptionChainAnalysis(metaclass=AsyncLoggingMeta):
 
         return text_result
 
-    def all_indices_analysis(self, return_dict: bool = False) -> Union[dict,
-    List[str]]:
+    def all_indices_analysis(self, return_dict: bool = False,
+                             option_chains: Dict[str, dict] = None) -> \
+            Union[dict, List[str]]:
 
         """
         We run a thorough Option chain analysis on each of the
         Tradable index namely : Nifty, Banknifty & Finnifty.
 
         :param return_dict:
+        :param option_chains: Option chain JSON per index, all of them
+                              are fetched concurrently if None.
         :return:
         """
 
-        # Indicative of Thursday expiry in Nifty & Bank Nifty,
-        # Tuesdays in FINNIFTY per weekday numbers.
-        symbol_expiry = {"NIFTY": 3, "BANKNIFTY": 3, "FINNIFTY": 1}
+        symbol_expiry = self.INDEX_EXPIRY_WEEKDAY
+
+        if option_chains is None:
+            option_chains = asyncio.run(
+                self.processor.nse_client.option_chains(
+                    list(symbol_expiry.keys())))
+
         analysis_results = list()
         for i, j in symbol_expiry.items():
 
             if TODAY.weekday() != j:
-                output = self.index_option_chain_analysis(i,
-                                                          expiry_delta=1)
+                output = self.index_option_chain_analysis(
+                    i, expiry_delta=1, data=option_chains[i])
                 output += "\n"
 
             else:
-                output = self.index_option_chain_analysis(i,
-                                                          expiry_delta=2)
+                output = self.index_option_chain_analysis(
+                    i, expiry_delta=2, data=option_chains[i])
                 output += "\n*Note*: Analysis generated on expiry day may " \
                           "not be accurate.\n"
 
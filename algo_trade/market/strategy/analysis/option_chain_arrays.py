@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+# Quote fields carried for either side, as NSE names them.
+OPTION_CHAIN_FIELDS = (
+    "openInterest",
+    "changeinOpenInterest",
+    "pchangeinOpenInterest",
+    "totalTradedVolume",
+    "impliedVolatility",
+    "lastPrice",
+    "change",
+    "pChange",
+    "totalBuyQuantity",
+    "totalSellQuantity",
+    "bidQty",
+    "bidprice",
+    "askQty",
+    "askPrice",
+)
+OPTION_SIDES = ("CE", "PE")
+# PCR reported for strikes without Call OI, and the cap on it.
+PCR_OI_CAP = 10.0
+
+
+class OptionChainArrays:
+    """
+    OptionChainArrays holds an NSE option chain payload as one array per
+    field across all the rows of every expiry, a row being a
+    (strike, expiry) pair.
+    Fields are named `CE_<field>` & `PE_<field>`, NaN where the side
+    isn't quoted. The payload is parsed once, and any expiry is served
+    by masking the rows.
+    """
+
+    def __init__(self, symbol: str, strikes: np.ndarray, expiries: np.ndarray,
+                 fields: Dict[str, np.ndarray], meta: Dict):
+        self.symbol = symbol
+        self.strikes = strikes
+        self.expiries = expiries
+        self.fields = fields
+        self.meta = meta
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    @property
+    def all_expiries(self) -> List[str]:
+        return self.meta["all_expiries"]
+
+    @property
+    def underlying_value(self) -> float:
+        return self.meta["underlying_value"]
+
+    @classmethod
+    def from_json(cls, data: dict, symbol: str = None) -> "OptionChainArrays":
+        """
+        Parses the JSON `nse_option_chain` returns.
+
+        :param data: Option chain payload.
+        :param symbol: Symbol of the chain, the payload's underlying if
+                       None.
+        """
+
+        records = data["records"]
+        rows = records.get("data", list())
+
+        strikes = np.array([i["strikePrice"] for i in rows])
+        expiries = np.array([i["expiryDate"] for i in rows], dtype=object)
+        fields = dict()
+
+        for side in OPTION_SIDES:
+            quotes = [i.get(side) or dict() for i in rows]
+
+            for field in OPTION_CHAIN_FIELDS:
+                fields["{0}_{1}".format(side, field)] = np.array(
+                    [i.get(field, np.nan) for i in quotes], dtype=float)
+
+        filtered = data.get("filtered", dict())
+
+        if symbol is None:
+            quoted = next((i[j] for i in rows for j in OPTION_SIDES if j in i),
+                          dict())
+            symbol = quoted.get("underlying")
+
+        meta = {"all_expiries": records["expiryDates"],
+                "last_updated": records["timestamp"],
+                "strikes": records["strikePrices"],
+                "underlying_value": records["underlyingValue"],
+                "total_oi": {i: filtered.get(i, dict()).get("totOI")
+                             for i in OPTION_SIDES}}
+
+        return cls(symbol, strikes, expiries, fields, meta)
+
+    def mask(self, expiry: str) -> np.ndarray:
+        return self.expiries == expiry
+
+    def select(self, expiry: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """ Strikes & fields of one expiry, in the payload's order. """
+
+        mask = self.mask(expiry)
+
+        return self.strikes[mask], {i: j[mask] for i, j in self.fields.items()}
+
+    def grid(self, fields: Tuple[str, ...], expiries: List[str] = None) \
+            -> Tuple[np.ndarray, List[str], Dict[str, np.ndarray]]:
+        """
+        Fields laid out as (expiry x strike) arrays over the union of the
+        expiries' strikes, ascending, NaN where a strike isn't listed.
+
+        :param fields: Fields to lay out.
+        :param expiries: Expiries, in the rows' order, all if None.
+        :returns: tuple of the strikes, expiries & dict of field arrays.
+        """
+
+        expiries = list(self.all_expiries if expiries is None else expiries)
+        rows = np.array([expiries.index(i) if i in expiries else -1
+                         for i in self.expiries], dtype=int)
+        listed = rows >= 0
+
+        strikes = np.unique(self.strikes[listed].astype(float))
+        columns = np.searchsorted(strikes, self.strikes[listed])
+        result = dict()
+
+        for field in fields:
+            values = np.full((len(expiries), len(strikes)), np.nan)
+            values[rows[listed], columns] = self.fields[field][listed]
+            result[field] = values
+
+        return strikes, expiries, result
+
+    def pcr_oi(self, expiry: str = None) -> np.ndarray:
+        """
+        Strike-wise Put/Call OI ratio, rounded to 2 places and capped at
+        `PCR_OI_CAP`, which is also given where there's no Call OI.
+        """
+
+        ce_oi, pe_oi = self.fields["CE_openInterest"], \
+            self.fields["PE_openInterest"]
+
+        if expiry is not None:
+            mask = self.mask(expiry)
+            ce_oi, pe_oi = ce_oi[mask], pe_oi[mask]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pcr = np.round(pe_oi, 2) / np.round(ce_oi, 2)
+
+        return np.round(np.where(pcr >= PCR_OI_CAP, PCR_OI_CAP, pcr), 2)
+
+    def frame(self, expiry: str) -> pd.DataFrame:
+        """
+        The expiry's chain as the `OptionChain` frame: strikePrice, the
+        CE_ & PE_ fields and pcr_oi, rounded to 2 places.
+        """
+
+        strikes, fields = self.select(expiry)
+        columns = {"strikePrice": strikes}
+        columns.update({i: np.round(j, 2) for i, j in fields.items()})
+        columns["pcr_oi"] = self.pcr_oi(expiry)
+
+        return pd.DataFrame(columns)
+
+
+def payout_matrix(strikes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intrinsic value per unit of OI of every strike's Call & Put, (strike
+    x settlement), with the strikes as the settlement prices.
+    """
+
+    strikes = np.asarray(strikes, dtype=float)
+    moneyness = strikes[None, :] - strikes[:, None]
+
+    return np.maximum(moneyness, 0), np.maximum(-moneyness, 0)
+
+
+def max_pain(strikes: np.ndarray, ce_oi: np.ndarray, pe_oi: np.ndarray) \
+        -> np.ndarray:
+    """
+    Strike at which option writers pay out the least at expiry, for one
+    chain or for many at once.
+
+    :param strikes: Strikes of the chain.
+    :param ce_oi: Call OI per strike, or a (chain x strike) array.
+    :param pe_oi: Put OI, laid out like `ce_oi`. Strikes missing from a
+                  chain, NaN in both, aren't taken as its max pain.
+    :returns: max pain strike, per chain for 2D OI, NaN for a chain
+              without any strike listed.
+    """
+
+    strikes = np.asarray(strikes, dtype=float)
+    ce_oi, pe_oi = np.asarray(ce_oi, dtype=float), \
+        np.asarray(pe_oi, dtype=float)
+
+    if not len(strikes):
+        return np.full(ce_oi.shape[:-1], np.nan)
+
+    calls, puts = payout_matrix(strikes)
+    listed = ~(np.isnan(ce_oi)&np.isnan(pe_oi))
+
+    payout = np.nan_to_num(ce_oi) @ calls + np.nan_to_num(pe_oi) @ puts
+    payout = np.where(listed, payout, np.inf)
+
+    return np.where(listed.any(axis=-1),
+                    strikes[np.argmin(payout, axis=-1)], np.nan)
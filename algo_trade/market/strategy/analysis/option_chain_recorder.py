@@ -0,0 +1,224 @@
+import asyncio
+from datetime import datetime, time
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from algo_trade.utils.meta import AsyncLoggingMeta
+from algo_trade.utils.async_tools import gather_bounded
+from algo_trade.data_handler.calendar.constants import TIME_ZONE, \
+    MARKET_START_TIME, MARKET_CLOSE_TIME
+from algo_trade.data_handler.source.constants import TRADEABLE_INDICES, \
+    NSE_ASYNC_MAX_CONCURRENCY
+from algo_trade.data_handler.source.nse.nse_async_client import \
+    AsyncNseClient
+from algo_trade.data_handler.source.nse.option_chain_store import \
+    OptionChainStore
+from algo_trade.market.strategy.analysis.option_chain_arrays import \
+    OptionChainArrays, OPTION_SIDES, max_pain
+from algo_trade.market.strategy.constants import OPTION_CHAIN_POLL_INTERVAL, \
+    OPTION_CHAIN_RECORD_EXPIRIES, OPTION_CHAIN_RECORD_FIELDS, \
+    OPTION_CHAIN_TIMESTAMP_FMT
+
+
+def snapshot_frame(chain: OptionChainArrays,
+                   expiries: int = OPTION_CHAIN_RECORD_EXPIRIES,
+                   fields: Tuple[str, ...] = OPTION_CHAIN_RECORD_FIELDS) \
+        -> pd.DataFrame:
+    """
+    Rows of a parsed chain's nearest expiries, keyed by symbol, expiry,
+    strike & the NSE quote timestamp, with the CE_ & PE_ fields.
+    """
+
+    mask = np.isin(chain.expiries, chain.all_expiries[:expiries])
+    columns = {"symbol": chain.symbol,
+               "expiry": chain.expiries[mask].astype(str),
+               "strike": chain.strikes[mask].astype(float),
+               "timestamp": datetime.strptime(chain.meta["last_updated"],
+                                              OPTION_CHAIN_TIMESTAMP_FMT),
+               "underlying": float(chain.underlying_value)}
+    columns.update({"{0}_{1}".format(i, j):
+                        chain["{0}_{1}".format(i, j)][mask]
+                    for i in OPTION_SIDES for j in fields})
+
+    return pd.DataFrame(columns)
+
+
+class OptionChainRecorder(metaclass=AsyncLoggingMeta):
+    """
+    OptionChainRecorder polls the option chains of indices and stocks on
+    a fixed cadence during market hours, and appends every new snapshot
+    to an `OptionChainStore`.
+    Chains are fetched concurrently through the rate limited
+    `AsyncNseClient`. A chain whose NSE timestamp hasn't moved since the
+    last poll isn't recorded again, and a failed fetch only skips that
+    symbol for the poll.
+    """
+
+    def __init__(self, indices: Iterable[str] = TRADEABLE_INDICES,
+                 stocks: Iterable[str] = (),
+                 interval: float = OPTION_CHAIN_POLL_INTERVAL,
+                 expiries: int = OPTION_CHAIN_RECORD_EXPIRIES,
+                 store: OptionChainStore = None,
+                 client: AsyncNseClient = None,
+                 max_concurrency: int = NSE_ASYNC_MAX_CONCURRENCY):
+        """
+        :param indices: Indices whose chains are recorded.
+        :param stocks: F&O stocks whose chains are recorded.
+        :param interval: Seconds between polls.
+        :param expiries: Nearest expiries recorded per symbol.
+        :param store: Store snapshots are appended to.
+        :param client: Client the chains are fetched with.
+        :param max_concurrency: Chains fetched at once.
+        """
+
+        self.symbols = [("index", i) for i in indices] + \
+                       [("equity", i) for i in stocks]
+        self.interval = interval
+        self.expiries = expiries
+        self.store = store or OptionChainStore()
+        self.client = client or AsyncNseClient()
+        self.max_concurrency = max_concurrency
+        self.last_recorded = dict()
+
+    async def _fetch(self, item: Tuple[str, str]) -> dict:
+        return await self.client.option_chain(*item)
+
+    async def snapshot(self) -> Dict[str, int]:
+        """
+        Polls every chain once.
+
+        :returns: dict of symbol and the rows recorded for it.
+        """
+
+        chains = await gather_bounded(self._fetch, self.symbols,
+                                      self.max_concurrency)
+        result = dict()
+
+        for (_, symbol), data in chains.items():
+            if isinstance(data, Exception):
+                self.logger.warning("Option chain of {0} failed: {1}".format(
+                    symbol, data))
+                continue
+
+            chain = OptionChainArrays.from_json(data, symbol)
+
+            if self.last_recorded.get(symbol) == chain.meta["last_updated"]:
+                continue
+
+            rows = snapshot_frame(chain, self.expiries)
+            self.store.append(symbol, rows)
+            self.last_recorded[symbol] = chain.meta["last_updated"]
+            result[symbol] = len(rows)
+
+        self.logger.info("Option chains recorded: {0}".format(result))
+
+        return result
+
+    async def run(self, start: time = MARKET_START_TIME,
+                  until: time = MARKET_CLOSE_TIME, polls: int = None):
+        """
+        Polls every `interval` seconds from `start` till `until`, IST, or
+        for `polls` polls when given.
+        """
+
+        count = 0
+
+        while polls is None or count < polls:
+            now = datetime.now(tz=TIME_ZONE)
+
+            if polls is None and now.time() > until:
+                break
+
+            if polls is None and now.time() < start:
+                opening = datetime.combine(now.date(), start, tzinfo=TIME_ZONE)
+                await asyncio.sleep((opening - now).total_seconds())
+                continue
+
+            began = asyncio.get_running_loop().time()
+            await self.snapshot()
+            count += 1
+
+            elapsed = asyncio.get_running_loop().time() - began
+            await asyncio.sleep(max(self.interval - elapsed, 0))
+
+    def record(self, *args, **kwargs):
+        asyncio.run(self.run(*args, **kwargs))
+
+
+def oi_change(store: OptionChainStore, symbol: str, expiry: str,
+              start: datetime = None, end: datetime = None) -> pd.DataFrame:
+    """
+    Change in Call & Put OI per strike between the first and the last
+    snapshot of the window, with the latest OI.
+    """
+
+    columns = ["CE_openInterest", "PE_openInterest"]
+    data = store.scan(symbol, start, end, expiry, columns)
+
+    if 0 in data.shape:
+        return pd.DataFrame()
+
+    strikes = data.groupby("strike", sort=True)[columns]
+    first, last = strikes.first(), strikes.last()
+
+    result = last.copy()
+    result[["CE_oi_change", "PE_oi_change"]] = (last - first).to_numpy()
+
+    return result.reset_index()
+
+
+def pcr_history(store: OptionChainStore, symbol: str, expiry: str = None,
+                start: datetime = None, end: datetime = None) \
+        -> pd.DataFrame:
+    """
+    Put/Call OI ratio of each snapshot, over the expiry or all the
+    recorded expiries, along with the underlying.
+    """
+
+    data = store.scan(symbol, start, end, expiry,
+                      ["underlying", "CE_openInterest", "PE_openInterest"])
+
+    if 0 in data.shape:
+        return pd.DataFrame()
+
+    result = data.groupby("timestamp", sort=True).agg(
+        underlying=("underlying", "last"),
+        CE_openInterest=("CE_openInterest", "sum"),
+        PE_openInterest=("PE_openInterest", "sum"))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["pcr"] = np.round(result.PE_openInterest
+                                 / result.CE_openInterest, 2)
+
+    return result.reset_index()
+
+
+def max_pain_history(store: OptionChainStore, symbol: str, expiry: str,
+                     start: datetime = None, end: datetime = None) \
+        -> pd.DataFrame:
+    """
+    Max pain strike of each snapshot of the expiry, all the snapshots
+    solved at once over a (snapshot x strike) OI grid.
+    """
+
+    data = store.scan(symbol, start, end, expiry,
+                      ["underlying", "CE_openInterest", "PE_openInterest"])
+
+    if 0 in data.shape:
+        return pd.DataFrame()
+
+    ce_oi = data.pivot_table(index="timestamp", columns="strike",
+                             values="CE_openInterest", aggfunc="last",
+                             dropna=False)
+    pe_oi = data.pivot_table(index="timestamp", columns="strike",
+                             values="PE_openInterest", aggfunc="last",
+                             dropna=False).reindex_like(ce_oi)
+
+    result = data.groupby("timestamp", sort=True).underlying.last() \
+        .to_frame()
+    result["max_pain"] = max_pain(ce_oi.columns.to_numpy(),
+                                  ce_oi.to_numpy(), pe_oi.to_numpy())
+
+    return result.reset_index()
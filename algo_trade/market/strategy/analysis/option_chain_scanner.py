@@ -0,0 +1,232 @@
+import asyncio
+from time import perf_counter
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from algo_trade.utils.meta import AsyncLoggingMeta
+from algo_trade.utils.async_tools import gather_bounded, retry
+from algo_trade.data_handler.source.constants import TRADEABLE_INDICES, \
+    NSE_ASYNC_MAX_CONCURRENCY, NSE_ASYNC_RETRIES, NSE_ASYNC_RETRY_BACKOFF
+from algo_trade.market.strategy.market_data_context import MarketDataContext
+from algo_trade.market.strategy.analysis.option_chain_analysis import \
+    OptionChainAnalysis
+from algo_trade.market.strategy.analysis.option_chain_arrays import \
+    OptionChainArrays
+from algo_trade.market.strategy.analysis.option_analytics import \
+    option_chain_analytics
+from algo_trade.market.strategy.analysis.option_pricing import \
+    implied_volatility, quote_price, time_to_expiry
+from algo_trade.market.strategy.constants import OPTION_SCAN_TIMEOUT, \
+    OI_BUILDUP
+
+# Columns ranked across the scan, highest first, into `<column>_rank`.
+RANKED_COLUMNS = ("pcr", "atm_iv", "max_pain_distance", "oi_change_pct")
+
+
+def classify_buildup(price_change: np.ndarray, oi_change: np.ndarray) \
+        -> np.ndarray:
+    """ `OI_BUILDUP` of every symbol, None where either change is flat. """
+
+    price_change, oi_change = np.asarray(price_change, dtype=float), \
+        np.asarray(oi_change, dtype=float)
+    conditions = [(price_change > 0 if i else price_change < 0)
+                  & (oi_change > 0 if j else oi_change < 0)
+                  for i, j in OI_BUILDUP]
+
+    return np.select(conditions, list(OI_BUILDUP.values()), None)
+
+
+def chain_summary(chain: OptionChainArrays, expiry: str,
+                  rate: float, volatility: float) -> Dict:
+    """
+    One row of scan metrics of the chain's expiry: the analytics summary,
+    OI change in % of the prior OI, the ATM Call & Put change and IV,
+    their mean IV, and the underlying's change implied off the ATM Call
+    less Put change.
+    """
+
+    summary = option_chain_analytics(chain, [expiry])["summary"]
+    result = summary.iloc[0].to_dict()
+
+    strikes, fields = chain.select(expiry)
+    atm = np.flatnonzero(strikes == result["atm_strike"])[:1]
+
+    price = quote_price(
+        np.concatenate([fields["CE_lastPrice"][atm],
+                        fields["PE_lastPrice"][atm]]),
+        np.concatenate([fields["CE_bidprice"][atm],
+                        fields["PE_bidprice"][atm]]),
+        np.concatenate([fields["CE_askPrice"][atm],
+                        fields["PE_askPrice"][atm]]))
+    iv = implied_volatility(price, chain.underlying_value,
+                            np.repeat(strikes[atm], 2),
+                            time_to_expiry(expiry), rate,
+                            np.array([True, False])[:len(price)],
+                            initial=volatility) * 100.
+
+    ce_change = float(fields["CE_change"][atm].sum())
+    pe_change = float(fields["PE_change"][atm].sum())
+    oi_change = result["CE_changeinOpenInterest"] + \
+        result["PE_changeinOpenInterest"]
+    prior_oi = result["CE_openInterest"] + result["PE_openInterest"] \
+        - oi_change
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result.update({
+            "oi_change": oi_change,
+            "oi_change_pct": round(oi_change / prior_oi * 100, 2)
+            if prior_oi > 0 else np.nan,
+            "CE_atm_change": ce_change,
+            "PE_atm_change": pe_change,
+            "underlying_change": round(ce_change - pe_change, 2),
+            "CE_atm_iv": np.round(iv[0], 2) if len(iv) else np.nan,
+            "PE_atm_iv": np.round(iv[1], 2) if len(iv) else np.nan,
+            "atm_iv": np.round(np.nanmean(iv), 2)
+            if np.isfinite(iv).any() else np.nan,
+            "last_updated": chain.meta["last_updated"]})
+
+    return result
+
+
+def rank_scan(data: pd.DataFrame, sort_by: str = "oi_change_pct") \
+        -> pd.DataFrame:
+    """
+    Ranks the scan's `RANKED_COLUMNS` across the symbols, 1 being the
+    highest, the max pain distance by its magnitude, and sorts the table
+    on `sort_by`, highest first.
+    """
+
+    data = data.copy()
+
+    for column in RANKED_COLUMNS:
+        values = data[column].abs() if column == "max_pain_distance" \
+            else data[column]
+        data[column + "_rank"] = values.rank(ascending=False,
+                                             method="min").astype("Int64")
+
+    return data.sort_values(sort_by, ascending=False, na_position="last",
+                            kind="stable").reset_index(drop=True)
+
+
+class OptionChainScanner(metaclass=AsyncLoggingMeta):
+    """
+    OptionChainScanner pulls the option chains of every F&O stock, and
+    the tradeable indices, concurrently through the rate limited
+    `AsyncNseClient`, retrying failed fetches with a backoff.
+    Each chain is parsed once and reduced to a row of metrics of its
+    nearest expiry, PCR, max pain distance, ATM IV & OI buildup, and the
+    rows are ranked into one cross sectional table.
+    A symbol which still fails is logged and left out of the table.
+    """
+
+    def __init__(self, context: MarketDataContext = None,
+                 analysis: OptionChainAnalysis = None,
+                 max_concurrency: int = NSE_ASYNC_MAX_CONCURRENCY,
+                 retries: int = NSE_ASYNC_RETRIES,
+                 backoff: float = NSE_ASYNC_RETRY_BACKOFF,
+                 timeout: float = OPTION_SCAN_TIMEOUT):
+        """
+        :param context: Market data shared with other analyses.
+        :param analysis: Analysis the chains are parsed & priced with.
+        :param max_concurrency: Chains fetched at once.
+        :param retries: Retries of a failed fetch.
+        :param backoff: Seconds before the first retry, doubled after.
+        :param timeout: Seconds allowed per chain, retries included.
+        """
+
+        self.analysis = analysis or OptionChainAnalysis(context)
+        self.context = self.analysis.context
+        self.client = self.analysis.processor.nse_client
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+    def symbols(self, indices: bool = True) -> List[str]:
+        """ F&O stocks off `cache.fno_data`, after the indices. """
+
+        stocks = self.context.fno_lots().symbol.str.strip().to_list()
+
+        return list(dict.fromkeys((list(TRADEABLE_INDICES) if indices
+                                   else list()) + stocks))
+
+    async def _fetch(self, symbol: str) -> dict:
+        key = "index" if symbol in TRADEABLE_INDICES else "equity"
+
+        return await retry(self.client.option_chain, key, symbol,
+                           retries=self.retries, backoff=self.backoff)
+
+    def summarize(self, symbol: str, data: dict, expiry_delta: int = 0) \
+            -> Dict:
+        """
+        `chain_summary` of the symbol's chain, for the expiry
+        `expiry_delta` after the nearest one.
+        """
+
+        chain = self.analysis.parse_option_chain(symbol, data)
+
+        if not len(chain) or len(chain.all_expiries) <= expiry_delta:
+            raise ValueError("No option chain quoted for {0}".format(symbol))
+
+        return chain_summary(chain, chain.all_expiries[expiry_delta],
+                             self.analysis.rate,
+                             self.analysis.base_volatility())
+
+    async def scan(self, symbols: Iterable[str] = None,
+                   expiry_delta: int = 0,
+                   sort_by: str = "oi_change_pct") -> pd.DataFrame:
+        """
+        Scans the symbols, every F&O stock & index if None.
+
+        :param symbols: Symbols to scan.
+        :param expiry_delta: Expiries to skip past the nearest one.
+        :param sort_by: Column the table is sorted on, highest first.
+        :returns: a row per symbol scanned, see `chain_summary`, with its
+                  `OI_BUILDUP`, ranked by `rank_scan`.
+        """
+
+        symbols = self.symbols() if symbols is None else list(symbols)
+
+        start = perf_counter()
+        chains = await gather_bounded(self._fetch, symbols,
+                                      self.max_concurrency, self.timeout)
+        fetched = perf_counter() - start
+
+        rows = list()
+
+        for symbol, data in chains.items():
+            if isinstance(data, BaseException):
+                self.logger.warning("Option chain of {0} failed: {1}".format(
+                    symbol, repr(data)))
+                continue
+
+            try:
+                rows.append(self.summarize(symbol, data, expiry_delta))
+
+            except Exception as e:
+                self.logger.warning("Option chain of {0} not scanned: "
+                                    "{1}".format(symbol, e))
+
+        self.logger.info("Scanned {0}/{1} option chains in {2}s, fetched "
+                         "in {3}s.".format(len(rows), len(symbols),
+                                           round(perf_counter() - start, 2),
+                                           round(fetched, 2)))
+
+        if not rows:
+            return pd.DataFrame()
+
+        data = pd.DataFrame(rows)
+        data["oi_buildup"] = classify_buildup(data.underlying_change,
+                                              data.oi_change)
+
+        return rank_scan(data, sort_by)
+
+    def run(self, *args, **kwargs) -> pd.DataFrame:
+        return asyncio.run(self.scan(*args, **kwargs))
+
+
+if __name__ == '__main__':
+    obj = OptionChainScanner()
+    print(obj.run())
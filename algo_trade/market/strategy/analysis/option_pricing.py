@@ -0,0 +1,201 @@
+import numpy as np
+from datetime import datetime
+from typing import Dict, Tuple
+from algo_trade.data_handler.calendar.constants import TIME_ZONE, \
+    MARKET_CLOSE_TIME
+from algo_trade.market.strategy.constants import OPTION_RISK_FREE_RATE, \
+    OPTION_DEFAULT_VOLATILITY, OPTION_IV_BOUNDS, OPTION_IV_TOLERANCE, \
+    OPTION_IV_MAX_ITER, OPTION_EXPIRY_FMT
+
+GREEKS = ("delta", "gamma", "vega", "theta")
+# Places the chain's IV (in %) and Greeks are rounded to.
+GREEK_DECIMALS = {"iv": 2, "delta": 4, "gamma": 6, "vega": 2, "theta": 2}
+# Floor on the time to expiry, so expiry day quotes stay solvable.
+MIN_TIME_TO_EXPIRY = 60 / (365 * 24 * 60 * 60)
+SQRT_2 = np.sqrt(2.)
+SQRT_2PI = np.sqrt(2. * np.pi)
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """
+    Standard normal CDF over arrays, through the Chebyshev fit of erfc
+    from Numerical Recipes, accurate to ~1.2e-7 everywhere.
+    """
+
+    z = np.abs(np.asarray(x, dtype=float)) / SQRT_2
+    t = 1. / (1. + 0.5 * z)
+    poly = -z * z - 1.26551223 + t * (1.00002368 + t * (
+            0.37409196 + t * (0.09678418 + t * (-0.18628806 + t * (
+            0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277))))))))
+    erfc = t * np.exp(poly)
+
+    return np.where(np.asarray(x) >= 0, 1. - 0.5 * erfc, 0.5 * erfc)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * np.square(x)) / SQRT_2PI
+
+
+def time_to_expiry(expiry: str, now: datetime = None) -> float:
+    """ Years from `now` till the expiry's market close, IST. """
+
+    now = now or datetime.now(tz=TIME_ZONE)
+    close = datetime.combine(datetime.strptime(expiry, OPTION_EXPIRY_FMT),
+                             MARKET_CLOSE_TIME, tzinfo=TIME_ZONE)
+    years = (close - now).total_seconds() / (365 * 24 * 60 * 60)
+
+    return max(years, MIN_TIME_TO_EXPIRY)
+
+
+def _d1_d2(spot, strike, t, rate, sigma) -> Tuple[np.ndarray, np.ndarray]:
+    vol_t = sigma * np.sqrt(t)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (rate + 0.5 * sigma ** 2) * t) / vol_t
+
+    return d1, d1 - vol_t
+
+
+def black_scholes(spot, strike, t, rate, sigma, is_call) -> np.ndarray:
+    """ Black-Scholes price of European Calls, or Puts where not `is_call`. """
+
+    d1, d2 = _d1_d2(spot, strike, t, rate, sigma)
+    discounted = strike * np.exp(-rate * t)
+
+    call = spot * norm_cdf(d1) - discounted * norm_cdf(d2)
+    put = discounted * norm_cdf(-d2) - spot * norm_cdf(-d1)
+
+    return np.where(is_call, call, put)
+
+
+def greeks(spot, strike, t, rate, sigma, is_call) -> Dict[str, np.ndarray]:
+    """
+    Delta, gamma, vega per volatility point and theta per calendar day,
+    broadcast over all the arguments.
+    """
+
+    d1, d2 = _d1_d2(spot, strike, t, rate, sigma)
+    density = norm_pdf(d1)
+    discounted = strike * np.exp(-rate * t)
+    sqrt_t = np.sqrt(t)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = density / (spot * sigma * sqrt_t)
+        decay = -spot * density * sigma / (2 * sqrt_t)
+
+    call_theta = decay - rate * discounted * norm_cdf(d2)
+    put_theta = decay + rate * discounted * norm_cdf(-d2)
+
+    return {"delta": np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1.),
+            "gamma": gamma,
+            "vega": spot * density * sqrt_t / 100.,
+            "theta": np.where(is_call, call_theta, put_theta) / 365.}
+
+
+def implied_volatility(price, spot, strike, t, rate, is_call,
+                       initial: float = OPTION_DEFAULT_VOLATILITY,
+                       bounds: Tuple[float, float] = OPTION_IV_BOUNDS,
+                       tol: float = OPTION_IV_TOLERANCE,
+                       max_iter: int = OPTION_IV_MAX_ITER) -> np.ndarray:
+    """
+    IV of every quote at once, by Newton steps safeguarded with bisection:
+    each quote keeps a bracket of volatility, and a Newton step falling
+    outside of it, or taken on a vanishing vega, bisects instead.
+    Quotes outside the no-arbitrage bounds, or without a price, are NaN.
+
+    :returns: IV as a fraction, broadcast over the arguments.
+    """
+
+    price, spot, strike, t, rate, is_call = np.broadcast_arrays(
+        *[np.asarray(i, dtype=float) for i in (price, spot, strike, t, rate)],
+        np.asarray(is_call, dtype=bool))
+    discounted = strike * np.exp(-rate * t)
+
+    lower = np.where(is_call, np.maximum(spot - discounted, 0),
+                     np.maximum(discounted - spot, 0))
+    upper = np.where(is_call, spot, discounted)
+    valid = (price > lower) & (price < upper) & (price > 0)
+
+    low = np.full(price.shape, bounds[0])
+    high = np.full(price.shape, bounds[1])
+    sigma = np.clip(np.full(price.shape, initial, dtype=float), *bounds)
+    active = valid.copy()
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+
+        diff = black_scholes(spot, strike, t, rate, sigma, is_call) - price
+        vega = greeks(spot, strike, t, rate, sigma, is_call)["vega"] * 100.
+
+        active &= np.abs(diff) > tol
+        high = np.where(active & (diff > 0), sigma, high)
+        low = np.where(active & (diff < 0), sigma, low)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = sigma - diff / vega
+
+        bisect = ~((newton > low) & (newton < high)) | (vega < 1e-12)
+        step = np.where(bisect, 0.5 * (low + high), newton)
+        sigma = np.where(active, step, sigma)
+        active &= (high - low) > tol
+
+    return np.where(valid, sigma, np.nan)
+
+
+def quote_price(last_price: np.ndarray, bid: np.ndarray,
+                ask: np.ndarray) -> np.ndarray:
+    """ Mid of a two sided quote, else the last traded price. """
+
+    last_price, bid, ask = (np.asarray(i, dtype=float)
+                            for i in (last_price, bid, ask))
+
+    return np.where((bid > 0) & (ask > 0), 0.5 * (bid + ask), last_price)
+
+
+def chain_greeks(strikes: np.ndarray, fields: Dict[str, np.ndarray],
+                 spot: float, t: float, rate: float = OPTION_RISK_FREE_RATE,
+                 volatility: float = OPTION_DEFAULT_VOLATILITY) \
+        -> Dict[str, np.ndarray]:
+    """
+    IV & Greeks of both sides of an expiry's chain, solved as one batch.
+    Quotes whose IV can't be solved, such as stale or zero ones, take
+    NSE's `impliedVolatility` for their Greeks, else `volatility`.
+
+    :param strikes: Strikes of the expiry.
+    :param fields: CE_ & PE_ fields of the strikes, as
+                   `OptionChainArrays.select` gives them.
+    :param spot: Underlying value.
+    :param t: Years to expiry.
+    :param rate: Annual risk free rate.
+    :param volatility: Initial & fallback volatility, as a fraction.
+    :returns: dict of `CE_iv`, `CE_delta` ... `PE_theta` arrays, IV in %.
+    """
+
+    count = len(strikes)
+    strike = np.tile(np.asarray(strikes, dtype=float), 2)
+    is_call = np.arange(2 * count) < count
+
+    def both(field: str) -> np.ndarray:
+        return np.concatenate([fields["CE_" + field], fields["PE_" + field]])
+
+    price = quote_price(both("lastPrice"), both("bidprice"),
+                        both("askPrice"))
+    iv = implied_volatility(price, spot, strike, t, rate, is_call,
+                            initial=volatility)
+
+    nse_iv = both("impliedVolatility") / 100.
+    sigma = np.where(np.isnan(iv),
+                     np.where(nse_iv > 0, nse_iv, volatility), iv)
+    values = greeks(spot, strike, t, rate, sigma, is_call)
+    values["iv"] = iv * 100.
+
+    result = dict()
+
+    for side, rows in (("CE", slice(None, count)), ("PE", slice(count, None))):
+        for name in ("iv",) + GREEKS:
+            result["{0}_{1}".format(side, name)] = np.round(
+                values[name][rows], GREEK_DECIMALS[name])
+
+    return result
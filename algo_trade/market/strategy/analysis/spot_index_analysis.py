@@ -9,17 +9,28 @@ from algo_trade.market.strategy.constants import ALL_INDICES_COLUMNS_ORDER, \
     ALL_INDICES_COLUMN_RENAME, ALL_INDICES_COLUMNS_INCLUDE_SYMBOL, \
     SELECT_COLUMNS_FOR_INDEX_REPORT
 from algo_trade.data_handler.calendar.constants import DATE_FMT, TODAY
-from algo_trade.data_handler import DataHandler
+from algo_trade.market.strategy.market_data_context import MarketDataContext
 from algo_trade.data_handler.calendar import MarketCalendarTools
 
 
 class DailyIntradayIndicesReport(PivotPoints, metaclass=AsyncLoggingMeta):
-    def __init__(self):
-        self.nse_processor = DataHandler()
+    def __init__(self, data: pd.DataFrame = None,
+                 context: MarketDataContext = None):
+        """
+        :param data: All indices data already fetched,
+                     fetched from NSE if None.
+        :param context: Market data shared across the run.
+        """
+        self.context = context or MarketDataContext()
+        self.nse_processor = self.context.data_handler
         self.next_bday = self.nse_processor.next_day
         self.last_bday = self.nse_processor.prev_day
         self.month_range = monthrange(TODAY.year, TODAY.month)
-        self.data = self.nse_processor.get_nse_all_indices()
+
+        if data is None:
+            data = self.context.all_indices()
+
+        self.data = data
 
     def indices_report(self, filter_symbols: bool = True) -> pd.DataFrame:
         """Generating a Daily Analysis Report on the Index.
@@ -116,3 +116,47 @@ SWING_BUYING_PULLBACK_COLUMNS = ["symbol", "close",
                                  "date"]
 SWING_BUYING_PULLBACK_MIN_PCT = 3
 STOCK_MODIFICATION = {"MOTHERSUMI": "MOTHERSON"}
+
+# Strategy 6 - Moving Average Crossover
+SWING_CROSSOVER_SPANS = (10, 20, 50, 200)
+SWING_CROSSOVER_EMAS = (('EMA10', 'EMA20'), ('EMA20', 'EMA50'),
+                        ('EMA50', 'EMA200'))
+SWING_CROSSOVER_LOOKBACK = 1
+
+# Scanner Runner
+SCANNER_MAX_WORKERS = 4
+SWING_BARS_PERIOD = '12mo'
+
+# Option Chain Recorder
+# Seconds between polls, nearest expiries recorded per symbol and the
+# quote fields kept per side.
+OPTION_CHAIN_POLL_INTERVAL = 180
+OPTION_CHAIN_RECORD_EXPIRIES = 3
+OPTION_CHAIN_RECORD_FIELDS = ("openInterest", "changeinOpenInterest",
+                              "totalTradedVolume", "impliedVolatility",
+                              "lastPrice", "bidprice", "askPrice")
+OPTION_CHAIN_TIMESTAMP_FMT = "%d-%b-%Y %H:%M:%S"
+
+# Option Pricing
+# Annual risk free rate, volatility used when neither IV can be had nor
+# the VIX fetched, and the Newton/bisection IV solver's settings.
+OPTION_RISK_FREE_RATE = 0.07
+OPTION_DEFAULT_VOLATILITY = 0.15
+OPTION_IV_BOUNDS = (1e-4, 5.0)
+OPTION_IV_TOLERANCE = 1e-6
+OPTION_IV_MAX_ITER = 50
+OPTION_EXPIRY_FMT = "%d-%b-%Y"
+
+# Option Analytics
+# OI weighted quantiles bounding the support & resistance bands.
+OPTION_BAND_QUANTILES = (0.25, 0.75)
+
+# Option Chain Scanner
+# Seconds allowed per chain fetch, retries included, and the OI buildup
+# per (underlying up, OI up), the underlying's move being read off the
+# ATM Call less Put change.
+OPTION_SCAN_TIMEOUT = 30
+OI_BUILDUP = {(True, True): "Long Buildup",
+              (False, True): "Short Buildup",
+              (True, False): "Short Covering",
+              (False, False): "Long Unwinding"}
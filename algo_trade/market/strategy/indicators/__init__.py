@@ -1,3 +1,7 @@
 from algo_trade.market.strategy.indicators.pivot_points import PivotPoints
 from algo_trade.market.strategy.indicators.moving_averages import \
     MovingAverages
+from algo_trade.market.strategy.indicators.bar_panel import BarPanel
+from algo_trade.market.strategy.indicators.vcpr import VCPREngine
+from algo_trade.market.strategy.indicators.moving_average_state import \
+    MovingAverageState
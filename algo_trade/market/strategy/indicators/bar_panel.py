@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+
+class BarPanel:
+    """
+    BarPanel holds OHLCV fields of many symbols as (symbol x bar) arrays,
+    built from the per-symbol frames `get_period_data` or
+    `get_period_data_bulk` return.
+    Column 0 is the latest bar, symbols with fewer bars than the panel
+    are padded with NaN at the oldest end.
+    """
+
+    def __init__(self, symbols: List[str], fields: Dict[str, np.ndarray],
+                 dates: np.ndarray, counts: np.ndarray):
+        self.symbols = symbols
+        self.fields = fields
+        self.dates = dates
+        self.counts = counts
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.dates.shape
+
+    @property
+    def valid(self) -> np.ndarray:
+        """ Boolean mask of the bars which aren't padding. """
+
+        return np.arange(self.shape[1]) < self.counts[:, None]
+
+    def chronological(self, field: str) -> np.ndarray:
+        """ Field with the oldest bar first, padding leading each row. """
+
+        return self.fields[field][:, ::-1]
+
+    def copy(self) -> "BarPanel":
+        """ Panel with copies of the symbols & arrays. """
+
+        return BarPanel(list(self.symbols),
+                        {i: j.copy() for i, j in self.fields.items()},
+                        self.dates.copy(), self.counts.copy())
+
+    def take(self, rows: List[int]) -> "BarPanel":
+        """ Panel of the symbols at the rows, in their order. """
+
+        return BarPanel([self.symbols[i] for i in rows],
+                        {i: j[rows] for i, j in self.fields.items()},
+                        self.dates[rows], self.counts[rows])
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame],
+                    columns: Tuple[str, ...] = ("open", "high", "low",
+                                                "close"),
+                    length: int = None,
+                    date_col: str = "date") -> "BarPanel":
+        """
+        Stacks per-symbol frames into a panel.
+
+        :param frames: dict of symbol and its bars.
+        :param columns: fields to carry into the panel.
+        :param length: number of latest bars kept per symbol,
+                       the longest history if None.
+        :param date_col: column the bars are ordered on.
+        """
+
+        frames = {i: j.sort_values(by=date_col, ascending=False)
+                  for i, j in frames.items() if 0 not in j.shape}
+        symbols = list(frames.keys())
+
+        if length is None:
+            length = max([len(i) for i in frames.values()], default=0)
+
+        shape = (len(symbols), length)
+        fields = {i: np.full(shape, np.nan) for i in columns}
+        dates = np.full(shape, None, dtype=object)
+        counts = np.zeros(len(symbols), dtype=int)
+
+        for row, symbol in enumerate(symbols):
+            data = frames[symbol].head(length)
+            count = len(data)
+            counts[row] = count
+            dates[row, :count] = data[date_col].to_numpy(dtype=object)
+
+            for i in columns:
+                fields[i][row, :count] = data[i].to_numpy(dtype=float)
+
+        return cls(symbols, fields, dates, counts)
@@ -0,0 +1,79 @@
+import numpy as np
+from typing import Sequence, Tuple
+from algo_trade.market.strategy.indicators.moving_average_engine import \
+    ema_panel
+
+CONSOLIDATION_THRESHOLD = 1
+PRICE_CONSOLIDATION_EMAS = (10, 20, 50)
+PRICE_CONSOLIDATION_RANGE = (5, 10)
+
+
+def leading_run(values: np.ndarray,
+                threshold: float = CONSOLIDATION_THRESHOLD) -> np.ndarray:
+    """
+    Length of the leading run of every row of a (symbol x bar) array,
+    latest bar first, where floor(|value|) stays below `threshold`.
+    Missing values, such as panel padding, neither count nor end a run,
+    as in `ConsolidationRange._get_count_consolidation`.
+
+    :returns: run length per symbol.
+    """
+
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    missing = np.isnan(values)
+
+    with np.errstate(invalid="ignore"):
+        breaks = ~missing&(np.floor(np.abs(values)) >= threshold)
+
+    # Bars before the first break have a cumulative break count of 0.
+    leading = np.cumsum(breaks, axis=1) == 0
+
+    return (leading&~missing).sum(axis=1)
+
+
+def price_band(close: np.ndarray, emas: Sequence[np.ndarray],
+               min_max_range: Tuple[int, int] = PRICE_CONSOLIDATION_RANGE) \
+        -> np.ndarray:
+    """
+    1 for the bars whose floored spread between the lowest and the highest
+    EMA, in % of the close, is within `min_max_range`, 0 otherwise and NaN
+    where the close is missing.
+    """
+
+    close = np.asarray(close, dtype=float)
+    emas = np.stack(emas)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        close_min = ((close - np.fmin.reduce(emas)) / close) * 100
+        close_max = ((close - np.fmax.reduce(emas)) / close) * 100
+        spread = np.floor(close_min - close_max)
+
+    band = ((min_max_range[0] <= spread)
+            &(spread <= min_max_range[1])).astype(float)
+
+    return np.where(np.isnan(close), np.nan, band)
+
+
+def time_consolidation(pct_change: np.ndarray,
+                       threshold: float = CONSOLIDATION_THRESHOLD) \
+        -> np.ndarray:
+    """ Latest sessions each symbol has moved less than `threshold` %. """
+
+    return leading_run(pct_change, threshold)
+
+
+def price_consolidation(close: np.ndarray,
+                        spans: Sequence[int] = PRICE_CONSOLIDATION_EMAS,
+                        min_max_range: Tuple[int, int] =
+                        PRICE_CONSOLIDATION_RANGE) -> np.ndarray:
+    """
+    Price consolidation of every symbol of a (symbol x bar) close array,
+    latest bar first: the leading run of bars outside the EMA band, as
+    `ConsolidationRange.get_price_consolidation` counts it.
+    EMAs are rounded to 2 places as `add_moving_averages` gives them.
+    """
+
+    close = np.atleast_2d(np.asarray(close, dtype=float))
+    emas = np.round(ema_panel(close[:, ::-1], spans)[0][..., ::-1], 2)
+
+    return leading_run(price_band(close, emas, min_max_range))
@@ -0,0 +1,133 @@
+import numpy as np
+from typing import Sequence, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+MOVING_AVERAGES = ("EMA", "SMA", "DMA")
+
+
+def validate_ma(ma: str) -> str:
+    if ma not in MOVING_AVERAGES:
+        raise KeyError("Invalid Key passed for moving average. "
+                       "Moving Average received: {0}".format(ma))
+
+    return ma
+
+
+def ema_alpha(spans: Sequence[int]) -> np.ndarray:
+    """ Smoothing factor per span, derived the way pandas `ewm` does. """
+
+    com = (np.asarray(spans, dtype=float) - 1) / 2.
+
+    return 1. / (1. + com)
+
+
+def ema_step(ema: np.ndarray, weight: np.ndarray, value: np.ndarray,
+             alpha: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Folds one bar into the EMA, as `ewm(span, adjust=False).mean()` does.
+    A missing value carries the EMA forward and decays the weight of the
+    previous one, the first value seen starts the EMA.
+
+    :param ema: EMA so far, NaN until a value is seen.
+    :param weight: Weight of the EMA so far, 1 after every value seen.
+    :param value: New bar's value, broadcast against `ema`.
+    :param alpha: Smoothing factor, broadcast against `ema`.
+    :returns: tuple of the updated EMA & weight.
+    """
+
+    observed = ~np.isnan(value)
+    started = ~np.isnan(ema)
+
+    weight = np.where(started, weight * (1. - alpha), weight)
+
+    with np.errstate(invalid="ignore"):
+        blended = (weight * ema + alpha * value) / (weight + alpha)
+
+    updated = np.where(started&observed&(ema != value), blended, ema)
+    updated = np.where(~started&observed, value, updated)
+    weight = np.where(started&observed, 1., weight)
+
+    return updated, weight
+
+
+def ema_panel(values: np.ndarray, spans: Sequence[int]) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    EMA of every span for every row of a (symbol x bar) array, oldest bar
+    first. The recursion walks the bars once, each step covering all
+    symbols & spans together.
+
+    :returns: tuple of the (span x symbol x bar) EMAs, and the last EMA &
+              weight, (span x symbol), to carry on from.
+    """
+
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    alpha = ema_alpha(spans)[:, None]
+    shape = (len(alpha), values.shape[0])
+
+    ema = np.full(shape, np.nan)
+    weight = np.ones(shape)
+    result = np.full(shape + (values.shape[1],), np.nan)
+
+    for bar in range(values.shape[1]):
+        ema, weight = ema_step(ema, weight, values[:, bar], alpha)
+        result[..., bar] = ema
+
+    return result, ema, weight
+
+
+def sma_panel(values: np.ndarray, spans: Sequence[int]) -> np.ndarray:
+    """
+    Simple moving average of every span for every row of a
+    (symbol x bar) array, like `rolling(span).mean()`: NaN until the
+    window is full or while it holds a missing value.
+
+    :returns: (span x symbol x bar) array.
+    """
+
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    result = np.full((len(spans),) + values.shape, np.nan)
+
+    for row, span in enumerate(spans):
+        if span <= values.shape[1]:
+            result[row, :, span - 1:] = sliding_window_view(
+                values, span, axis=1).mean(axis=-1)
+
+    return result
+
+
+NO_CROSSOVER, UPSIDE, DOWNSIDE = range(3)
+CROSSOVER_LABELS = np.array(["No Crossover", "Upside", "Downside"],
+                            dtype=object)
+
+
+def crossover_panel(fast: np.ndarray, slow: np.ndarray, lookback: int = 1) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Latest crossover of `fast` over `slow` per symbol, within the latest
+    `lookback` bars of (symbol x bar) arrays laid out like a `BarPanel`.
+    A bar crosses when (fast - slow) changes sign from the previous bar,
+    touching counting on either side as in `moving_average_crossover`.
+    Only the latest `lookback` + 1 bars are looked at.
+
+    :returns: tuple of crossover code & bars since the crossover
+              (-1 for none), per symbol.
+    """
+
+    diff = np.atleast_2d(np.asarray(fast, dtype=float)[..., :lookback + 1]
+                         - np.asarray(slow, dtype=float)[..., :lookback + 1])
+    current, previous = diff[:, :-1], diff[:, 1:]
+
+    crossed = ((current <= 0)&(previous >= 0)) \
+              | ((current >= 0)&(previous <= 0))
+
+    has_cross = crossed.any(axis=1)
+    bars_ago = np.where(has_cross, crossed.argmax(axis=1), -1)
+
+    if current.shape[1] == 0:
+        return np.full(len(diff), NO_CROSSOVER), bars_ago
+
+    at_cross = current[np.arange(len(diff)), bars_ago.clip(min=0)]
+    codes = np.where(at_cross >= 0, UPSIDE, DOWNSIDE)
+
+    return np.where(has_cross, codes, NO_CROSSOVER), bars_ago
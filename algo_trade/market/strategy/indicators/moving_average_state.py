@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Sequence
+from algo_trade.data_handler.source.nse.data_cache.cache_manager import \
+    NSEDataCacheManager, nsedata_cache
+from algo_trade.market.strategy.indicators.bar_panel import BarPanel
+from algo_trade.market.strategy.indicators.moving_average_engine import \
+    validate_ma, ema_alpha, ema_step, ema_panel, sma_panel
+
+# Cache key the states are persisted under.
+MOVING_AVERAGE_STATE_KEY = "moving_average_state"
+
+
+class MovingAverageState:
+    """
+    MovingAverageState keeps the last EMA/SMA state per (symbol, span),
+    so that new bars update the moving averages in O(1) rather than
+    recomputing them over the whole history.
+    States are seeded for all symbols at once from a `BarPanel` and
+    persisted in the NSE data cache between runs.
+
+    Per symbol, an EMA state is the last EMA & its weight for every span,
+    an SMA state is a ring buffer of the latest bars with the running sum
+    & missing count of every span's window. Either also keeps the latest
+    `history` moving averages, for lookbacks such as crossovers, and the
+    last bar's date & value, which tell a re-adjusted history apart.
+    """
+
+    def __init__(self, ma: str = "EMA",
+                 spans: Sequence[int] = (10, 20, 50, 200),
+                 column: str = 'close',
+                 history: int = 1,
+                 states: Dict[str, dict] = None):
+        self.ma = validate_ma(ma)
+        self.spans = tuple(spans)
+        self.column = column
+        self.history = history
+        self.states = states or dict()
+
+        self._spans = np.asarray(self.spans)
+        self._alpha = ema_alpha(self.spans)
+
+    @property
+    def name(self) -> str:
+        return "{0}_{1}".format(self.ma, self.column)
+
+    def columns(self):
+        return [self.ma + "{0}".format(i) for i in self.spans]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.states
+
+    def last_date(self, symbol: str):
+        return self.states[symbol]["date"]
+
+    def _values(self, state: dict) -> np.ndarray:
+        if self.ma == "EMA":
+            return state["ema"]
+
+        full = (state["count"] >= self._spans)&(state["nans"] == 0)
+
+        return np.where(full, state["sums"] / self._spans, np.nan)
+
+    def moving_averages(self, symbol: str) -> Dict[str, float]:
+        """ Latest moving averages of the symbol, by column name. """
+
+        return dict(zip(self.columns(),
+                        self._values(self.states[symbol]).tolist()))
+
+    def _new_state(self) -> dict:
+        recent = np.full((self.history, len(self.spans)), np.nan)
+
+        if self.ma == "EMA":
+            return {"date": None, "value": None, "recent": recent,
+                    "ema": np.full(len(self.spans), np.nan),
+                    "weight": np.ones(len(self.spans))}
+
+        return {"date": None, "value": None, "recent": recent,
+                "count": 0, "pos": 0,
+                "buffer": np.full(self._spans.max(), np.nan),
+                "sums": np.zeros(len(self.spans)),
+                "nans": np.zeros(len(self.spans), dtype=int)}
+
+    def update(self, symbol: str, date_, value: float) -> Dict[str, float]:
+        """
+        Folds one new bar into the symbol's state.
+
+        :param symbol: Symbol the bar belongs to.
+        :param date_: Bar's date, bars up to the last one seen are ignored.
+        :param value: Bar's value of the state's column.
+        :returns: Latest moving averages, by column name.
+        """
+
+        state = self.states.setdefault(symbol, self._new_state())
+
+        if state["date"] is not None and date_ <= state["date"]:
+            return self.moving_averages(symbol)
+
+        value = float(value)
+
+        if self.ma == "EMA":
+            state["ema"], state["weight"] = ema_step(
+                state["ema"], state["weight"], value, self._alpha)
+
+        else:
+            buffer = state["buffer"]
+            size = len(buffer)
+
+            # The bar leaving each span's window, read before it's overwritten.
+            leaving = buffer[(state["pos"] - self._spans) % size]
+            full = state["count"] >= self._spans
+            state["sums"] -= np.where(full, np.nan_to_num(leaving), 0.)
+            state["nans"] -= full&np.isnan(leaving)
+
+            buffer[state["pos"]] = value
+            state["pos"] = (state["pos"] + 1) % size
+            state["sums"] += np.nan_to_num(value)
+            state["nans"] += np.isnan(value)
+            state["count"] += 1
+
+        state["date"], state["value"] = date_, value
+        state["recent"] = np.vstack([self._values(state),
+                                     state["recent"][:-1]])
+
+        return self.moving_averages(symbol)
+
+    def update_frame(self, symbol: str, data: pd.DataFrame,
+                     date_col: str = "date") -> Dict[str, float]:
+        """ Folds the bars of `data` newer than the symbol's state. """
+
+        data = data.sort_values(by=date_col, ascending=True)
+
+        if symbol in self and self.last_date(symbol) is not None:
+            data = data.loc[data[date_col] > self.last_date(symbol), :]
+
+        for date_, value in zip(data[date_col], data[self.column]):
+            self.update(symbol, date_, value)
+
+        return self.moving_averages(symbol)
+
+    def seed(self, panel: BarPanel) -> Dict[str, np.ndarray]:
+        """
+        Batch path, computes all spans for all the symbols of the panel as
+        (span x symbol x bar) array operations and replaces their states
+        with the latest ones.
+
+        :returns: dict of column name and (symbol x bar) array, laid out
+                  like the panel with the latest bar in column 0.
+        """
+
+        values = panel.chronological(self.column)
+        # Padding leads each chronological row, so the last bar is real.
+        last_dates = panel.dates[:, 0]
+
+        if self.ma == "EMA":
+            result, ema, weight = ema_panel(values, self.spans)
+
+            for row, symbol in enumerate(panel.symbols):
+                self.states[symbol] = {"date": last_dates[row],
+                                       "value": values[row, -1],
+                                       "ema": ema[:, row].copy(),
+                                       "weight": weight[:, row].copy()}
+
+        else:
+            result = sma_panel(values, self.spans)
+
+            for row, symbol in enumerate(panel.symbols):
+                self.states[symbol] = self._new_state()
+                bars = values[row, values.shape[1] - panel.counts[row]:]
+
+                for value in bars[-len(self.states[symbol]["buffer"]):]:
+                    self.update(symbol, None, value)
+
+                self.states[symbol]["count"] = len(bars)
+                self.states[symbol]["date"] = last_dates[row]
+                self.states[symbol]["value"] = values[row, -1]
+
+        # Latest moving averages first, (history x span) per symbol.
+        latest = result[:, :, ::-1][:, :, :self.history].transpose(1, 2, 0)
+
+        for row, symbol in enumerate(panel.symbols):
+            recent = np.full((self.history, len(self.spans)), np.nan)
+            recent[:len(latest[row])] = latest[row]
+            self.states[symbol]["recent"] = recent
+
+        return {i: j[:, ::-1] for i, j in zip(self.columns(), result)}
+
+    def advance(self, panel: BarPanel) -> Dict[str, np.ndarray]:
+        """
+        Daily path, folds only the bars of the panel newer than each
+        symbol's state, in O(1) per bar. Symbols without a state, whose
+        state's last bar isn't in the panel, or whose panel value for that
+        bar differs from the state's, as after a split or dividend
+        re-adjusted the history, are seeded off the panel.
+
+        :returns: dict of column name and (symbol x `history`) array of the
+                  latest moving averages, latest first, as `seed` lays
+                  them out.
+        """
+
+        unseeded = list()
+
+        for row, symbol in enumerate(panel.symbols):
+            dates = list(panel.dates[row, :panel.counts[row]])
+            state = self.states.get(symbol)
+
+            if state is None or state["date"] not in dates:
+                unseeded.append(row)
+                continue
+
+            # Bars after the state's, oldest first.
+            newer = dates.index(state["date"])
+
+            if state.get("value") is None or not np.isclose(
+                    panel[self.column][row, newer], state["value"],
+                    rtol=1e-3, equal_nan=True):
+                unseeded.append(row)
+                continue
+
+            for i in range(newer - 1, -1, -1):
+                self.update(symbol, dates[i], panel[self.column][row, i])
+
+        if unseeded:
+            self.seed(panel.take(unseeded))
+
+        recent = np.stack([self.states[i]["recent"] for i in panel.symbols]) \
+            if panel.symbols else np.full((0, self.history, len(self.spans)),
+                                          np.nan)
+
+        return {j: recent[:, :, i] for i, j in enumerate(self.columns())}
+
+    def save(self, cache: NSEDataCacheManager = None):
+        """ Persists the states under `MOVING_AVERAGE_STATE_KEY`. """
+
+        cache = cache or nsedata_cache()
+        stored = cache[MOVING_AVERAGE_STATE_KEY] \
+            if MOVING_AVERAGE_STATE_KEY in cache.loaded_dict else dict()
+        stored[self.name] = {"spans": self.spans, "history": self.history,
+                             "states": self.states}
+        cache[MOVING_AVERAGE_STATE_KEY] = stored
+
+    @classmethod
+    def load(cls, ma: str = "EMA",
+             spans: Sequence[int] = (10, 20, 50, 200),
+             column: str = 'close',
+             history: int = 1,
+             cache: NSEDataCacheManager = None) -> "MovingAverageState":
+        """
+        States persisted for the moving average & column, a fresh one if
+        none were saved or they were saved for other spans or history.
+        """
+
+        cache = cache or nsedata_cache()
+        obj = cls(ma, spans, column, history)
+
+        if MOVING_AVERAGE_STATE_KEY in cache.loaded_dict:
+            stored = cache[MOVING_AVERAGE_STATE_KEY].get(obj.name)
+
+            if stored is not None and tuple(stored["spans"]) == obj.spans \
+                    and stored.get("history") == obj.history:
+                obj.states = stored["states"]
+
+        return obj
@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
 from numpy import select
+from typing import Dict, Sequence, Tuple
+from algo_trade.market.strategy.indicators.moving_average_engine import \
+    validate_ma, sma_panel, crossover_panel
 
 
 class MovingAverages:
@@ -21,24 +25,29 @@ class MovingAverages:
         :param ma: EMA| SMA | DMA
         :param ma_range: Range of Moving Averages
         :return:
+
+        SMAs of all the spans are computed together, see
+        `moving_average_engine`. EMAs of a single frame are left to pandas'
+        `ewm`, `ema_panel` is for panels, while `MovingAverageState`
+        updates either per new bar.
         """
         
+        validate_ma(ma)
+
         if ma == "SMA" or ma == "DMA":
-            for i in ma_range:
-                col = ma + "{0}".format(i)
-                data[col] = data[column].rolling(i).mean()
-        
-        elif ma == "EMA":
-            for i in ma_range:
-                col = ma + "{0}".format(i)
-                data[col] = data.sort_values(by=["date"])[column]. \
-                                ewm(span=i,
-                                    adjust=False).mean().reindex(). \
-                                iloc[::-1].round(2)
+            averages = sma_panel(data[column].to_numpy(dtype=float), ma_range)
+
+            for i, j in zip(ma_range, averages):
+                data[ma + "{0}".format(i)] = j[0]
+
         else:
-            
-            raise KeyError("Invalid Key passed for moving average. "
-                           "Moving Average received: {0}".format(ma))
+            # EMAs are computed oldest bar first & aligned back on the index.
+            values = data.sort_values(by=["date"])[column]
+
+            for i in ma_range:
+                data[ma + "{0}".format(i)] = values.ewm(
+                    span=i, adjust=False).mean().round(2)
+
         return data
     
     def moving_average_crossover(self,
@@ -69,3 +78,26 @@ class MovingAverages:
             ['Upside', 'Downside', 'No Crossover'])
         
         return tuple(data.iloc[-1].iloc[-2:].values.tolist())
+    
+    def moving_average_crossover_panel(
+            self,
+            averages: Dict[str, np.ndarray],
+            pairs: Sequence[Tuple[str, str]],
+            lookback: int = 1
+            ) -> Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]]:
+        """
+        Cross-sectional `moving_average_crossover`, for every pair of
+        moving averages over all the symbols at once.
+        :param averages: dict of moving average name and (symbol x bar)
+                         array, latest bar first, e.g. from
+                         `MovingAverageState.seed`.
+        :param pairs: (fast, slow) pairs of moving average names.
+        :param lookback: Number of latest bars a crossover is looked for in,
+                         1 for the latest bar only.
+
+        :returns: dict of pair and tuple of crossover codes & bars since the
+                  crossover, per symbol.
+        """
+        
+        return {(i, j): crossover_panel(averages[i], averages[j], lookback)
+                for i, j in pairs}
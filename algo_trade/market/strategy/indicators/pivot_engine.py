@@ -0,0 +1,109 @@
+import numpy as np
+from typing import Dict
+
+# Price above which each doubling widens the x-factor by one.
+X_FACTOR_BASE_PRICE = 2500
+X_FACTOR_MAX = 7
+
+CPR_WIDTH_BINS = (0.25, 0.5, 0.75, 0.9)
+CPR_CLASSES = np.array(["Narrow CPR", "Compact CPR", "Mid CPR", "Wide CPR",
+                        "Very Wide CPR"], dtype=object)
+
+PIVOT_LEVELS = ("pivotpt", "bcpr", "tcpr", "r1", "r2", "r3", "s1", "s2",
+                "s3")
+
+
+def x_factor(close: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `PivotPoints.calculate_x_factor`.
+    1 below `X_FACTOR_BASE_PRICE`, one more for every doubling above it,
+    NaN past `X_FACTOR_MAX` or for a missing close.
+    """
+
+    close = np.asarray(close, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = np.floor(np.log2(close / X_FACTOR_BASE_PRICE)) + 2
+
+    factor = np.where(close < X_FACTOR_BASE_PRICE, 1, factor)
+
+    return np.where(factor > X_FACTOR_MAX, np.nan, factor)
+
+
+def classify_cpr(cpr_width: np.ndarray) -> np.ndarray:
+    """ CPR class per width, "0" where the width is missing. """
+
+    cpr_width = np.asarray(cpr_width, dtype=float)
+    classes = CPR_CLASSES[np.searchsorted(CPR_WIDTH_BINS, cpr_width,
+                                          side="left")]
+
+    return np.where(np.isnan(cpr_width), "0", classes)
+
+
+def central_pivots(high: np.ndarray, low: np.ndarray, close: np.ndarray) \
+        -> Dict[str, np.ndarray]:
+
+    pivot = (high + low + close) / 3
+    bcpr = (high + low) / 2
+    tcpr = (pivot - bcpr) + pivot
+
+    return {"pivotpt": pivot, "bcpr": bcpr, "tcpr": tcpr}
+
+
+def resistance_levels(pivot: np.ndarray, high: np.ndarray, low: np.ndarray) \
+        -> Dict[str, np.ndarray]:
+
+    return {"r1": (pivot * 2) - low,
+            "r2": pivot + (high - low),
+            "r3": high + (2 * (pivot - low))}
+
+
+def support_levels(pivot: np.ndarray, high: np.ndarray, low: np.ndarray) \
+        -> Dict[str, np.ndarray]:
+
+    return {"s1": (pivot * 2) - high,
+            "s2": pivot - (high - low),
+            "s3": low - (2 * (high - pivot))}
+
+
+def cpr_width(pivot: np.ndarray, tcpr: np.ndarray, bcpr: np.ndarray,
+              close: np.ndarray = None) -> np.ndarray:
+    """
+    CPR width in % of the pivot, rounded to 2 places and scaled by the
+    x-factor of the close when it's passed.
+    """
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width = np.round((np.abs(tcpr - bcpr) / pivot) * 100, 2)
+
+    if close is None:
+        return width
+
+    return width * x_factor(close)
+
+
+def pivot_levels(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 classify: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Pivot, BCPR/TCPR, R1-R3, S1-S3, CPR width and CPR class for arrays of
+    any shape, e.g. a (symbol x period) panel, in one pass.
+
+    :returns: dict of level name and array, named like the columns
+              `PivotPoints.plot_pivots_with_cpr` adds.
+    """
+
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+
+    levels = central_pivots(high, low, close)
+    pivot = levels["pivotpt"]
+    levels.update(resistance_levels(pivot, high, low))
+    levels.update(support_levels(pivot, high, low))
+    levels["cpr_width"] = cpr_width(pivot, levels["tcpr"], levels["bcpr"],
+                                    close)
+
+    if classify:
+        levels["cpr"] = classify_cpr(levels["cpr_width"])
+
+    return levels
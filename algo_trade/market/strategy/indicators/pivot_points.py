@@ -1,6 +1,8 @@
 # from src.indicators.indicators import Indicators
 import pandas as pd
 import numpy as np
+from typing import Dict, Tuple
+import algo_trade.market.strategy.indicators.pivot_engine as pivot_engine
 
 
 class PivotPoints:
@@ -32,11 +34,9 @@ class PivotPoints:
         :return:
         """
         
-        s1 = round((pivot * 2) - high, round_to)
-        s2 = round(pivot - (high - low), round_to)
-        s3 = round(low - (2 * (high - pivot)), round_to)
+        levels = pivot_engine.support_levels(pivot, high, low)
         
-        return s1, s2, s3
+        return tuple(round(levels[i], round_to) for i in ("s1", "s2", "s3"))
     
     def pivot_resistance_calculator(
             self, pivot: float, high: float, low: float, close: float,
@@ -51,11 +51,10 @@ class PivotPoints:
         :param round_to: 2 int (default)
         :return: Resistance 3, 2, 1, in that order
         """
-        r1 = (pivot * 2) - low
-        r2 = pivot + (high - low)
-        r3 = high + (2 * (pivot - low))
         
-        return r3, r2, r1
+        levels = pivot_engine.resistance_levels(pivot, high, low)
+        
+        return levels["r3"], levels["r2"], levels["r1"]
     
     def pivot_points_calculator(
             self, open: float, high: float, low: float, close: float,
@@ -71,14 +70,17 @@ class PivotPoints:
         :return:
         """
         
-        pivot = round(sum([high, low, close]) / 3, round_to)
-        bcpr = round(sum([high, low]) / 2, round_to)
-        tcpr = round((pivot - bcpr) + pivot, round_to)
+        levels = pivot_engine.central_pivots(high, low, close)
         
-        values = [pivot, bcpr, tcpr]
+        values = [round(levels[i], round_to) for i in ("pivotpt", "bcpr",
+                                                        "tcpr")]
         
         return values
     
+    def hlc_arrays(self, data: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+        return tuple(data[i].to_numpy(dtype=float) for i in ("high", "low",
+                                                             "close"))
+    
     def plot_central_pivots(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Method to Plot Pivot, Bottom CPR, Top CPR,
@@ -86,9 +88,10 @@ class PivotPoints:
         :param data:
         :return:
         """
-        data["pivotpt"] = (data.high + data.low + data.close) / 3
-        data["bcpr"] = (data.high + data.low) / 2
-        data["tcpr"] = (data.pivotpt - data.bcpr) + data.pivotpt
+        
+        for i, j in pivot_engine.central_pivots(
+                *self.hlc_arrays(data)).items():
+            data[i] = j
         
         return data
     
@@ -103,49 +106,38 @@ class PivotPoints:
                  Resistances R1, R2, R3, R4
         """
         
+        high, low, _ = self.hlc_arrays(data)
+        pivot = data.pivotpt.to_numpy(dtype=float)
+        
         # Building Resisitance Levels
-        data["r1"] = (data.pivotpt * 2) - data.low
-        data["r2"] = data.pivotpt + (data.high - data.low)
-        data["r3"] = data.high + (2 * (data.pivotpt - data.low))
+        for i, j in pivot_engine.resistance_levels(pivot, high, low).items():
+            data[i] = j
         
         # Support Levels
-        data["s1"] = (data.pivotpt * 2) - data.high
-        data["s2"] = data.pivotpt - (data.high - data.low)
-        data["s3"] = data.low - (2 * (data.high - data.pivotpt))
+        for i, j in pivot_engine.support_levels(pivot, high, low).items():
+            data[i] = j
         
         return data
     
     def calculate_x_factor(self, price: float) -> int:
         
-        for j in range(1, 8):
-            
-            if price<(2500 * (2**(j - 1))):
-                return j
+        factor = pivot_engine.x_factor(price)
+        
+        return None if np.isnan(factor) else int(factor)
     
     def plot_cpr_width(self, data: pd.DataFrame, classify_cpr: bool = True):
         """
         Method to Calculate CPR & Classify kinds of CPR
         """
         
-        x_factor = data.close.apply(self.calculate_x_factor)
-        
-        data["cpr_width"] = round(
-            (abs(data.tcpr - data.bcpr) / data.pivotpt) * 100, 2)
-        
-        data["cpr_width"] = data.cpr_width * x_factor
+        data["cpr_width"] = pivot_engine.cpr_width(
+            data.pivotpt.to_numpy(dtype=float),
+            data.tcpr.to_numpy(dtype=float),
+            data.bcpr.to_numpy(dtype=float),
+            data.close.to_numpy(dtype=float))
         
         if classify_cpr:
-            condition = [
-                (data.cpr_width<=0.25),
-                ((data.cpr_width>0.25)&(data.cpr_width<=0.5)),
-                ((data.cpr_width>0.5)&(data.cpr_width<=0.75)),
-                ((data.cpr_width>0.75)&(data.cpr_width<=0.9)),
-                (data.cpr_width>0.9)
-                ]
-            cprs = ["Narrow CPR", "Compact CPR", "Mid CPR", "Wide CPR",
-                    "Very Wide CPR"]
-            
-            data["cpr"] = np.select(condition, cprs)
+            data["cpr"] = pivot_engine.classify_cpr(data.cpr_width)
         
         return data
     
@@ -154,8 +146,17 @@ class PivotPoints:
         & CPR Classification
         """
         
-        data = self.plot_central_pivots(data)
-        data = self.plot_support_resistance(data)
-        data = self.plot_cpr_width(data)
+        for i, j in pivot_engine.pivot_levels(
+                *self.hlc_arrays(data)).items():
+            data[i] = j
         
         return data
+    
+    def plot_pivots_panel(self, high: np.ndarray, low: np.ndarray,
+                          close: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Pivots, Supports, Resistances, CPR width & CPR Classification
+        for a (symbol x period) panel of any timeframe, in one pass.
+        """
+        
+        return pivot_engine.pivot_levels(high, low, close)
@@ -0,0 +1,139 @@
+import numpy as np
+from typing import Dict, List, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from algo_trade.data_handler.calendar.constants import DATE_FMT
+from algo_trade.market.strategy.indicators.bar_panel import BarPanel
+from algo_trade.market.strategy.indicators.pivot_points import PivotPoints
+
+# Previous CPRs a bar is compared against.
+VCPR_LOOKBACK = 5
+# Latest bars classified as VCPR/No VCPR.
+VCPR_ROWS = 11
+# Latest bars walked to date the VCPR.
+VCPR_TREND_ROWS = 6
+# Bars needed per symbol for the panel.
+VCPR_PANEL_LENGTH = VCPR_ROWS + VCPR_LOOKBACK
+
+NO_VCPR, VCPR, MILD_VCPR, WIDE_VCPR = range(4)
+VCPR_LABELS = np.array(["No VCPR", "VCPR", "Mild VCPR", "Wide VCPR"],
+                       dtype=object)
+
+
+class VCPREngine(PivotPoints):
+    """
+    VCPREngine finds Long & Short VCPR for every symbol of a `BarPanel`
+    in one pass, off the CPR of each bar & the CPRs of the bars before
+    it.
+    """
+
+    def panel_cpr(self, panel: BarPanel) \
+            -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        CPR band & classification of every bar in the panel.
+
+        :returns: tuple of CPR max, CPR min & CPR class arrays,
+                  NaN/"0" on padding.
+        """
+
+        levels = self.plot_pivots_panel(panel["high"], panel["low"],
+                                        panel["close"])
+        cpr_max = np.fmax(levels["tcpr"], levels["bcpr"])
+        cpr_min = np.fmin(levels["tcpr"], levels["bcpr"])
+        cpr = levels["cpr"]
+
+        return cpr_max, cpr_min, cpr
+
+    def classify_vcpr(self, panel: BarPanel) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classifies the latest `VCPR_ROWS` bars of each symbol.
+        A bar is a Long VCPR when its high is within the highest of the
+        previous `VCPR_LOOKBACK` CPR tops, a Short VCPR when its low is
+        within the lowest of the previous CPR bottoms. Missing values
+        count as 0.
+
+        :returns: tuple of Long & Short VCPR codes, (symbol x bar).
+        """
+
+        cpr_max, cpr_min, cpr = self.panel_cpr(panel)
+        rows = min(VCPR_ROWS, panel.shape[1])
+        pad = ((0, 0), (0, max(0, rows + VCPR_LOOKBACK - panel.shape[1])))
+
+        # Window t spans bars t+1 .. t+VCPR_LOOKBACK, i.e. the previous CPRs.
+        prev_max = sliding_window_view(
+            np.pad(np.nan_to_num(cpr_max), pad)[:, 1:], VCPR_LOOKBACK,
+            axis=1)[:, :rows].max(axis=-1)
+        prev_min = sliding_window_view(
+            np.pad(np.nan_to_num(cpr_min), pad)[:, 1:], VCPR_LOOKBACK,
+            axis=1)[:, :rows].min(axis=-1)
+
+        long_vcpr = np.nan_to_num(panel["high"][:, :rows])<=prev_max
+        short_vcpr = np.nan_to_num(panel["low"][:, :rows])>=prev_min
+
+        wide = cpr[:, :rows] == "Wide CPR"
+        mild = np.isin(cpr[:, :rows], ["Narrow CPR", "Mid CPR"])
+
+        def vcpr_codes(condition: np.ndarray) -> np.ndarray:
+            return np.select(
+                [condition&wide, condition&mild, condition],
+                [WIDE_VCPR, MILD_VCPR, VCPR],
+                NO_VCPR
+                )
+
+        return vcpr_codes(long_vcpr), vcpr_codes(short_vcpr)
+
+    def vcpr_with_date(self, codes: np.ndarray, panel: BarPanel) \
+            -> np.ndarray:
+        """
+        Vectorized `CPRAbstract.find_vcpr_with_date` over all symbols.
+        The walk over the latest bars stops at the first No VCPR or
+        Wide VCPR, and the VCPR is dated from the last Mild VCPR before it.
+        """
+
+        codes = codes[:, :VCPR_TREND_ROWS]
+        n_symbols, n_rows = codes.shape
+        codes = np.where(panel.valid[:, :n_rows], codes, -1)
+        cols = np.arange(n_rows)
+
+        stops = np.isin(codes, (NO_VCPR, WIDE_VCPR))
+        has_stop = stops.any(axis=1)
+        stop = np.where(has_stop, stops.argmax(axis=1), n_rows)
+
+        mild = (codes == MILD_VCPR)&(cols<stop[:, None])
+        has_mild = mild.any(axis=1)
+        last_mild = n_rows - 1 - mild[:, ::-1].argmax(axis=1)
+
+        first = has_stop&(stop == 0)
+        wide_from = has_stop&~first&(
+                codes[np.arange(n_symbols), stop.clip(max=n_rows - 1)]
+                == WIDE_VCPR)
+
+        dated = panel.dates[np.arange(n_symbols),
+                            np.where(wide_from, stop, last_mild).clip(
+                                max=n_rows - 1)]
+        dated = np.array([i.strftime(DATE_FMT) if i is not None else str()
+                          for i in dated], dtype=object)
+
+        return np.select(
+            [first, wide_from, has_mild],
+            [VCPR_LABELS[codes[:, 0].clip(min=0)],
+             "Wide VCPR from " + dated,
+             "Mild VCPR from " + dated],
+            "Mild VCPR to No VCPR"
+            )
+
+    def vcpr_panel(self, panel: BarPanel) -> Dict[str, List[str]]:
+        """
+        VCPR for every symbol of the panel.
+
+        :returns: dict of symbol and a list of Long VCPR & Short VCPR.
+        """
+
+        if 0 in panel.shape:
+            return dict()
+
+        long_codes, short_codes = self.classify_vcpr(panel)
+        long_vcpr = self.vcpr_with_date(long_codes, panel)
+        short_vcpr = self.vcpr_with_date(short_codes, panel)
+
+        return {i:[j, k] for i, j, k in zip(panel.symbols, long_vcpr,
+                                              short_vcpr)}
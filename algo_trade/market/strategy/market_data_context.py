@@ -0,0 +1,158 @@
+import pandas as pd
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+from algo_trade.data_handler import DataHandler
+from algo_trade.data_handler.session_cache import SessionCache
+from algo_trade.data_handler.calendar import TradingCalendar, \
+    trading_calendar
+from algo_trade.market.strategy.indicators import BarPanel
+
+
+def _copy(data: Any) -> Any:
+    """
+    Frames & panels are handed out as copies, so callers can't alter the
+    memo.
+    """
+
+    if isinstance(data, (pd.DataFrame, BarPanel)):
+        return data.copy()
+
+    if isinstance(data, dict):
+        return {i: _copy(j) for i, j in data.items()}
+
+    return data
+
+
+class MarketDataContext:
+    """
+    MarketDataContext holds the market data of a run date and the single
+    `DataHandler` it's loaded with.
+    Datasets are loaded lazily on first use and memoized in a
+    `SessionCache`, so that the scanners and reports sharing a context
+    load each of them once, within the cache's byte budget and until the
+    trading session rolls over.
+    Concurrent requests for the same dataset wait on the first one.
+    """
+
+    def __init__(self, date_str: str = None,
+                 data_handler: DataHandler = None,
+                 cache: SessionCache = None):
+        """
+        :param date_str: Run date in DATE_FMT, today if None.
+        :param data_handler: DataHandler to load the data with,
+                             created for the run date if None.
+        :param cache: Cache the datasets are memoized in, which may be
+                      shared across contexts, a new one if None.
+        """
+
+        self.date_str = date_str
+        self.data_handler = data_handler or DataHandler(date_str)
+        self.cache = cache if cache is not None else SessionCache()
+
+    @property
+    def next_day(self) -> date:
+        return self.data_handler.next_day
+
+    @property
+    def prev_day(self) -> date:
+        return self.data_handler.prev_day
+
+    def memoize(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Result of `func`, called once per key for the context's run date
+        and session.
+        """
+
+        return _copy(self.cache.get_or_load((self.date_str, key), func,
+                                            *args, **kwargs))
+
+    def clear(self, *keys: Hashable):
+        """
+        Drops the given datasets, or all of the run date's, from the
+        cache. Datasets other contexts memoized for other dates are kept.
+        """
+
+        if not keys:
+            keys = [i[1] for i in self.cache.keys()
+                    if isinstance(i, tuple) and len(i) == 2
+                    and i[0] == self.date_str]
+
+        for key in keys:
+            self.cache.pop((self.date_str, key))
+
+    def processed_bhavcopy(self, top_n: int = 1000) -> pd.DataFrame:
+        return self.memoize(("processed_bhavcopy", top_n),
+                            self.data_handler.processed_bhavcopy, top_n)
+
+    def processed_timeframe_bhavcopy(self, nse_n: int,
+                                     timeframe: str = "week") \
+            -> pd.DataFrame:
+        return self.memoize(("processed_timeframe_bhavcopy", nse_n,
+                             timeframe),
+                            self.data_handler.processed_timeframe_bhavcopy,
+                            nse_n, timeframe)
+
+    def nse_daily_bhavcopy(self, date_: date, *args) -> pd.DataFrame:
+        return self.memoize(("nse_daily_bhavcopy", date_) + args,
+                            self.data_handler.nse_daily_bhavcopy, date_,
+                            *args)
+
+    def all_indices(self) -> pd.DataFrame:
+        return self.memoize("all_indices",
+                            self.data_handler.get_nse_all_indices)
+
+    def bar_data(self, symbols: Iterable[str], period: str = "1mo",
+                 interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """ Memoized `get_period_data_bulk` of the symbols. """
+
+        symbols = tuple(symbols)
+
+        return self.memoize(("bar_data", symbols, period, interval),
+                            self.data_handler.get_period_data_bulk, symbols,
+                            period=period, interval=interval)
+
+    def bar_panel(self, symbols: Iterable[str], period: str = "1mo",
+                  interval: str = "1d",
+                  columns: Tuple[str, ...] = ("open", "high", "low",
+                                              "close"),
+                  length: int = None) -> BarPanel:
+        """ `BarPanel` of the symbols' bars, see `bar_data`. """
+
+        symbols = tuple(symbols)
+
+        return self.memoize(("bar_panel", symbols, period, interval,
+                             tuple(columns), length),
+                            lambda: BarPanel.from_frames(
+                                self.bar_data(symbols, period, interval),
+                                columns, length))
+
+    def market_holidays(self) -> pd.DataFrame:
+        return self.memoize("market_holidays",
+                            lambda: self.data_handler.cache.market_holidays)
+
+    def trading_calendar(self) -> TradingCalendar:
+        return trading_calendar(self.next_day.year)
+
+    def fno_lots(self) -> pd.DataFrame:
+        """ Lot sizes of the F&O stocks per contract month. """
+
+        return self.memoize("fno_lots",
+                            lambda: self.data_handler.cache.fno_data)
+
+    def index_lots(self) -> pd.DataFrame:
+        """ Lot sizes of the F&O indices per contract month. """
+
+        return self.memoize("index_lots",
+                            lambda: self.data_handler.cache.index_lots)
+
+    def india_vix(self, dt_fmt: str = "%d-%m-%Y") -> float:
+        """ Latest close of India VIX, in %. """
+
+        def latest_close() -> float:
+            data = self.data_handler.get_india_vix(
+                self.prev_day.strftime(dt_fmt),
+                self.next_day.strftime(dt_fmt))
+
+            return float(data.sort_values(by="timestamp").close.iloc[-1])
+
+        return self.memoize("india_vix", latest_close)
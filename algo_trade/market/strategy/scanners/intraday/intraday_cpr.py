@@ -1,5 +1,4 @@
 import pandas as pd
-import asyncio
 from algo_trade.utils.meta import AsyncLoggingMeta
 from algo_trade.market.strategy.scanners.scanner_generics.cpr_strategy \
     import CPRAbstract
@@ -27,7 +26,7 @@ class IntradayStockCPRStrategy(CPRAbstract, metaclass=AsyncLoggingMeta):
         
         self.logger.debug("Initiated Process to get Processed BhavCopy for "
                           "{0}.".format(self.CPR_FREQUENCY))
-        data = self.yf_utils.processed_bhavcopy(self.nse_n)
+        data = self.context.processed_bhavcopy(self.nse_n)
         
         self.logger.debug(
             "Processed BhavCopy Received. Shape: {0}".format(data.shape))
@@ -65,8 +64,7 @@ class IntradayStockCPRStrategy(CPRAbstract, metaclass=AsyncLoggingMeta):
             vcpr_symbols = data.loc[
                 data[
                     "cpr_width"]<=self.vcpr_cpr_cutoff, "symbol"].values.tolist()
-            vcpr_symbols = asyncio.run(self.identify_ticker_with_vcpr(
-                vcpr_symbols))
+            vcpr_symbols = self.identify_ticker_with_vcpr_panel(vcpr_symbols)
             vcpr_data = pd.DataFrame(vcpr_symbols).transpose().reset_index()
             vcpr_data.columns = ["symbol", "long_vcpr", "short_vcpr"]
             
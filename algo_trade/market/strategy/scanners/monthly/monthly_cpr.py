@@ -23,8 +23,8 @@ class MonthlyCprStrategy(CPRAbstract, metaclass=AsyncLoggingMeta):
 
         if self.yf_utils.prev_day.month != self.yf_utils.next_day.month:
 
-            data = self.yf_utils.processed_timeframe_bhavcopy(self.nse_n,
-                                                              "month")
+            data = self.context.processed_timeframe_bhavcopy(self.nse_n,
+                                                             "month")
 
             self.logger.info("Monthly Quote DataFrame receivied. "
                              "Shape: {0}".format(data.shape))
@@ -16,7 +16,7 @@ class WeeklyCPRStrategy(CPRAbstract, metaclass=AsyncLoggingMeta):
 
         if self.yf_utils.prev_day.isocalendar().week != self.yf_utils.next_day.isocalendar().week:
 
-            data = self.yf_utils.processed_timeframe_bhavcopy(self.nse_n)
+            data = self.context.processed_timeframe_bhavcopy(self.nse_n)
 
             data = self.plot_pivots_with_cpr(data)
 
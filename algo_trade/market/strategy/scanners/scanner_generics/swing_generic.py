@@ -1,19 +1,21 @@
 from abc import abstractmethod
 import pandas as pd
 from datetime import datetime, date
-from functools import cache
+from typing import Iterable
 from algo_trade.utils.meta import AsyncLoggingMeta
 from algo_trade.market.strategy.indicators import MovingAverages
 from algo_trade.data_handler import DataHandler
+from algo_trade.market.strategy.market_data_context import MarketDataContext
 from algo_trade.data_handler.calendar.constants import TODAY, DATE_FMT
 from algo_trade.market.strategy.constants import SWING_NSE_LIMIT, \
     SWING_FNO_FILTER, SWING_EARNINGS_DELTA, SWING_MIN_SHARE_PRICE, \
     SWING_MIN_PCT_CHANGE, STOCK_MODIFICATION
 
 
-def store_swing_output(data: pd.DataFrame, dated: date = None):
+def store_swing_output(data: pd.DataFrame, dated: date = None,
+                       context: MarketDataContext = None):
     strategy_name = "SwingRun"
-    data_handler = DataHandler()
+    data_handler = DataHandler() if context is None else context.data_handler
 
     if dated is None:
         dated = data_handler.prev_day.strftime(DATE_FMT)
@@ -21,8 +23,9 @@ def store_swing_output(data: pd.DataFrame, dated: date = None):
     data_handler.store_strategy_output(strategy_name, data, dated)
 
 
-def retrieve_swing_output(dated: str = None) -> pd.DataFrame():
-    data_handler = DataHandler()
+def retrieve_swing_output(dated: str = None,
+                          context: MarketDataContext = None) -> pd.DataFrame():
+    data_handler = DataHandler() if context is None else context.data_handler
     if dated is None:
         dated = data_handler.prev_day.strftime(DATE_FMT)
 
@@ -31,6 +34,50 @@ def retrieve_swing_output(dated: str = None) -> pd.DataFrame():
     return data
 
 
+def prepare_swing_list(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Swing Trading list out of the processed bhavcopy, shared by all the
+    swing scanners.
+    """
+
+    # 1. Select columns and basic column type and rename actions.
+    data_columns = [
+        "index",
+        "symbol",
+        "lotsize",
+        "close",
+        "prev_close",
+        "volume",
+        "pct_change",
+        "timestamp"
+    ]
+    data = data[data_columns]
+    # data = data[data_columns].rename(columns={"Tottrdqty": "Last Volume"})
+    # data.loc[:, "Last Volume"] = data["Last Volume"].astype(int)
+
+    # 2. Look for basic stock ticker name changes.
+    # Manual transformation of Stocks whose name has been changed.
+    modification = list(STOCK_MODIFICATION.keys())
+
+    if any(data.symbol.isin(modification)):
+        data.loc[data.symbol.isin(modification), "symbol"] = data.loc[
+            data.symbol.isin(modification), "symbol"
+        ].map(STOCK_MODIFICATION)
+
+    data.set_index("index")
+
+    return data
+
+
+def merge_swing_results(results: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """ Merges the outputs of the swing scanners into the Swing Result. """
+
+    data = pd.concat(list(results)).fillna(0)
+    data = data.drop(columns=["index"])
+
+    return data
+
+
 class SwingTradingGeneric(MovingAverages, metaclass=AsyncLoggingMeta):
     """
     A Generic Abstract SwingTrading class which is a parent
@@ -40,8 +87,9 @@ class SwingTradingGeneric(MovingAverages, metaclass=AsyncLoggingMeta):
 
     """
 
-    processed_data = None
-    swing_result = pd.DataFrame()
+    # Shared inputs the scanner's output is generated from,
+    # see `ScannerRunner`.
+    REQUIRES = ("swing_ready_list",)
 
     def __init__(
             self,
@@ -49,78 +97,63 @@ class SwingTradingGeneric(MovingAverages, metaclass=AsyncLoggingMeta):
             date_str: str = None,
             fno_filter: bool = SWING_FNO_FILTER,
             result_delta: int = SWING_EARNINGS_DELTA,
+            context: MarketDataContext = None,
     ):
         self.nse_nos = nse
         self.date_str = date_str
-        self.processor = DataHandler()
+        self.context = context or MarketDataContext()
+        self.processor = self.context.data_handler
         self.fno_filter = fno_filter
+        self.processed_data = None
+        self.inputs = dict()
 
-    @cache
     def get_swing_trading_ready_list(self) -> pd.DataFrame:
-        """List of Stocks ready for Swing Trading."""
-
-        if self.processed_data is not None:
-            return self.processed_data
+        """
+        List of Stocks ready for Swing Trading, memoized in the context's
+        session cache.
+        """
 
-        # 1. Consume Processed data using Top NSE nos.
-        data = self.processor.processed_bhavcopy(self.nse_nos)
-
-        # 2. Select columns and basic column type and rename actions.
-        data_columns = [
-            "index",
-            "symbol",
-            "lotsize",
-            "close",
-            "prev_close",
-            "volume",
-            "pct_change",
-            "timestamp"
-        ]
-        data = data[data_columns]
-        # data = data[data_columns].rename(columns={"Tottrdqty": "Last Volume"})
-        # data.loc[:, "Last Volume"] = data["Last Volume"].astype(int)
-
-        # 3. Align Result Date Over the span of a + or - 15 days.
+        # Align Result Date Over the span of a + or - 15 days.
         if self.date_str is None:
             self.date_str = TODAY.strftime(DATE_FMT)
 
-        # 4. Look for basic stock ticker name changes.
-        # Manual transformation of Stocks whose name has been changed.
-        modification = list(STOCK_MODIFICATION.keys())
+        if self.processed_data is not None:
+            return self.processed_data
 
-        if any(data.symbol.isin(modification)):
-            data.loc[data.symbol.isin(modification), "symbol"] = data.loc[
-                data.symbol.isin(modification), "symbol"
-            ].map(STOCK_MODIFICATION)
+        # Consume Processed data using Top NSE nos.
+        data = self.context.memoize(
+            ("swing_ready_list", self.nse_nos),
+            lambda: prepare_swing_list(
+                self.context.processed_bhavcopy(self.nse_nos)))
 
         self.logger.info("Data Generated for Swing Trade")
 
-        data.set_index("index")
-
-        SwingTradingGeneric.processed_data = data
+        self.processed_data = data
 
         return data
 
-    def append_swing_results(self, data):
-        """ Method to append swing result. """
-
-        SwingTradingGeneric.swing_result = pd.concat(
-            [SwingTradingGeneric.swing_result, data])
+    def run_scanner(self, swing_ready_list: pd.DataFrame = None,
+                    **inputs) -> pd.DataFrame:
+        """
+        Generates the scanner's output from inputs shared across scanners,
+        fetched once by the runner instead of by every scanner.
 
-    def get_swing_result(self) -> pd.DataFrame:
+        :param swing_ready_list: Swing Trading list, see `prepare_swing_list`.
+        :param inputs: Other inputs named in `REQUIRES`, e.g. bar data.
+        :returns: Scanner's output.
         """
-        Meant to return Swing Result
-        after all the strategies have been executed.
-        . """
 
-        data = SwingTradingGeneric.swing_result.fillna(0)
-        data = data.drop(columns=["index"])
-        return data
+        if swing_ready_list is not None:
+            self.processed_data = swing_ready_list.copy()
+
+        self.inputs.update(inputs)
+
+        return self.generate_swing_output()
 
     @abstractmethod
-    def generate_swing_output(self):
+    def generate_swing_output(self) -> pd.DataFrame:
         """This abstract method needs to be implemented to execute
-        Derived swing strategies.
+        Derived swing strategies, returning their output.
         """
 
         raise NotImplementedError()
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from graphlib import TopologicalSorter
+from time import perf_counter
+from typing import Any, Callable, Dict, Tuple
+from algo_trade.utils.meta import AsyncLoggingMeta
+from algo_trade.market.strategy.constants import SCANNER_MAX_WORKERS
+
+
+class ScannerRunner(metaclass=AsyncLoggingMeta):
+    """
+    ScannerRunner runs scanners over shared inputs, such as the processed
+    bhavcopy or bar data.
+    Inputs and scanners are nodes of a dependency graph, each node is
+    called with the results of the nodes it requires as keyword
+    arguments. Every input is computed once, and nodes whose
+    requirements are met run concurrently on a thread pool.
+    """
+
+    def __init__(self, max_workers: int = SCANNER_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.nodes: Dict[str, Tuple[Callable, Tuple[str, ...]]] = dict()
+        self.scanners = list()
+        self.timings = dict()
+
+    def add_input(self, name: str, func: Callable,
+                  requires: Tuple[str, ...] = ()):
+        """
+        :param name: Name scanners require the input by.
+        :param func: Callable computing the input.
+        :param requires: Inputs `func` is called with.
+        """
+
+        self.nodes[name] = (func, tuple(requires))
+
+    def add_scanner(self, name: str, func: Callable,
+                    requires: Tuple[str, ...] = ()):
+        """
+        :param name: Name the scanner's result is returned under.
+        :param func: Callable returning the scanner's result.
+        :param requires: Inputs `func` is called with.
+        """
+
+        self.nodes[name] = (func, tuple(requires))
+        self.scanners.append(name)
+
+    def graph(self) -> Dict[str, Tuple[str, ...]]:
+        missing = {j for _, i in self.nodes.values() for j in i} \
+                  - self.nodes.keys()
+
+        if missing:
+            raise KeyError("Inputs required but not added to the runner: "
+                           "{0}".format(sorted(missing)))
+
+        return {i: j[1] for i, j in self.nodes.items()}
+
+    def _run_node(self, name: str, results: Dict[str, Any]) -> Any:
+        func, requires = self.nodes[name]
+
+        start = perf_counter()
+        result = func(**{i: results[i] for i in requires})
+        self.timings[name] = round(perf_counter() - start, 2)
+
+        self.logger.info("Execution time for {0}: {1}s".format(
+            name, self.timings[name]))
+
+        return result
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Runs every node once its requirements are computed.
+        A failing node raises once the nodes already running complete.
+
+        :returns: dict of scanner name and its result.
+        """
+
+        sorter = TopologicalSorter(self.graph())
+        sorter.prepare()
+        results = dict()
+        running = dict()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while sorter.is_active():
+                for name in sorter.get_ready():
+                    running[executor.submit(self._run_node, name,
+                                            results)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    sorter.done(name)
+
+        return {i: results[i] for i in self.scanners}
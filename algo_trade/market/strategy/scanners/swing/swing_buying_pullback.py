@@ -120,7 +120,7 @@ class SwingBuyingPullBackScanner(SwingTradingGeneric,
         data = data.loc[data.trading_value >= 10000000]
         tickers = data.symbol.to_list()
 
-        con_range = ConsolidationRange()
+        con_range = ConsolidationRange(context=self.context)
         ticker_series = con_range.get_price_time_consolidation(tickers)
 
         data = pd.merge(data, ticker_series, on="symbol",
@@ -141,14 +141,12 @@ class SwingBuyingPullBackScanner(SwingTradingGeneric,
         data["timestamp"] = pd.to_datetime(data.timestamp).apply(
             lambda x: x.strftime(DATE_FMT))
 
-        self.append_swing_results(data)
+        return data
 
 
 if __name__ == '__main__':
     obj = SwingBuyingPullBackScanner()
 
-    obj.generate_swing_output()
-
-    result = obj.get_swing_result()
+    result = obj.generate_swing_output()
 
     print(result)
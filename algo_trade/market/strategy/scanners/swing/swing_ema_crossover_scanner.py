@@ -5,56 +5,79 @@
 # 2. 20days EMA crosses 50 days EMA
 # 3. 50 days EMA crosses 200day ema
 
+import numpy as np
 import pandas as pd
-from asyncio import run
 
 from algo_trade.utils.meta import AsyncLoggingMeta
-from algo_trade.market.strategy.indicators.moving_averages import MovingAverages
+from algo_trade.market.strategy.indicators import BarPanel, \
+    MovingAverages, MovingAverageState
+from algo_trade.market.strategy.indicators.moving_average_engine import \
+    NO_CROSSOVER, CROSSOVER_LABELS
 from algo_trade.market.strategy.scanners.scanner_generics.swing_generic import SwingTradingGeneric
+from algo_trade.market.strategy.constants import SWING_CROSSOVER_SPANS, \
+    SWING_CROSSOVER_EMAS, SWING_CROSSOVER_LOOKBACK, SWING_BARS_PERIOD
 
 
 class SwingMovingAverageCrossOver(SwingTradingGeneric, metaclass=AsyncLoggingMeta):
     __name__ = "Moving Average Crossover"
+    REQUIRES = ("swing_ready_list", "daily_bars")
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, lookback: int = SWING_CROSSOVER_LOOKBACK,
+                 **kwargs):
         super(SwingMovingAverageCrossOver, self).__init__(*args, **kwargs)
         
         self.moving_avg = MovingAverages()
+        self.lookback = lookback
     
-    async def _identify_crossover(self, data: pd.DataFrame) -> str:
-        data = data.sort_values(by="date", ascending=True)
+    def _identify_crossover(self, data: dict) -> pd.DataFrame:
+        """
+        Crossovers of all the EMA pairs for every symbol in one pass over
+        a (symbol x bar) EMA matrix, looking back `lookback` sessions.
+        EMAs are carried on from the persisted `MovingAverageState`, only
+        the bars since the last run are folded in.
+        """
         
-        data = self.moving_avg.add_moving_averages(data)
-        emas = (('EMA10', 'EMA20'), ('EMA20', 'EMA50'), ('EMA50', 'EMA200'))
+        panel = BarPanel.from_frames(data, columns=("close",))
+        state = MovingAverageState.load("EMA", SWING_CROSSOVER_SPANS,
+                                        history=self.lookback + 1)
+        emas = state.advance(panel)
+        state.save()
+        emas = {i: np.round(j, 2) for i, j in emas.items()}
         
-        result = [self.moving_average_crossover(data, i, j) for i, j in emas]
+        crossovers = self.moving_avg.moving_average_crossover_panel(
+            emas, SWING_CROSSOVER_EMAS, self.lookback)
         
-        final = str()
+        final = np.full(len(panel.symbols), str(), dtype=object)
         
-        for i, j in enumerate(result):
-            
-            if j[0] is True:
-                final += "{0} Crossover on {1} X {2}.".format(j[1], *emas[i])
+        for (i, j), (codes, bars_ago) in crossovers.items():
+            for row in np.flatnonzero(codes != NO_CROSSOVER):
+                final[row] += "{0} Crossover on {1} X {2}{3}.".format(
+                    CROSSOVER_LABELS[codes[row]], i, j,
+                    " {0} sessions ago".format(bars_ago[row])
+                    if bars_ago[row] > 0 else str())
         
-        if final == str():
-            final = 'No Crossover'
+        final[final == str()] = 'No Crossover'
         
-        return final
+        return pd.DataFrame({"symbol": panel.symbols, "crossover": final})
     
-    async def _cross_over_method(self, tickers: tuple):
-        data = {i:self.processor.get_period_data(i, period='12mo', interval='1d')
-                for i in tickers}
+    def _cross_over_method(self, tickers: tuple):
+        data = self.inputs.get("daily_bars")
         
-        data = {i:await self._identify_crossover(j) for i, j in data.items()}
+        if data is None:
+            data = self.processor.get_period_data_bulk(
+                tickers, period=SWING_BARS_PERIOD, interval='1d')
         
-        return pd.DataFrame(data.items(), columns=["symbol", "crossover"])
+        else:
+            data = {i: data[i] for i in tickers if i in data}
+        
+        return self._identify_crossover(data)
     
-    def generate_swing_output(self):
+    def generate_swing_output(self) -> pd.DataFrame:
         data = self.get_swing_trading_ready_list()
         
         tickers = data.symbol.tolist()
         
-        result = run(self._cross_over_method(tuple(tickers)))
+        result = self._cross_over_method(tuple(tickers))
         
         result = pd.merge(data, result, on="symbol", how="left")
         
@@ -62,12 +85,12 @@ class SwingMovingAverageCrossOver(SwingTradingGeneric, metaclass=AsyncLoggingMet
         
         result = result.loc[~(result.crossover == 'No Crossover'), :]
         
-        self.append_swing_results(result)
+        return result
 
 
 if __name__ == '__main__':
     obj = SwingMovingAverageCrossOver()
     
-    result = obj.swing_filtered_list()
+    result = obj.generate_swing_output()
     
     print(result)
@@ -1,9 +1,13 @@
-import sys
-from inspect import isclass, getmembers
+from functools import partial
 from algo_trade.utils import write_df_to_file
+from algo_trade.market.strategy.market_data_context import MarketDataContext
 from algo_trade.data_handler.calendar.constants import DATE_FMT
-
-from algo_trade.market.strategy.scanners.scanner_generics.swing_generic import store_swing_output, retrieve_swing_output
+from algo_trade.market.strategy.constants import SWING_NSE_LIMIT, \
+    SWING_BARS_PERIOD
+from algo_trade.market.strategy.scanners.scanner_runner import ScannerRunner
+from algo_trade.market.strategy.scanners.scanner_generics.swing_generic import \
+    store_swing_output, retrieve_swing_output, prepare_swing_list, \
+    merge_swing_results
 from algo_trade.market.strategy.scanners.swing.swing_buying_pullback import \
     SwingBuyingPullBackScanner
 from algo_trade.market.strategy.scanners.swing.swing_volume_scanner import \
@@ -11,22 +15,49 @@ from algo_trade.market.strategy.scanners.swing.swing_volume_scanner import \
 from algo_trade.market.strategy.scanners.swing.swing_ema_crossover_scanner \
     import SwingMovingAverageCrossOver
 
+SWING_SCANNERS = (SwingBuyingPullBackScanner, SwingVolumeScanner,
+                  SwingMovingAverageCrossOver)
+
+
+def swing_runner(scanners: tuple = SWING_SCANNERS,
+                 nse: int = SWING_NSE_LIMIT,
+                 context: MarketDataContext = None) -> ScannerRunner:
+    """
+    ScannerRunner for the swing scanners.
+    The processed bhavcopy, the Swing Trading list and the daily bars of
+    its symbols are fetched once and shared by the scanners requiring them.
+    """
+
+    context = context or MarketDataContext()
+    runner = ScannerRunner()
+
+    def daily_bars(swing_ready_list):
+        return context.bar_data(swing_ready_list.symbol,
+                                period=SWING_BARS_PERIOD, interval='1d')
 
-def swing_result():
-    class_list = list()
-    data = retrieve_swing_output()
+    runner.add_input("processed_bhavcopy",
+                     partial(context.processed_bhavcopy, nse))
+    runner.add_input("swing_ready_list", prepare_swing_list,
+                     ("processed_bhavcopy",))
+    runner.add_input("daily_bars", daily_bars, ("swing_ready_list",))
+
+    for scanner in scanners:
+        obj = scanner(nse=nse, context=context)
+        runner.add_scanner(obj.__name__, obj.run_scanner, obj.REQUIRES)
+
+    return runner
+
+
+def swing_result(context: MarketDataContext = None):
+    context = context or MarketDataContext()
+    data = retrieve_swing_output(context=context)
     if data is not None:
         return data
 
-    for name, obj in getmembers(sys.modules[__name__]):
-        if isclass(obj):
-            _ = obj()
-            class_list.append(_)
-
-    class_list = [i.generate_swing_output() for i in class_list]
+    runner = swing_runner(context=context)
+    data = merge_swing_results(runner.run().values())
 
-    data = _.get_swing_result()
-    store_swing_output(data)
+    store_swing_output(data, context=context)
     return data
 
 
@@ -35,6 +35,7 @@ class SwingVolumeScanner(SwingTradingGeneric):
     """
 
     __name__ = "BIG-BANG VOLUME"
+    REQUIRES = ("swing_ready_list", "daily_bars")
 
     def __init__(
             self,
@@ -73,9 +74,15 @@ class SwingVolumeScanner(SwingTradingGeneric):
     def swing_volume_analysis_util(self, symbol: str) -> dict:
         """Identifies volume difference from the previous day volume."""
 
-        data = self.processor.get_period_data(
-            symbol, period="5d", interval="1d"
-        ).reset_index()
+        if symbol in self.inputs.get("daily_bars", dict()):
+            data = self.inputs["daily_bars"][symbol].head(5)
+
+        else:
+            data = self.processor.get_period_data(
+                symbol, period="5d", interval="1d"
+            )
+
+        data = data.reset_index()
         data.loc[:, "date"] = pd.to_datetime(data.date).apply(lambda x:
                                                               x.date())
         data["prev_volume"] = (
@@ -117,7 +124,7 @@ class SwingVolumeScanner(SwingTradingGeneric):
 
         return data
 
-    def generate_swing_output(self):
+    def generate_swing_output(self) -> pd.DataFrame:
         """Generating Swing Output for Swing Volume Scanner."""
 
         # 1. Receiving Filtered List of Stocks.
@@ -132,10 +139,11 @@ class SwingVolumeScanner(SwingTradingGeneric):
         # 4. Setting the Strategy Name for the frame.
         data["Strategy"] = self.__name__
 
-        # 5. Sharing the Swing result File across multiple strategies.
-        self.append_swing_results(data)
+        return data
 
 
 if __name__ == "__main__":
     obj = SwingVolumeScanner()
-    obj.generate_swing_output()
+    result = obj.generate_swing_output()
+
+    print(result)
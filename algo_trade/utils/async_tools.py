@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+async def run_in_executor(executor: Optional[Executor], func: Callable,
+                          *args, **kwargs) -> Any:
+    """ Awaits a blocking callable on the given executor. """
+
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(executor, partial(func, *args,
+                                                        **kwargs))
+
+
+async def gather_bounded(func: Callable, items: Iterable,
+                         max_concurrency: int,
+                         timeout: Optional[float] = None) -> Dict[Any, Any]:
+    """
+    Awaits `func(item)` for every item, with at most `max_concurrency`
+    in flight and a per item `timeout`.
+
+    :returns: dict of item and its result. Items which failed or timed
+              out map to the raised exception, so one failure doesn't
+              cancel the rest of the batch.
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(item):
+        async with semaphore:
+            return await asyncio.wait_for(func(item), timeout)
+
+    items = list(items)
+    results = await asyncio.gather(*[bounded(i) for i in items],
+                                   return_exceptions=True)
+
+    return dict(zip(items, results))
+
+
+async def retry(func: Callable, *args, retries: int, backoff: float,
+                **kwargs) -> Any:
+    """
+    Awaits `func(*args, **kwargs)`, retrying up to `retries` times on an
+    exception, after `backoff` seconds doubled on every attempt. The last
+    exception is raised once the retries run out.
+    """
+
+    for attempt in range(retries + 1):
+        try:
+            return await func(*args, **kwargs)
+
+        except Exception:
+            if attempt == retries:
+                raise
+
+            await asyncio.sleep(backoff * 2 ** attempt)
+
+
+class RateLimiter:
+    """
+    Spaces out awaits to at most `rate` per second.
+    Slots are reserved without awaiting, so concurrent tasks on the loop
+    are queued in order without a lock.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self.next_slot = 0.0
+
+    async def acquire(self):
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
@@ -0,0 +1,124 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+from requests import Session
+from requests.exceptions import HTTPError
+
+from algo_trade.data_handler.network_tools import DownloadTools
+
+HEADERS = {"User-Agent": "test"}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    NSE like stub: the homepage hands out a new cookie on every hit,
+    `/api/stale` turns the first cookie away with a 401, `/api/denied`
+    turns every cookie away with a 403.
+    """
+
+    def do_GET(self):
+        server = self.server
+        server.hits[self.path] += 1
+
+        if self.path == "/":
+            time.sleep(server.homepage_delay)
+            server.cookies += 1
+            self.send_response(200)
+            self.send_header("Set-Cookie",
+                             "nsit={0}; Path=/".format(server.cookies))
+            self.end_headers()
+            return
+
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        generation = int(cookie["nsit"].value) if "nsit" in cookie else 0
+
+        if self.path == "/api/stale" and generation > 1:
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b'{"ok": true}')
+            return
+
+        self.send_response(401 if self.path == "/api/stale" else 403)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(homepage_delay: float = 0.0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.hits, server.cookies = Counter(), 0
+    server.homepage_delay = homepage_delay
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+def url(server: ThreadingHTTPServer, path: str) -> str:
+    return "http://127.0.0.1:{0}{1}".format(server.server_port, path)
+
+
+@pytest.fixture
+def server():
+    server = start_server()
+    yield server
+    server.shutdown()
+
+
+def download_tools(max_retries: int = 2) -> DownloadTools:
+    return DownloadTools(session=Session(), max_retries=max_retries,
+                         backoff_factor=0)
+
+
+def test_refreshes_cookies_on_401(server):
+    tools = download_tools()
+
+    result = tools.get_request_api(url(server, "/api/stale"), HEADERS)
+
+    assert result.json() == {"ok": True}
+    assert server.hits == {"/": 2, "/api/stale": 2}
+
+
+def test_gives_up_after_max_retries(server):
+    tools = download_tools(max_retries=2)
+
+    with pytest.raises(HTTPError) as error:
+        tools.get_request_api(url(server, "/api/denied"), HEADERS)
+
+    assert error.value.response.status_code == 403
+    assert server.hits == {"/": 3, "/api/denied": 3}
+
+
+def test_cookies_fetched_once_per_domain(server):
+    tools = download_tools()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        cookies = list(executor.map(
+            lambda _: tools.get_cookies(url(server, "/"), HEADERS),
+            range(8)))
+
+    assert server.hits["/"] == 1
+    assert all(i == {"nsit": "1"} for i in cookies)
+
+
+def test_slow_domain_holds_up_no_other(server):
+    slow = start_server(homepage_delay=1.0)
+    tools = download_tools()
+
+    try:
+        Thread(target=tools.get_cookies,
+               args=(url(slow, "/"), HEADERS)).start()
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        tools.get_cookies(url(server, "/"), HEADERS)
+
+        assert time.monotonic() - start < 0.5
+
+    finally:
+        slow.shutdown()
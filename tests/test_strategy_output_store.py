@@ -0,0 +1,126 @@
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from algo_trade.data_handler.strategy_output_store import \
+    StrategyOutputStore, TEMP_FILE
+from algo_trade.market.strategy.analysis.consolidation_analysis import \
+    ConsolidationRange
+from algo_trade.market.strategy.constants import CPR_STRATEGY_COLUMNS
+from algo_trade.market.strategy.indicators import BarPanel
+
+STRATEGY_NAME = "IntradayCPRAnalysis"
+OUTPUT_DATE = date(2024, 1, 2)
+
+
+def bars(count: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({"date": pd.date_range("2023-06-01", periods=count),
+                         "close": 100 + rng.normal(0, 1, count).cumsum()})
+    data["pct_change"] = data.close.pct_change() * 100
+
+    return data
+
+
+def cpr_output() -> pd.DataFrame:
+    """
+    Output as `IntradayStockCPRStrategy.cpr_strategy_output` builds it:
+    consolidation merged on the bhavcopy, then the VCPR of the narrow CPR
+    symbols merged with a `fillna("-")`, which leaves the other symbols'
+    missing lot sizes as "-" in a numeric column.
+    """
+
+    frames = {"SBIN.NS": bars(120, 0), "TCS.NS": bars(90, 1),
+              "INFY.NS": pd.DataFrame(columns=["date", "close",
+                                               "pct_change"])}
+    context = SimpleNamespace(
+        data_handler=None,
+        bar_panel=lambda symbols, period, interval, columns:
+        BarPanel.from_frames({i: frames[i] for i in symbols}, columns))
+
+    data = pd.DataFrame({
+        "index": range(3),
+        "symbol": list(frames),
+        "lotsize": [1500.0, np.nan, 400.0],
+        "industry": ["Banks", "IT", "IT"],
+        "sectoral_index": ["NIFTY BANK", "NIFTY IT", "NIFTY IT"],
+        "open": [600.1, 3500.25, 1500.5],
+        "high": [610.0, 3550.0, 1520.0],
+        "low": [595.5, 3480.0, 1490.0],
+        "close": [605.25, 3520.0, 1510.75],
+        "pct_change": [0.52, -0.31, 1.2],
+        "volume": [1_000_000, 250_000, 400_000],
+        "cpr_width": [0.12, 0.45, 0.2],
+        "cpr": ["Narrow CPR", "Wide CPR", "Narrow CPR"],
+        "purpose": ["Intraday"] * 3,
+        "priority_stocks": ["Yes", "No", "No"],
+        "timestamp": pd.Timestamp("2024-01-01")})
+
+    consolidation = ConsolidationRange(context=context)
+    data = pd.merge(data, consolidation.get_time_consolidation(
+        data.symbol.tolist()), on="symbol", how="left")
+    data = data[CPR_STRATEGY_COLUMNS]
+
+    vcpr = pd.DataFrame({"symbol": ["SBIN.NS", "INFY.NS"],
+                         "long_vcpr": ["Narrow CPR", "Mild VCPR to No VCPR"],
+                         "short_vcpr": ["Mild VCPR from 01-Jan-2024",
+                                        "Wide VCPR"]})
+    data = pd.merge(data, vcpr, on="symbol", how="left").fillna("-")
+    data["frequency"] = "D"
+
+    return data.round(2)
+
+
+def test_stores_cpr_output(tmp_path):
+    store = StrategyOutputStore(str(tmp_path))
+    data = cpr_output()
+
+    store.write(STRATEGY_NAME, OUTPUT_DATE, data)
+    stored = store.read(STRATEGY_NAME, OUTPUT_DATE)
+
+    assert stored.shape == data.shape
+    # INFY.NS has no bars.
+    assert stored.time_con_range.dtype.kind == "i"
+    assert stored.time_con_range.iloc[2] == 0
+    assert stored.lotsize.tolist() == ["1500.0", "-", "400.0"]
+    assert stored.long_vcpr.tolist() == ["Narrow CPR", "-",
+                                         "Mild VCPR to No VCPR"]
+    pd.testing.assert_frame_equal(stored.drop(columns=["lotsize"]),
+                                  data.drop(columns=["lotsize"]))
+
+
+def test_scan_skips_partial_writes(tmp_path):
+    store = StrategyOutputStore(str(tmp_path))
+    store.write(STRATEGY_NAME, OUTPUT_DATE, cpr_output())
+
+    # A write in flight, or one which crashed, as scans would find it.
+    partition = tmp_path / "strategy={0}".format(STRATEGY_NAME) / \
+        "date={0}".format(OUTPUT_DATE.isoformat())
+    (partition / TEMP_FILE).write_bytes(b"PAR1 partial")
+
+    data = store.scan(STRATEGY_NAME, OUTPUT_DATE, OUTPUT_DATE,
+                      ["symbol", "cpr"])
+
+    assert data.symbol.tolist() == ["SBIN.NS", "TCS.NS", "INFY.NS"]
+    assert set(data.date) == {OUTPUT_DATE}
+
+
+def test_scan_days_of_differing_dtypes(tmp_path):
+    store = StrategyOutputStore(str(tmp_path))
+    # Lot sizes are floats on a day every symbol has one, strings on a
+    # day the VCPR merge fills one with "-".
+    store.write(STRATEGY_NAME, date(2024, 1, 1),
+                pd.DataFrame({"symbol": ["SBIN.NS"], "lotsize": [1500.0]}))
+    store.write(STRATEGY_NAME, OUTPUT_DATE,
+                pd.DataFrame({"symbol": ["SBIN.NS", "TCS.NS"],
+                              "lotsize": [1500.0, "-"]}))
+
+    data = store.scan(STRATEGY_NAME)
+
+    assert data.date.tolist() == [date(2024, 1, 1), OUTPUT_DATE, OUTPUT_DATE]
+    assert data.lotsize.tolist() == [1500.0, "1500.0", "-"]
+    assert store.scan(STRATEGY_NAME, OUTPUT_DATE,
+                      columns=["symbol"]).symbol.tolist() == ["SBIN.NS",
+                                                              "TCS.NS"]